@@ -0,0 +1,713 @@
+# ======================================================                     *
+#  Project      : benchmarks                                                 *
+#  File         : run_benchmarks.py                                          *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:48                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Benchmark de extremo a extremo del pipeline de entrenamiento.
+
+Genera (o reutiliza) un dataset sintético con la forma de `database/datasets`
+y mide cada etapa por separado, con los mismos componentes que usa
+`main.py`:
+    - Descubrimiento del dataset e índice de muestras
+    - Generación de configuración
+    - Throughput del loader (imágenes con y sin landmarks, videos)
+    - Tiempo por paso de entrenamiento de cada backbone
+    - Evaluación en test
+    - Análisis de errores
+    - Escrituras en el registro de versiones
+
+Todo corre offline (backbones sin pesos pre-entrenados) en un directorio
+temporal. Cada corrida se agrega a un historial JSON y se compara contra la
+línea base de la misma máquina y configuración con las tolerancias de
+`benchmarks/thresholds.json`; si alguna métrica empeora más de lo permitido
+el script termina con código 1.
+
+Uso:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --backbones resnet18 mobilenet_v2 efficientnet_b0
+    python benchmarks/run_benchmarks.py --classes 20 --files 40 --set-baseline
+    python benchmarks/run_benchmarks.py --no-fail
+"""
+
+import os
+import io
+import sys
+import statistics  # noqa: F401 - el estándar, antes de que src/statistics lo tape
+import json
+import time
+import copy
+import fnmatch
+import hashlib
+import platform
+import tempfile
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Agregar src y la raíz al path (imports sin prefijo y `src.statistics`, como en main.py)
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_dataset import generate_dataset
+
+
+HISTORY_PATH = ROOT / 'history' / 'benchmarks' / 'benchmark_history.json'
+THRESHOLDS_PATH = Path(__file__).resolve().parent / 'thresholds.json'
+DEFAULT_BACKBONES = ['resnet18', 'mobilenet_v2']
+
+
+def _metric(value: float, unit: str, better: str) -> Dict:
+    """Una métrica del benchmark; `better` es 'lower' o 'higher'."""
+    return {'value': round(float(value), 4), 'unit': unit, 'better': better}
+
+
+def _median_time(fn: Callable, repeats: int) -> tuple:
+    """Mediana (s) de `repeats` ejecuciones de `fn` y el resultado de la última."""
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)), result
+
+
+class BenchmarkSuite:
+    """Ejecuta las etapas del pipeline sobre un dataset y mide cada una."""
+    
+    def __init__(
+        self,
+        dataset_dir: str,
+        work_dir: str,
+        backbones: Optional[List[str]] = None,
+        batch_size: int = 8,
+        num_workers: int = 0,
+        loader_batches: int = 10,
+        train_steps: int = 10,
+        warmup_steps: int = 2,
+        repeats: int = 3,
+        registry_writes: int = 5,
+        analysis_samples: int = 10000,
+        device: Optional[str] = None,
+        verbose: bool = False
+    ):
+        """
+        Args:
+            dataset_dir: Raíz del dataset a medir
+            work_dir: Directorio de trabajo (configs, registro, evaluación)
+            backbones: Backbones para el tiempo por paso de entrenamiento
+            batch_size: Batch size de loaders y entrenamiento
+            num_workers: Workers de los DataLoader
+            loader_batches: Batches leídos por medición del loader
+            train_steps: Pasos medidos por backbone
+            warmup_steps: Pasos descartados antes de medir
+            repeats: Repeticiones de las etapas rápidas (se toma la mediana)
+            registry_writes: Versiones registradas en la etapa de registro
+            analysis_samples: Predicciones usadas en el análisis de errores
+                (las de test se repiten hasta este tamaño)
+            device: 'cuda' o 'cpu' (None = automático)
+            verbose: Mostrar la salida de los componentes medidos
+        """
+        import torch
+        
+        self.dataset_dir = Path(dataset_dir).resolve()
+        self.work_dir = Path(work_dir).resolve()
+        self.backbones = backbones or DEFAULT_BACKBONES
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.loader_batches = loader_batches
+        self.train_steps = train_steps
+        self.warmup_steps = warmup_steps
+        self.repeats = repeats
+        self.registry_writes = registry_writes
+        self.analysis_samples = analysis_samples
+        self.device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        self.verbose = verbose
+        
+        self.config_dir = self.work_dir / 'config' / 'generated'
+        self.metrics = {}
+        self.config = None
+        self.report = None
+        self.test_results = None
+        self.trainer = None
+        self.loaders = None
+    
+    @contextlib.contextmanager
+    def _quiet(self):
+        """Oculta la salida de los componentes (salvo en modo verbose)."""
+        if self.verbose:
+            yield
+            return
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    
+    def _sync(self):
+        if self.device == 'cuda':
+            import torch
+            torch.cuda.synchronize()
+    
+    def run(self) -> Dict:
+        """Ejecuta todas las etapas; retorna {nombre_métrica: métrica}."""
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        
+        # VersionManager y la evaluación escriben en rutas relativas
+        previous_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        try:
+            stages = [
+                ('Descubrimiento', self.bench_discovery),
+                ('Configuración', self.bench_config_generation),
+                ('Loaders', self.bench_loaders),
+                ('Pasos de entrenamiento', self.bench_train_steps),
+                ('Evaluación', self.bench_eval),
+                ('Análisis de errores', self.bench_error_analysis),
+                ('Registro de versiones', self.bench_registry)
+            ]
+            for name, stage in stages:
+                print(f"  • {name}...")
+                stage()
+        finally:
+            os.chdir(previous_cwd)
+        
+        return self.metrics
+    
+    def bench_discovery(self):
+        """Escaneo completo, índice de muestras y guardado de archivos."""
+        from core.dataset_discovery import DatasetDiscovery
+        import yaml
+        
+        def discover():
+            # Manifiesto en memoria: siempre escaneo completo
+            discovery = DatasetDiscovery(str(self.dataset_dir))
+            report = discovery.discover()
+            discovery.save_report(self.config_dir)
+            
+            sample_index = discovery.build_sample_index()
+            sample_index.save(self.config_dir / 'sample_index.npz')
+            sample_index.save_splits(self.config_dir / 'sample_splits.npz')
+            loader_config = discovery.get_data_loaders_config(
+                sample_index_file='sample_index.npz',
+                sample_splits_file='sample_splits.npz'
+            )
+            return report, loader_config
+        
+        with self._quiet():
+            seconds, (report, loader_config) = _median_time(discover, self.repeats)
+        
+        # Los loaders no aceptan datasets mixtos: un YAML por tipo de medio,
+        # ambos sobre el mismo índice
+        for dataset_type in ('image', 'video'):
+            config = dict(loader_config, dataset_type=dataset_type)
+            with open(self.config_dir / f'data_loaders_{dataset_type}.yaml', 'w', encoding='utf-8') as f:
+                yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+        
+        self.report = report
+        total_files = report['distribution']['total_files']
+        self.metrics['discovery.seconds'] = _metric(seconds, 's', 'lower')
+        self.metrics['discovery.files_per_s'] = _metric(total_files / seconds, 'files/s', 'higher')
+    
+    def bench_config_generation(self):
+        """`AutoConfigGenerator` (sin planificación de batch size)."""
+        from core.auto_config_generator import AutoConfigGenerator
+        
+        def generate():
+            generator = AutoConfigGenerator(copy.deepcopy(self.report))
+            config = generator.generate()
+            generator.save(self.config_dir)
+            return config
+        
+        with self._quiet():
+            seconds, config = _median_time(generate, self.repeats)
+        
+        # Configuración reproducible y offline para las etapas siguientes
+        config['model']['pretrained'] = False
+        config['dataset']['batch_size'] = self.batch_size
+        config['dataset']['num_workers'] = self.num_workers
+        config['training']['epochs'] = 1
+        config['augmentation']['image']['batch_level'] = False
+        self.config = config
+        
+        self.metrics['config_generation.ms'] = _metric(seconds * 1000, 'ms', 'lower')
+    
+    def _loader_throughput(self, dataset_type: str, extract_landmarks: bool) -> Optional[float]:
+        """Muestras/s del split de train (mediana de `repeats` lecturas de `loader_batches` batches)."""
+        from data.loaders.universal_loader import create_data_loaders
+        
+        with self._quiet():
+            loaders = create_data_loaders(
+                config_path=str(self.config_dir / f'data_loaders_{dataset_type}.yaml'),
+                batch_size=self.batch_size,
+                num_workers=self.num_workers,
+                extract_landmarks=extract_landmarks
+            )
+        loader = loaders['train']
+        if len(loader) == 0:
+            return None
+        
+        def read():
+            samples = 0
+            for i, batch in enumerate(loader):
+                samples += len(batch['label'])
+                if i + 1 >= self.loader_batches:
+                    break
+            return samples
+        
+        with self._quiet():
+            seconds, samples = _median_time(read, self.repeats)
+        return samples / seconds
+    
+    def bench_loaders(self):
+        """Throughput del loader por tipo de medio, con y sin landmarks."""
+        spec = [
+            ('loader.images', 'image', False),
+            ('loader.images_landmarks', 'image', True),
+            ('loader.videos', 'video', False)
+        ]
+        for name, dataset_type, extract_landmarks in spec:
+            throughput = self._loader_throughput(dataset_type, extract_landmarks)
+            if throughput is None:
+                print(f"    {name}: sin muestras suficientes para un batch, se omite")
+                continue
+            self.metrics[f'{name}.samples_per_s'] = _metric(throughput, 'samples/s', 'higher')
+    
+    def _train_batches(self) -> List[Dict]:
+        """Batches de imágenes precargados: el paso se mide sin el loader."""
+        from data.loaders.universal_loader import create_data_loaders
+        
+        with self._quiet():
+            loaders = create_data_loaders(
+                config_path=str(self.config_dir / 'data_loaders_image.yaml'),
+                batch_size=self.batch_size,
+                num_workers=self.num_workers,
+                extract_landmarks=False
+            )
+        self.loaders = loaders
+        
+        needed = self.warmup_steps + self.train_steps
+        batches = []
+        with self._quiet():
+            while len(batches) < needed:
+                before = len(batches)
+                for batch in loaders['train']:
+                    batches.append(batch)
+                    if len(batches) >= needed:
+                        break
+                if len(batches) == before:
+                    raise RuntimeError(
+                        f"El split de train no tiene {self.batch_size} imágenes; "
+                        f"usa más archivos por clase o un --batch-size menor"
+                    )
+        return batches
+    
+    def bench_train_steps(self):
+        """Forward + backward + paso del optimizador, por backbone."""
+        import torch
+        from algorithms.deep import SimpleHybridModel
+        from training.deep import HybridTrainer
+        
+        batches = self._train_batches()
+        
+        for backbone in self.backbones:
+            torch.manual_seed(0)
+            config = copy.deepcopy(self.config)
+            config['model']['backbone'] = backbone
+            
+            with self._quiet():
+                model = SimpleHybridModel(
+                    num_classes=config['dataset']['num_classes'],
+                    backbone=backbone,
+                    use_landmarks=config['model']['use_landmarks'],
+                    pretrained=False
+                )
+                trainer = HybridTrainer(
+                    model=model,
+                    train_loader=self.loaders['train'],
+                    val_loader=self.loaders['val'],
+                    test_loader=self.loaders['test'],
+                    config=config,
+                    device=self.device
+                )
+            
+            trainer.model.train()
+            timings = []
+            for step, batch in enumerate(batches):
+                self._sync()
+                start = time.perf_counter()
+                
+                images, labels, landmarks = trainer._prepare_batch(batch, train=True)
+                outputs = trainer.model(images, landmarks)
+                loss = trainer._compute_loss(outputs, labels, batch)
+                loss.backward()
+                trainer.optimizer.step()
+                trainer.optimizer.zero_grad()
+                
+                self._sync()
+                if step >= self.warmup_steps:
+                    timings.append(time.perf_counter() - start)
+            
+            step_ms = float(np.median(timings)) * 1000
+            self.metrics[f'train_step.{backbone}.ms'] = _metric(step_ms, 'ms', 'lower')
+            self.metrics[f'train_step.{backbone}.samples_per_s'] = _metric(
+                self.batch_size / (step_ms / 1000), 'samples/s', 'higher'
+            )
+            
+            # La evaluación usa el primer backbone
+            if self.trainer is None:
+                self.trainer = trainer
+    
+    def bench_eval(self):
+        """`_evaluate_test` completo (loader de test + forward + métricas)."""
+        with self._quiet():
+            seconds, results = _median_time(self.trainer._evaluate_test, self.repeats)
+        
+        self.test_results = results
+        num_samples = len(results['labels'])
+        self.metrics['eval.seconds'] = _metric(seconds, 's', 'lower')
+        if num_samples:
+            self.metrics['eval.samples_per_s'] = _metric(num_samples / seconds, 'samples/s', 'higher')
+    
+    def bench_error_analysis(self):
+        """`ErrorAnalyzer` sobre `analysis_samples` predicciones."""
+        from src.statistics.analysis.error_analyzer import ErrorAnalyzer
+        
+        predictions = np.asarray(self.test_results['predictions'])
+        labels = np.asarray(self.test_results['labels'])
+        probabilities = np.asarray(self.test_results['probabilities'])
+        if len(labels) == 0:
+            print("    Split de test vacío, se omite")
+            return
+        
+        reps = int(np.ceil(self.analysis_samples / len(labels)))
+        predictions = np.tile(predictions, reps)[:self.analysis_samples]
+        labels = np.tile(labels, reps)[:self.analysis_samples]
+        probabilities = np.tile(probabilities, (reps, 1))[:self.analysis_samples]
+        
+        def analyze():
+            analyzer = ErrorAnalyzer(
+                predictions=predictions,
+                labels=labels,
+                class_names=self.config['dataset']['class_names'],
+                probabilities=probabilities
+            )
+            analysis = analyzer.analyze()
+            analyzer.get_recommendations()
+            return analysis
+        
+        with self._quiet():
+            seconds, _ = _median_time(analyze, self.repeats)
+        self.metrics['error_analysis.ms'] = _metric(seconds * 1000, 'ms', 'lower')
+    
+    def bench_registry(self):
+        """Registro de versiones (metadata + registro JSON) y guardado del modelo."""
+        from core.version_manager import VersionManager
+        
+        metrics = {
+            k: v for k, v in self.test_results.items()
+            if k not in ['predictions', 'labels', 'probabilities']
+        }
+        model_info = {
+            'architecture': self.config['model']['architecture'],
+            'backbone': self.trainer.model.backbone_name,
+            'total_params': sum(p.numel() for p in self.trainer.model.parameters())
+        }
+        
+        write_timings = []
+        save_timings = []
+        with self._quiet():
+            manager = VersionManager(base_dir='models')
+            for _ in range(self.registry_writes):
+                start = time.perf_counter()
+                version = manager.create_new_version(
+                    model_info=model_info, metrics=metrics, config=self.config, force=True
+                )
+                write_timings.append(time.perf_counter() - start)
+                
+                start = time.perf_counter()
+                self.trainer.save_model(Path('models') / version / 'final' / 'model.pth')
+                save_timings.append(time.perf_counter() - start)
+        
+        self.metrics['registry.write_ms'] = _metric(np.median(write_timings) * 1000, 'ms', 'lower')
+        self.metrics['registry.save_model_ms'] = _metric(np.median(save_timings) * 1000, 'ms', 'lower')
+
+
+def environment_info(device: str) -> Dict:
+    """Máquina y librerías: solo se comparan corridas del mismo entorno."""
+    import torch
+    from data.loaders.landmark_detector import mediapipe_available
+    
+    return {
+        'machine': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'torch': torch.__version__,
+        'torch_threads': torch.get_num_threads(),
+        'device': device,
+        'cuda_device': torch.cuda.get_device_name(0) if device == 'cuda' else None,
+        'mediapipe': mediapipe_available()
+    }
+
+
+def fingerprint(settings: Dict, environment: Dict) -> str:
+    """Identificador de configuración + entorno para elegir la línea base."""
+    payload = json.dumps({'settings': settings, 'environment': environment}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def load_thresholds(path: Path = THRESHOLDS_PATH) -> Dict:
+    """
+    Tolerancias de regresión.
+    
+    {'default': tolerancia relativa, 'metrics': {patrón: tolerancia},
+     'min_change': {patrón: cambio absoluto mínimo (en la unidad de la
+     métrica) para contar como regresión}}
+    """
+    if not Path(path).exists():
+        return {'default': 0.25, 'metrics': {}, 'min_change': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _match(name: str, patterns: Dict, default: float) -> float:
+    """Valor del primer patrón que coincide con el nombre de la métrica."""
+    for pattern, value in patterns.items():
+        if fnmatch.fnmatch(name, pattern):
+            return value
+    return default
+
+
+def tolerance_for(name: str, thresholds: Dict) -> float:
+    """Tolerancia relativa de una métrica."""
+    return _match(name, thresholds.get('metrics', {}), thresholds.get('default', 0.25))
+
+
+def compare(metrics: Dict, baseline: Dict, thresholds: Dict) -> List[Dict]:
+    """
+    Compara métricas contra una línea base.
+    
+    Returns:
+        Una entrada por métrica común: valor, línea base, cambio relativo
+        (positivo = peor), tolerancia y si es regresión
+    """
+    comparison = []
+    for name, metric in metrics.items():
+        if name not in baseline:
+            continue
+        base_value = baseline[name]['value']
+        if base_value == 0:
+            continue
+        
+        change = (metric['value'] - base_value) / base_value
+        if metric['better'] == 'higher':
+            change = -change
+        tolerance = tolerance_for(name, thresholds)
+        # Cambios absolutos pequeños (p. ej. 1 ms) son ruido de medición
+        min_change = _match(name, thresholds.get('min_change', {}), 0.0)
+        significant = abs(metric['value'] - base_value) >= min_change
+        comparison.append({
+            'metric': name,
+            'value': metric['value'],
+            'baseline': base_value,
+            'unit': metric['unit'],
+            'change': round(change, 4),
+            'tolerance': tolerance,
+            'regression': change > tolerance and significant
+        })
+    return comparison
+
+
+class BenchmarkHistory:
+    """Historial JSON de corridas del benchmark."""
+    
+    def __init__(self, path: Path = HISTORY_PATH):
+        self.path = Path(path)
+        self.runs = []
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.runs = json.load(f)
+    
+    def baseline(self, run_fingerprint: str) -> Optional[Dict]:
+        """
+        Línea base para un fingerprint: la última marcada como base o, si no
+        hay ninguna, la primera corrida sin regresiones con ese fingerprint.
+        
+        No se usa la corrida anterior: una regresión pasaría a ser la base
+        de la siguiente y una degradación lenta (bajo la tolerancia en cada
+        corrida) nunca se detectaría.
+        """
+        same = [run for run in self.runs if run['fingerprint'] == run_fingerprint]
+        marked = [run for run in same if run.get('baseline')]
+        if marked:
+            return marked[-1]
+        clean = [run for run in same if not run.get('regressions')]
+        return clean[0] if clean else None
+    
+    def append(self, run: Dict):
+        self.runs.append(run)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Escritura atómica: el historial nunca queda a medias
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.runs, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def print_report(metrics: Dict, comparison: List[Dict], baseline: Optional[Dict]):
+    """Tabla de métricas con el cambio frente a la línea base."""
+    by_metric = {entry['metric']: entry for entry in comparison}
+    
+    print("\n" + "=" * 78)
+    if baseline:
+        print(f"RESULTADOS (línea base: {baseline['run_id']})")
+    else:
+        print("RESULTADOS (sin línea base para esta configuración)")
+    print("=" * 78)
+    print(f"{'Métrica':40s} {'Valor':>18s} {'Base':>10s} {'Cambio':>9s}")
+    
+    for name, metric in metrics.items():
+        value = f"{metric['value']:.2f} {metric['unit']}"
+        entry = by_metric.get(name)
+        if entry is None:
+            print(f"{name:40s} {value:>18s}")
+            continue
+        # Cambio orientado: positivo = peor, negativo = mejor
+        status = 'REGRESIÓN' if entry['regression'] else ''
+        print(f"{name:40s} {value:>18s} {entry['baseline']:>10.2f} "
+              f"{entry['change']:>+8.1%} {status}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Benchmark de extremo a extremo del pipeline')
+    parser.add_argument('--dataset-dir', type=str, default=None,
+                        help='Dataset sintético (None = directorio temporal)')
+    parser.add_argument('--work-dir', type=str, default=None,
+                        help='Directorio de trabajo (None = directorio temporal)')
+    parser.add_argument('--classes', type=int, default=10, help='Clases del dataset sintético')
+    parser.add_argument('--files', type=int, default=20, help='Archivos por clase')
+    parser.add_argument('--video-ratio', type=float, default=0.5,
+                        help='Fracción de clases de video (0-1)')
+    parser.add_argument('--backbones', type=str, nargs='+', default=DEFAULT_BACKBONES,
+                        help='Backbones a medir')
+    parser.add_argument('--batch-size', type=int, default=8, help='Batch size')
+    parser.add_argument('--num-workers', type=int, default=0, help='Workers de los loaders')
+    parser.add_argument('--loader-batches', type=int, default=10, help='Batches por medición del loader')
+    parser.add_argument('--train-steps', type=int, default=10, help='Pasos medidos por backbone')
+    parser.add_argument('--repeats', type=int, default=3, help='Repeticiones de etapas rápidas')
+    parser.add_argument('--device', type=str, default=None, help="'cuda' o 'cpu'")
+    parser.add_argument('--history', type=str, default=str(HISTORY_PATH), help='Historial JSON')
+    parser.add_argument('--thresholds', type=str, default=str(THRESHOLDS_PATH),
+                        help='Tolerancias de regresión')
+    parser.add_argument('--set-baseline', action='store_true',
+                        help='Marcar esta corrida como línea base')
+    parser.add_argument('--no-fail', action='store_true',
+                        help='No terminar con código 1 si hay regresiones')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar la salida de cada etapa')
+    args = parser.parse_args(argv)
+    
+    settings = {
+        'classes': args.classes,
+        'files_per_class': args.files,
+        'video_ratio': args.video_ratio,
+        'backbones': args.backbones,
+        'batch_size': args.batch_size,
+        'num_workers': args.num_workers,
+        'loader_batches': args.loader_batches,
+        'train_steps': args.train_steps,
+        'repeats': args.repeats
+    }
+    
+    with tempfile.TemporaryDirectory(prefix='jnaa_bench_') as tmp_dir:
+        dataset_dir = args.dataset_dir or str(Path(tmp_dir) / 'dataset')
+        work_dir = args.work_dir or str(Path(tmp_dir) / 'work')
+        Path(work_dir).mkdir(parents=True, exist_ok=True)
+        
+        print("Generando dataset sintético...")
+        spec = generate_dataset(
+            dataset_dir,
+            num_classes=args.classes,
+            files_per_class=args.files,
+            video_ratio=args.video_ratio
+        )
+        print(f"  {spec['total_images']} imágenes, {spec['total_videos']} videos en {dataset_dir}")
+        
+        print("\nEjecutando etapas:")
+        suite = BenchmarkSuite(
+            dataset_dir=dataset_dir,
+            work_dir=work_dir,
+            backbones=args.backbones,
+            batch_size=args.batch_size,
+            num_workers=args.num_workers,
+            loader_batches=args.loader_batches,
+            train_steps=args.train_steps,
+            repeats=args.repeats,
+            device=args.device,
+            verbose=args.verbose
+        )
+        metrics = suite.run()
+    
+    environment = environment_info(suite.device)
+    run_fingerprint = fingerprint(settings, environment)
+    history = BenchmarkHistory(args.history)
+    baseline = history.baseline(run_fingerprint)
+    
+    comparison = compare(metrics, baseline['metrics'], load_thresholds(args.thresholds)) if baseline else []
+    regressions = [entry for entry in comparison if entry['regression']]
+    print_report(metrics, comparison, baseline)
+    
+    run = {
+        'run_id': datetime.now().strftime('bench_%Y%m%d_%H%M%S'),
+        'timestamp': datetime.now().isoformat(),
+        'fingerprint': run_fingerprint,
+        'baseline': args.set_baseline,
+        'compared_to': baseline['run_id'] if baseline else None,
+        'settings': settings,
+        'environment': environment,
+        'metrics': metrics,
+        'regressions': [entry['metric'] for entry in regressions]
+    }
+    history.append(run)
+    print(f"\nHistorial: {history.path}")
+    
+    if regressions:
+        print(f"\n{len(regressions)} regresiones:")
+        for entry in regressions:
+            print(f"  • {entry['metric']}: {entry['change']:+.1%} (tolerancia {entry['tolerance']:.0%})")
+        return 0 if args.no_fail else 1
+    
+    print("\nSin regresiones")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+# ======================================================                     *
+#  Project      : benchmarks                                                 *
+#  File         : synthetic_dataset.py                                       *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:48                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Generador de datasets sintéticos con la forma de `database/datasets`.
+
+Crea un árbol categoría/subcategoría/clase (alfabeto/vocales/a,
+palabras/saludos/hola, ...) con imágenes y videos pequeños. Cada clase
+tiene un patrón visual propio (color y figura), así que un modelo puede
+aprender algo y el benchmark ejercita el pipeline completo sin datos reales.
+
+Uso:
+    python benchmarks/synthetic_dataset.py --output /tmp/lsm_sintetico
+    python benchmarks/synthetic_dataset.py --output /tmp/lsm --classes 20 --files 40 --video-ratio 0.5
+"""
+
+import json
+import random
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+# Clases de imágenes (señas estáticas) y de videos (señas con movimiento)
+IMAGE_CATEGORY = ('alfabeto', 'vocales')
+VIDEO_CATEGORY = ('palabras', 'saludos')
+IMAGE_CLASSES = ['a', 'e', 'i', 'o', 'u']
+VIDEO_CLASSES = ['hola', 'adios', 'buenos-dias', 'buenas-tardes', 'buenas-noches']
+
+SHAPES = ('ellipse', 'rectangle', 'triangle')
+
+
+def _class_names(base: List[str], count: int, prefix: str) -> List[str]:
+    """Nombres de clase reales primero y `prefijo-N` para completar."""
+    names = base[:count]
+    names += [f"{prefix}-{i}" for i in range(len(names) + 1, count + 1)]
+    return names
+
+
+def _class_style(class_idx: int) -> Dict:
+    """Color de fondo, color y figura característicos de una clase."""
+    rng = random.Random(class_idx)
+    return {
+        'background': tuple(rng.randint(0, 255) for _ in range(3)),
+        'color': tuple(rng.randint(0, 255) for _ in range(3)),
+        'shape': SHAPES[class_idx % len(SHAPES)]
+    }
+
+
+def _draw_frame(style: Dict, size: int, center: tuple, rng: random.Random) -> Image.Image:
+    """Un cuadro: fondo con ruido y la figura de la clase en `center`."""
+    noise = np.random.default_rng(rng.randint(0, 2 ** 31)).integers(
+        -20, 21, size=(size, size, 3)
+    )
+    pixels = np.clip(np.array(style['background'], dtype=np.int16) + noise, 0, 255)
+    image = Image.fromarray(pixels.astype(np.uint8))
+    
+    draw = ImageDraw.Draw(image)
+    radius = size // 5
+    cx, cy = center
+    box = [cx - radius, cy - radius, cx + radius, cy + radius]
+    if style['shape'] == 'ellipse':
+        draw.ellipse(box, fill=style['color'])
+    elif style['shape'] == 'rectangle':
+        draw.rectangle(box, fill=style['color'])
+    else:
+        draw.polygon([(cx, cy - radius), (cx - radius, cy + radius), (cx + radius, cy + radius)],
+                     fill=style['color'])
+    return image
+
+
+def _write_image(path: Path, style: Dict, size: int, rng: random.Random):
+    jitter = size // 8
+    center = (size // 2 + rng.randint(-jitter, jitter), size // 2 + rng.randint(-jitter, jitter))
+    _draw_frame(style, size, center, rng).save(path, quality=90)
+
+
+def _write_video(path: Path, style: Dict, size: int, frames: int, fps: int, rng: random.Random):
+    """Video mp4 con la figura recorriendo el cuadro (movimiento de la seña)."""
+    import cv2
+    
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (size, size))
+    if not writer.isOpened():
+        raise RuntimeError(f"OpenCV no pudo crear el video: {path}")
+    
+    start = rng.uniform(0.3, 0.7)
+    try:
+        for t in range(frames):
+            progress = t / max(frames - 1, 1)
+            cx = int(size * (0.25 + 0.5 * progress))
+            cy = int(size * start)
+            frame = np.array(_draw_frame(style, size, (cx, cy), rng))
+            writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+    finally:
+        writer.release()
+
+
+def generate_dataset(
+    output_dir: str,
+    num_classes: int = 10,
+    files_per_class: int = 20,
+    video_ratio: float = 0.5,
+    image_size: int = 96,
+    video_frames: int = 16,
+    video_fps: int = 15,
+    seed: int = 0,
+    overwrite: bool = False
+) -> Dict:
+    """
+    Genera el dataset sintético.
+    
+    Args:
+        output_dir: Raíz del dataset a crear
+        num_classes: Total de clases
+        files_per_class: Archivos por clase
+        video_ratio: Fracción de clases de video (palabras/saludos); el
+            resto son imágenes (alfabeto/vocales)
+        image_size: Lado de imágenes y cuadros de video (px)
+        video_frames: Cuadros por video
+        video_fps: FPS de los videos
+        seed: Semilla (mismo seed = mismo dataset)
+        overwrite: Si regenerar aunque ya exista un dataset con la misma
+            especificación
+    
+    Returns:
+        Especificación del dataset generado (también en `dataset_spec.json`)
+    """
+    if not 0 <= video_ratio <= 1:
+        raise ValueError("video_ratio debe estar en [0, 1]")
+    
+    output_dir = Path(output_dir)
+    spec = {
+        'num_classes': num_classes,
+        'files_per_class': files_per_class,
+        'video_ratio': video_ratio,
+        'image_size': image_size,
+        'video_frames': video_frames,
+        'video_fps': video_fps,
+        'seed': seed
+    }
+    
+    # Reutilizar el dataset si ya se generó con la misma especificación
+    spec_path = output_dir / 'dataset_spec.json'
+    if spec_path.exists():
+        with open(spec_path, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+        if not overwrite and {k: existing.get(k) for k in spec} == spec:
+            return existing
+        # Dataset sintético anterior: se regenera completo
+        for category in (IMAGE_CATEGORY[0], VIDEO_CATEGORY[0]):
+            shutil.rmtree(output_dir / category, ignore_errors=True)
+    elif output_dir.exists() and any(output_dir.iterdir()):
+        raise FileExistsError(
+            f"{output_dir} no está vacío y no es un dataset sintético (falta dataset_spec.json)"
+        )
+    
+    num_video = int(round(num_classes * video_ratio))
+    num_image = num_classes - num_video
+    image_classes = _class_names(IMAGE_CLASSES, num_image, 'letra')
+    video_classes = _class_names(VIDEO_CLASSES, num_video, 'saludo')
+    
+    rng = random.Random(seed)
+    class_idx = 0
+    total_images = 0
+    total_videos = 0
+    
+    for category, classes, is_video in (
+        (IMAGE_CATEGORY, image_classes, False),
+        (VIDEO_CATEGORY, video_classes, True)
+    ):
+        for class_name in classes:
+            class_dir = output_dir.joinpath(*category, class_name)
+            class_dir.mkdir(parents=True, exist_ok=True)
+            style = _class_style(class_idx)
+            class_idx += 1
+            
+            for i in range(files_per_class):
+                if is_video:
+                    _write_video(class_dir / f"{class_name}_{i:04d}.mp4",
+                                 style, image_size, video_frames, video_fps, rng)
+                    total_videos += 1
+                else:
+                    _write_image(class_dir / f"{class_name}_{i:04d}.jpg", style, image_size, rng)
+                    total_images += 1
+    
+    spec.update({
+        'path': str(output_dir),
+        'image_classes': ['/'.join(IMAGE_CATEGORY + (c,)) for c in image_classes],
+        'video_classes': ['/'.join(VIDEO_CATEGORY + (c,)) for c in video_classes],
+        'total_images': total_images,
+        'total_videos': total_videos
+    })
+    with open(spec_path, 'w', encoding='utf-8') as f:
+        json.dump(spec, f, indent=2, ensure_ascii=False)
+    
+    return spec
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generar dataset sintético de LSM')
+    parser.add_argument('--output', type=str, required=True, help='Directorio de salida')
+    parser.add_argument('--classes', type=int, default=10, help='Número de clases')
+    parser.add_argument('--files', type=int, default=20, help='Archivos por clase')
+    parser.add_argument('--video-ratio', type=float, default=0.5,
+                        help='Fracción de clases de video (0-1)')
+    parser.add_argument('--image-size', type=int, default=96, help='Lado de imágenes/cuadros (px)')
+    parser.add_argument('--video-frames', type=int, default=16, help='Cuadros por video')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla')
+    parser.add_argument('--overwrite', action='store_true', help='Regenerar aunque ya exista')
+    args = parser.parse_args(argv)
+    
+    spec = generate_dataset(
+        args.output,
+        num_classes=args.classes,
+        files_per_class=args.files,
+        video_ratio=args.video_ratio,
+        image_size=args.image_size,
+        video_frames=args.video_frames,
+        seed=args.seed,
+        overwrite=args.overwrite
+    )
+    print(f"Dataset sintético en: {spec['path']}")
+    print(f"  • Imágenes: {spec['total_images']} ({len(spec['image_classes'])} clases)")
+    print(f"  • Videos: {spec['total_videos']} ({len(spec['video_classes'])} clases)")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:19                                           *
+#  Last Updated : 2026-10-19 03:05                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -23,7 +23,8 @@
 #                                                                            *
 # El software se proporciona "tal cual", sin garantías.                      *
 
-from .model import DLClassifier, FeatureExtractor, MLClassifier
+from .model import DLClassifier, EnsemblePredictor, FeatureExtractor, MLClassifier
+from .preprocessing import ImagePreprocessor
 from .train_model import load_class_names
 
-__all__ = ["DLClassifier", "FeatureExtractor", "MLClassifier", "load_class_names"]
+__all__ = ["DLClassifier", "EnsemblePredictor", "FeatureExtractor", "ImagePreprocessor", "MLClassifier", "load_class_names"]
@@ -0,0 +1,129 @@
+# ======================================================                     *
+#  Project      : algorithms                                                 *
+#  File         : embedding_store.py                                         *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 03:04                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+# model/embedding_store.py
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def content_hash(path):
+    """Hash of the file bytes (renaming or moving an image keeps its embedding)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_files(paths, workers=None):
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(content_hash, paths, chunksize=64))
+
+
+class EmbeddingStore:
+    """Persistent embeddings keyed by image content hash (.npz).
+
+    `fingerprint` identifies the backbone that produced the embeddings (see
+    EnsemblePredictor.fingerprint); a store written by another backbone is
+    discarded on load.
+    """
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self._rows = {}
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._pending = []
+        self.load()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with np.load(self.path, allow_pickle=False) as data:
+            if str(data["fingerprint"]) != self.fingerprint:
+                print("Embedding store built with another backbone, starting over:", self.path)
+                return
+            self._embeddings = data["embeddings"]
+            self._rows = {h: i for i, h in enumerate(data["hashes"].tolist())}
+
+    def missing(self, hashes):
+        """Indices (into `hashes`) without a cached embedding."""
+        return [i for i, h in enumerate(hashes) if h not in self._rows]
+
+    def get(self, hashes):
+        """Embedding matrix for `hashes`, in order (all must be cached)."""
+        if self._pending:
+            parts = [self._embeddings] if len(self._embeddings) else []
+            self._embeddings = np.concatenate(parts + self._pending)
+            self._pending = []
+        return self._embeddings[[self._rows[h] for h in hashes]]
+
+    def add(self, hashes, embeddings):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        start = len(self._rows)
+        self._pending.append(embeddings)
+        for i, h in enumerate(hashes):
+            self._rows[h] = start + i
+
+    def save(self, keep=None):
+        """Write the store; with `keep`, only those hashes (drops deleted images)."""
+        hashes = list(dict.fromkeys(keep)) if keep is not None else list(self._rows)
+        embeddings = self.get(hashes)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp.npz"
+        np.savez(tmp, fingerprint=np.array(self.fingerprint),
+                 hashes=np.array(hashes, dtype="U32"), embeddings=embeddings)
+        os.replace(tmp, self.path)
+        self._embeddings = embeddings
+        self._rows = {h: i for i, h in enumerate(hashes)}
+
+
+def load_images(paths, target_size):
+    """Images scaled to [0,1], loaded like flow_from_directory (nearest resize)."""
+    from tensorflow.keras.preprocessing import image as kimage
+    batch = [kimage.img_to_array(kimage.load_img(p, target_size=target_size)) for p in paths]
+    return np.stack(batch) * (1. / 255)
+
+
+def embed_files(predictor, paths, store, target_size=(224, 224), batch_size=32):
+    """Embeddings for `paths`, computing only images not already in `store`.
+
+    Returns (embeddings (N, features), hashes, number of images embedded now).
+    """
+    hashes = hash_files(paths)
+    missing = store.missing(hashes)
+    # Same content under two paths: embed it once
+    todo = list({hashes[i]: i for i in missing}.values())
+    for start in range(0, len(todo), batch_size):
+        idx = todo[start:start + batch_size]
+        emb = predictor.extract(load_images([paths[i] for i in idx], target_size))
+        store.add([hashes[i] for i in idx], emb)
+    return store.get(hashes), hashes, len(todo)
@@ -0,0 +1,191 @@
+# ======================================================                     *
+#  Project      : algorithms                                                 *
+#  File         : forest.py                                                  *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 03:04                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+# model/forest.py
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+class FlatForest:
+    """RandomForest flattened into NumPy node arrays with a vectorized predictor.
+
+    All trees share one set of arrays; each tree starts at its entry in `roots`.
+    Leaves point to themselves, so every sample can take the same number of
+    steps (the forest depth) without per-tree Python loops.
+    """
+    def __init__(self, feature, threshold, left, right, leaf_of_node, leaf_values,
+                 roots, classes, n_features, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_of_node = leaf_of_node
+        self.leaf_values = leaf_values
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_sklearn(cls, clf):
+        """Build from a fitted sklearn RandomForestClassifier (single output)."""
+        if getattr(clf, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output forests are supported")
+
+        n_classes = len(clf.classes_)
+        features, thresholds, lefts, rights, leaf_ids, leaf_values, roots = [], [], [], [], [], [], []
+        offset = 0
+        n_leaves = 0
+        max_depth = 0
+        for est in clf.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(n)
+
+            # Leaves: feature 0 and both children pointing to the leaf itself
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+
+            leaf_id = np.full(n, -1, dtype=np.int64)
+            leaf_id[is_leaf] = np.arange(is_leaf.sum()) + n_leaves
+            leaf_ids.append(leaf_id)
+
+            # Per-tree class probabilities at each leaf (same as tree.predict_proba)
+            values = tree.value[is_leaf, 0, :n_classes]
+            values = values / np.maximum(values.sum(axis=1, keepdims=True), 1e-12)
+            leaf_values.append(values)
+
+            roots.append(offset)
+            offset += n
+            n_leaves += int(is_leaf.sum())
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            leaf_of_node=np.concatenate(leaf_ids).astype(np.int32),
+            leaf_values=np.concatenate(leaf_values).astype(np.float32),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=np.asarray(clf.classes_),
+            n_features=clf.n_features_in_,
+            max_depth=max_depth,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def concat(self, other):
+        """Forest with the trees of both (probabilities average over all trees)."""
+        if not np.array_equal(self.classes_, other.classes_):
+            raise ValueError("Forests have different classes")
+        if self.n_features_in_ != other.n_features_in_:
+            raise ValueError("Forests have different number of features")
+        n_nodes = len(self.feature)
+        n_leaves = len(self.leaf_values)
+        return FlatForest(
+            feature=np.concatenate([self.feature, other.feature]),
+            threshold=np.concatenate([self.threshold, other.threshold]),
+            left=np.concatenate([self.left, other.left + n_nodes]),
+            right=np.concatenate([self.right, other.right + n_nodes]),
+            leaf_of_node=np.concatenate([
+                self.leaf_of_node,
+                np.where(other.leaf_of_node >= 0, other.leaf_of_node + n_leaves, -1).astype(np.int32),
+            ]),
+            leaf_values=np.concatenate([self.leaf_values, other.leaf_values]),
+            roots=np.concatenate([self.roots, other.roots + n_nodes]),
+            classes=self.classes_,
+            n_features=self.n_features_in_,
+            max_depth=max(self.max_depth, other.max_depth),
+        )
+
+    def apply(self, X):
+        """Leaf node id reached in every tree, shape (N, n_trees)."""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {X.shape[1]}")
+
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            nxt = np.where(go_left, self.left[node], self.right[node])
+            # Every sample reached a leaf in every tree
+            if np.array_equal(nxt, node):
+                break
+            node = nxt
+        return node
+
+    def predict_proba(self, X):
+        """Average of the per-tree leaf probabilities, shape (N, n_classes)."""
+        leaves = self.leaf_of_node[self.apply(X)]
+        return self.leaf_values[leaves].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path):
+        np.savez(
+            path,
+            format_version=np.int32(FORMAT_VERSION),
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            leaf_of_node=self.leaf_of_node,
+            leaf_values=self.leaf_values,
+            roots=self.roots,
+            classes=self.classes_,
+            n_features=np.int32(self.n_features_in_),
+            max_depth=np.int32(self.max_depth),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported forest format version: {version}")
+            return cls(
+                feature=data["feature"],
+                threshold=data["threshold"],
+                left=data["left"],
+                right=data["right"],
+                leaf_of_node=data["leaf_of_node"],
+                leaf_values=data["leaf_values"],
+                roots=data["roots"],
+                classes=data["classes"],
+                n_features=data["n_features"],
+                max_depth=data["max_depth"],
+            )
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:20                                           *
+#  Last Updated : 2026-10-19 03:05                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -26,6 +26,7 @@
 # model/model.py
 import os
 import json
+import hashlib
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, models
@@ -35,6 +36,14 @@ from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
 from PIL import Image
 import io
 import joblib
+from contextlib import nullcontext
+
+try:
+    from .forest import FlatForest
+    from .preprocessing import decode_image
+except ImportError:  # imported as a top-level module (statistics_model.py)
+    from forest import FlatForest
+    from preprocessing import decode_image
 
 class DLClassifier:
     """Deep learning classifier using MobileNetV2 base + head."""
@@ -64,12 +73,13 @@ class DLClassifier:
         self.model = tf.keras.models.load_model(model_path)
         return self.model
 
-    def predict_proba(self, np_image_batch):
-        """np_image_batch: shape (N,h,w,3) normalized [0,1]"""
+    def predict_proba(self, np_image_batch, preprocessed=False):
+        """np_image_batch: shape (N,h,w,3) normalized [0,1], or already in
+        [-1,1] with preprocessed=True (ImagePreprocessor(scale="mobilenet"))"""
         if self.model is None:
             raise ValueError("DL model not loaded")
         #asegurar que la entrada está preprocesada
-        x = preprocess_input(np_image_batch * 255.0)
+        x = np_image_batch if preprocessed else preprocess_input(np_image_batch * 255.0)
         preds = self.model.predict(x, verbose=0)
         return preds
 
@@ -93,9 +103,14 @@ class FeatureExtractor:
 
 
 class MLClassifier:
-    """Wrapper to save/load sklearn classifier (RandomForest)"""
+    """Wrapper to save/load the RandomForest classifier.
+
+    Predictions use the flattened forest (FlatForest); `.npz` files hold only
+    the flat arrays, `.pkl` files are legacy joblib pickles of the sklearn model.
+    """
     def __init__(self, model_path=None):
         self.clf = None
+        self.forest = None
         if model_path:
             self.load(model_path)
 
@@ -104,19 +119,129 @@ class MLClassifier:
         clf = RandomForestClassifier(n_estimators=200, n_jobs=-1, random_state=42)
         clf.fit(X, y)
         self.clf = clf
+        self.forest = FlatForest.from_sklearn(clf)
         return clf
 
+    def add_trees(self, X, y, n_trees=25, random_state=None):
+        """Warm start: fit `n_trees` new trees on (X, y) and append them to the forest.
+
+        Existing trees are kept as they are, so this costs a fraction of a refit;
+        the classes must be the same as the current forest's.
+        """
+        from sklearn.ensemble import RandomForestClassifier
+        if self.forest is None:
+            raise ValueError("ML classifier not trained/loaded")
+        clf = RandomForestClassifier(n_estimators=n_trees, n_jobs=-1, random_state=random_state)
+        clf.fit(X, y)
+        self.forest = self.forest.concat(FlatForest.from_sklearn(clf))
+        # The sklearn model no longer describes the whole forest
+        self.clf = None
+        return self.forest
+
     def predict_proba(self, X):
-        if self.clf is None:
+        if self.forest is None:
             raise ValueError("ML classifier not trained/loaded")
-        return self.clf.predict_proba(X)
+        return self.forest.predict_proba(X)
 
     def save(self, path):
-        joblib.dump(self.clf, path)
+        if path.endswith(".npz") or self.clf is None:
+            self.forest.save(path)
+        else:
+            joblib.dump(self.clf, path)
 
     def load(self, path):
-        self.clf = joblib.load(path)
-        return self.clf
+        if path.endswith(".npz"):
+            self.clf = None
+            self.forest = FlatForest.load(path)
+        else:
+            self.clf = joblib.load(path)
+            self.forest = FlatForest.from_sklearn(self.clf)
+        return self.forest
+
+
+class EnsemblePredictor:
+    """DL head + RandomForest ensemble sharing a single backbone pass.
+
+    The Keras classifier is rewired to also output its GlobalAveragePooling2D
+    embedding, so one forward pass gives both the dense-head probabilities and
+    the features for the forest. Inputs go in exactly as the DL model was
+    trained (train_model.py: RGB scaled to [0,1]); the forest must be trained on
+    embeddings from this same predictor.
+
+    `metrics` is optional: any object with a `track(model, batch_size)` context
+    manager (e.g. the InferenceMetrics of src/tools/monitoring); each forward
+    pass is recorded under the `name` label.
+    """
+    def __init__(self, dl_model, ml=None, dl_weight=0.5, metrics=None, name="ensemble"):
+        if isinstance(dl_model, DLClassifier):
+            dl_model = dl_model.model
+        if dl_model is None:
+            raise ValueError("DL model not loaded")
+        gap = next((layer for layer in dl_model.layers
+                    if isinstance(layer, layers.GlobalAveragePooling2D)), None)
+        if gap is None:
+            raise ValueError("DL model has no GlobalAveragePooling2D layer to share")
+        self.model = models.Model(inputs=dl_model.input, outputs=[gap.output, dl_model.output])
+        self._gap = gap
+        self.ml = ml
+        self.dl_weight = dl_weight
+        self.metrics = metrics
+        self.name = name
+
+    def fingerprint(self):
+        """Hash of the input shape and backbone weights (everything up to the GAP)."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(self.model.input_shape).encode())
+        for layer in self.model.layers:
+            if layer is self._gap:
+                break
+            for w in layer.get_weights():
+                h.update(np.ascontiguousarray(w).tobytes())
+        return h.hexdigest()
+
+    def predict(self, np_image_batch):
+        """Return (embeddings (N, features), dl_probs (N, classes)) from one pass."""
+        x = np.asarray(np_image_batch, dtype=np.float32)
+        if x.ndim == 3:
+            x = x[None]
+        with self.metrics.track(self.name, batch_size=len(x)) if self.metrics else nullcontext():
+            # Direct call: no tf.data/predict() setup per batch (matters for single frames)
+            embeddings, probs = self.model(x, training=False)
+        return embeddings.numpy(), probs.numpy()
+
+    def extract(self, np_image_batch):
+        """Embeddings only (same interface as FeatureExtractor.extract)."""
+        return self.predict(np_image_batch)[0]
+
+    def combine(self, dl_probs, embeddings):
+        """Weighted average of the DL and forest probabilities."""
+        if self.ml is None:
+            return dl_probs
+        ml_probs = self.ml.predict_proba(embeddings)
+        return self.dl_weight * dl_probs + (1.0 - self.dl_weight) * ml_probs
+
+    def predict_proba(self, np_image_batch):
+        embeddings, dl_probs = self.predict(np_image_batch)
+        return self.combine(dl_probs, embeddings)
+
+    def predict_generator(self, generator):
+        """One pass over a Keras directory iterator.
+
+        Returns (embeddings, dl_probs, labels) aligned sample by sample; labels
+        are class indices (None if the generator yields no labels).
+        """
+        generator.reset()
+        feats, probs, labels = [], [], []
+        for _ in range(len(generator)):
+            batch = next(generator)
+            xb, yb = batch if isinstance(batch, tuple) else (batch, None)
+            emb, p = self.predict(xb)
+            feats.append(emb)
+            probs.append(p)
+            if yb is not None:
+                labels.append(np.argmax(yb, axis=1) if yb.ndim > 1 else yb)
+        return (np.vstack(feats), np.vstack(probs),
+                np.concatenate(labels) if labels else None)
 
 
 # Utility helpers
@@ -125,7 +250,6 @@ def load_class_names(path):
         return json.load(f)
 
 def preprocess_pil_image_bytes(image_bytes, target_size=(224,224)):
-    img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    img = img.resize(target_size)
-    arr = np.asarray(img).astype('float32') / 255.0
+    # Single image; for the serving path use ImagePreprocessor (batches, reused buffers)
+    arr = decode_image(image_bytes, target_size).astype('float32') / 255.0
     return arr  # shape (h,w,3)
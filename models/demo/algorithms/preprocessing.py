@@ -0,0 +1,116 @@
+# ======================================================                     *
+#  Project      : algorithms                                                 *
+#  File         : preprocessing.py                                           *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 03:05                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+# model/preprocessing.py
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+from PIL import Image
+
+# Output scalings from uint8 pixels, applied in a single pass:
+#   "unit":      [0, 1]   (models trained on rescale=1/255, EnsemblePredictor)
+#   "mobilenet": [-1, 1]  (same as mobilenet_v2.preprocess_input(x * 255))
+SCALES = {
+    "unit": (1.0 / 255.0, 0.0),
+    "mobilenet": (1.0 / 127.5, -1.0),
+}
+
+
+def decode_image(data, target_size=(224, 224), out=None):
+    """Decode image bytes straight to an RGB uint8 array of `target_size` (w, h).
+
+    JPEGs use draft mode: libjpeg scales by 1/2, 1/4 or 1/8 during the DCT to
+    the smallest size still >= target, so a 12 MP photo is never fully
+    decoded. The remaining resize is bilinear. Writes into `out` (h, w, 3)
+    when given.
+    """
+    img = Image.open(io.BytesIO(data))
+    if img.format == "JPEG":
+        img.draft("RGB", target_size)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    if img.size != tuple(target_size):
+        # reducing_gap: cheap integer reduce first for large non-JPEG images
+        img = img.resize(target_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    if out is None:
+        return np.asarray(img)
+    out[...] = np.asarray(img)
+    return out
+
+
+class ImagePreprocessor:
+    """Batch preprocessing of uploads into a reused float32 buffer.
+
+    The returned array is a view of an internal buffer that the next call
+    overwrites; copy it if it must outlive the request. With `metrics` (an
+    object with a `track(model, batch_size)` context manager, like
+    EnsemblePredictor's) every batch is recorded under the `name` label.
+    """
+    def __init__(self, target_size=(224, 224), scale="unit", max_batch=32, workers=None,
+                 metrics=None, name="preprocess"):
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale '{scale}', expected one of {sorted(SCALES)}")
+        self.target_size = tuple(target_size)
+        self.scale, self.offset = SCALES[scale]
+        self.max_batch = max_batch
+        self.metrics = metrics
+        self.name = name
+        w, h = self.target_size
+        self._pixels = np.empty((max_batch, h, w, 3), dtype=np.uint8)
+        self._output = np.empty((max_batch, h, w, 3), dtype=np.float32)
+        # PIL releases the GIL while decoding and resizing
+        self._pool = ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1))
+
+    def __call__(self, uploads):
+        return self.preprocess(uploads)
+
+    def preprocess(self, uploads):
+        """Image bytes (one or many) -> float32 batch (N, h, w, 3)."""
+        if isinstance(uploads, (bytes, bytearray, memoryview)):
+            uploads = [uploads]
+        n = len(uploads)
+        if n > self.max_batch:
+            raise ValueError(f"Batch of {n} images exceeds max_batch={self.max_batch}")
+
+        with self.metrics.track(self.name, batch_size=n) if self.metrics else nullcontext():
+            if n == 1:
+                decode_image(uploads[0], self.target_size, out=self._pixels[0])
+            else:
+                list(self._pool.map(
+                    lambda i: decode_image(uploads[i], self.target_size, out=self._pixels[i]), range(n)
+                ))
+
+            # uint8 -> float32 and scaling in place, without intermediate arrays
+            out = self._output[:n]
+            np.multiply(self._pixels[:n], np.float32(self.scale), out=out, casting="unsafe")
+            if self.offset:
+                out += np.float32(self.offset)
+        return out
+
+    def close(self):
+        self._pool.shutdown(wait=False)
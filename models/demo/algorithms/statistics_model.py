@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:20                                           *
+#  Last Updated : 2026-10-19 03:03                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -31,8 +31,7 @@ import seaborn as sns
 import numpy as np
 from sklearn.metrics import confusion_matrix, classification_report
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
-from model import DLClassifier, FeatureExtractor
-import joblib
+from model import DLClassifier, EnsemblePredictor, MLClassifier
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_DIR = os.path.join(BASE_DIR, "models")
@@ -43,11 +42,12 @@ def run_evaluation(keras_model_path=None, ml_model_path=None, dataset_dir="../da
     if keras_model_path is None:
         keras_model_path = os.path.join(MODEL_DIR, "vowels_model.h5")
     if ml_model_path is None:
-        ml_model_path = os.path.join(MODEL_DIR, "ml_rf_joblib.pkl")
+        # RF trained on the shared-backbone embeddings (train_model.py)
+        ml_model_path = os.path.join(MODEL_DIR, "ml_rf.npz")
 
     dl = DLClassifier(model_path=keras_model_path)
-    fe = FeatureExtractor()
-    ml = joblib.load(ml_model_path)
+    ml = MLClassifier(model_path=ml_model_path)
+    ensemble = EnsemblePredictor(dl, ml)
 
     datagen = ImageDataGenerator(rescale=1./255, validation_split=0.2)
     val_gen = datagen.flow_from_directory(
@@ -59,24 +59,11 @@ def run_evaluation(keras_model_path=None, ml_model_path=None, dataset_dir="../da
         shuffle=False
     )
 
-    # Predictions
-    val_gen.reset()
-    dl_preds = dl.model.predict(val_gen, verbose=1)
-    # ML features
-    val_gen.reset()
-    feats = []
-    y = []
-    steps = int(np.ceil(val_gen.samples / val_gen.batch_size))
-    for i in range(steps):
-        xb, yb = next(val_gen)
-        feats.append(fe.extract(xb))
-        y.append(np.argmax(yb, axis=1))
-    Xval = np.vstack(feats)
-    ytrue = np.concatenate(y)
-    ml_probs = ml.predict_proba(Xval)
+    # Predictions: one backbone pass gives the DL probabilities and the ML features
+    Xval, dl_preds, ytrue = ensemble.predict_generator(val_gen)
 
     # Ensemble:
-    probs = (dl_preds[:len(ml_probs)] + ml_probs) / 2.0
+    probs = ensemble.combine(dl_preds, Xval)
     ypred = np.argmax(probs, axis=1)
 
     # Metrics + save
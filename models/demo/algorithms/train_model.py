@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:21                                           *
+#  Last Updated : 2026-10-19 03:04                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -25,6 +25,7 @@
 
 # model/train_model.py
 import os, re, json, numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from PIL import Image
 import matplotlib.pyplot as plt
@@ -34,9 +35,15 @@ from sklearn.utils import class_weight
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint, ReduceLROnPlateau
 
-from .model import DLClassifier, FeatureExtractor, MLClassifier, load_class_names
+from .model import DLClassifier, EnsemblePredictor, MLClassifier, load_class_names
+from .embedding_store import EmbeddingStore, embed_files
 import joblib
 
+# Árboles agregados al RF cuando solo hay muestras nuevas; al superar el
+# máximo se reentrena completo
+ML_INCREMENTAL_TREES = 25
+ML_MAX_TREES = 400
+
 
 def main():
     # Directorios
@@ -44,12 +51,45 @@ def main():
     TRAIN_DIR = os.path.join(BASE_DIR, "../dataset/train/")
     MODEL_DIR = os.path.join(BASE_DIR, "models")
     EVAL_ROOT = os.path.join(BASE_DIR, "evaluacion")
+    QUARANTINE_DIR = os.path.join(BASE_DIR, "cuarentena")
     os.makedirs(MODEL_DIR, exist_ok=True)
     os.makedirs(EVAL_ROOT, exist_ok=True)
 
     # Limpiar imágenes inválidas o corruptas
+    def decodifica_completa(path):
+        # JPEG a 1/8 de escala: igual recorre todos los datos comprimidos
+        try:
+            with Image.open(path) as img:
+                if img.format == "JPEG":
+                    img.draft(img.mode, (max(1, img.width // 8), max(1, img.height // 8)))
+                img.load()
+            return True
+        except Exception:
+            return False
+
+    def estado_imagen(path):
+        # "ok", "invalida" (falla verify) o "truncada"
+        try:
+            with Image.open(path) as img:
+                formato = img.format
+                img.verify()
+        except Exception:
+            return "invalida"
+        if formato in ("JPEG", "PNG"):
+            # Camino rápido: marcador de fin al final del archivo. Si no está
+            # puede haber datos agregados (relleno, video de motion photo):
+            # solo es truncada si no se puede decodificar
+            marcador = b"\xff\xd9" if formato == "JPEG" else b"IEND\xaeB`\x82"
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 64))
+                if marcador not in f.read() and not decodifica_completa(path):
+                    return "truncada"
+        return "ok"
+
     def limpiar_imagenes_invalidas(base_dir):
         print(f"Verificando imágenes en {base_dir} ...")
+        rutas = []
         for root, _, files in os.walk(base_dir):
             for file in files:
                 path = os.path.join(root, file)
@@ -61,12 +101,21 @@ def main():
                 if path != nuevo_path:
                     os.rename(path, nuevo_path)
                     path = nuevo_path
-                try:
-                    with Image.open(path) as img:
-                        img.verify()
-                except Exception:
-                    print("Imagen inválida:", path)
-                    os.remove(path)
+                rutas.append(path)
+
+        # Verificación en paralelo (E/S: hilos)
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            estados = list(pool.map(estado_imagen, rutas, chunksize=64))
+        for path, estado in zip(rutas, estados):
+            if estado == "invalida":
+                print("Imagen inválida:", path)
+                os.remove(path)
+            elif estado == "truncada":
+                # Fuera de base_dir para que no se cargue; no se borra
+                destino = os.path.join(QUARANTINE_DIR, os.path.relpath(path, base_dir))
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                os.replace(path, destino)
+                print("Imagen truncada, movida a cuarentena:", destino)
         print("Limpieza completada.")
 
     limpiar_imagenes_invalidas(TRAIN_DIR)
@@ -142,32 +191,54 @@ def main():
     print("DL model saved:", final_keras_path)
 
     # Extraer características y entrenar modelo ML
-    fe = FeatureExtractor()
+    # (embedding GAP del mismo backbone que el modelo DL, guardado por hash de
+    # contenido: solo se calculan las imágenes nuevas o modificadas)
+    ensemble = EnsemblePredictor(model)
+    fingerprint = ensemble.fingerprint()
     datagen_plain = ImageDataGenerator(rescale=1./255)
     full_gen = datagen_plain.flow_from_directory(
         TRAIN_DIR, target_size=IMG_SIZE, batch_size=BATCH, class_mode='categorical', shuffle=False
     )
-
-    full_gen.reset()
-    feats = []
-    labels = []
-    steps = int(np.ceil(full_gen.samples / full_gen.batch_size))
-    for i in range(steps):
-        xbatch, ybatch = next(full_gen)
-        f = fe.extract(xbatch)
-        feats.append(f)
-        labels.append(np.argmax(ybatch, axis=1))
-    X = np.vstack(feats)
-    y = np.concatenate(labels)
+    store = EmbeddingStore(os.path.join(MODEL_DIR, "embeddings.npz"), fingerprint)
+    X, hashes, embedded = embed_files(ensemble, full_gen.filepaths, store, target_size=IMG_SIZE, batch_size=BATCH)
+    y = np.asarray(full_gen.classes)
+    store.save(keep=hashes)
 
     print("Features shape:", X.shape, "Labels shape:", y.shape)
+    print(f"Embeddings: {embedded} calculados, {len(hashes) - embedded} desde caché")
+
+    # Train ML classifier: reutilizar, agregar árboles o reentrenar completo
+    ml_path = os.path.join(MODEL_DIR, "ml_rf.npz")
+    manifest_path = os.path.join(MODEL_DIR, "ml_rf_manifest.json")
+    samples = {h: class_names[label] for h, label in zip(hashes, y)}
+    previous = None
+    if os.path.exists(ml_path) and os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding='utf-8') as f:
+            previous = json.load(f)
+        if previous.get("fingerprint") != fingerprint or previous.get("class_names") != class_names:
+            previous = None
 
-    # Train ML classifier
     ml = MLClassifier()
-    ml.fit(X, y)
-    ml_path = os.path.join(MODEL_DIR, "ml_rf_joblib.pkl")
+    if previous is not None and previous["samples"] == samples:
+        ml.load(ml_path)
+        print("ML model sin cambios en los datos, se reutiliza:", ml_path)
+    elif (previous is not None
+          and all(samples.get(h) == c for h, c in previous["samples"].items())
+          and set(y) == set(range(num_classes))):
+        # Solo se agregaron muestras: árboles nuevos sobre la matriz completa
+        ml.load(ml_path)
+        if ml.forest.n_trees + ML_INCREMENTAL_TREES <= ML_MAX_TREES:
+            ml.add_trees(X, y, n_trees=ML_INCREMENTAL_TREES, random_state=ml.forest.n_trees)
+            print(f"ML model: +{ML_INCREMENTAL_TREES} árboles ({ml.forest.n_trees} en total)")
+        else:
+            ml.fit(X, y)
+    else:
+        ml.fit(X, y)
     ml.save(ml_path)
+    with open(manifest_path, "w", encoding='utf-8') as f:
+        json.dump({"fingerprint": fingerprint, "class_names": class_names, "samples": samples}, f)
     print("ML model saved:", ml_path)
+    ensemble.ml = ml
 
     # Evaluación conjunta DL + ML
     val_plain = ImageDataGenerator(rescale=1./255, validation_split=0.2)
@@ -180,26 +251,11 @@ def main():
         shuffle=False
     )
 
-    val_gen2.reset()
-    dl_preds = model.predict(val_gen2, verbose=1)
-
-    # Extract validation features
-    val_gen2.reset()
-    feats_val = []
-    y_val = []
-    steps_val = int(np.ceil(val_gen2.samples / val_gen2.batch_size))
-    for i in range(steps_val):
-        xb, yb = next(val_gen2)
-        feats_val.append(fe.extract(xb))
-        y_val.append(np.argmax(yb, axis=1))
-    Xval = np.vstack(feats_val)
-    ytrue = np.concatenate(y_val)
-
-    # ML predictions
-    ml_probs = ml.predict_proba(Xval)
+    # Una pasada: embeddings para el RF y probabilidades DL
+    Xval, dl_preds, ytrue = ensemble.predict_generator(val_gen2)
 
     # Ensemble: average probabilities
-    ensemble_probs = (dl_preds[:len(ml_probs)] + ml_probs) / 2.0
+    ensemble_probs = ensemble.combine(dl_preds, Xval)
     ypred = np.argmax(ensemble_probs, axis=1)
 
     # Confusion matrix and report
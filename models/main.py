@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 17:58                                           *
+#  Last Updated : 2026-10-19 02:52                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -29,23 +29,31 @@ Script principal TODO-EN-UNO para el sistema de entrenamiento automático.
 
 Uso:
     python main.py setup --dataset /ruta/dataset
+    python main.py tune-loader
     python main.py train
+    python main.py search --trials 20 --workers 2
+    python main.py distill --student mobilenet_v2_035
+    python main.py prune --sparsity 0.25 0.5 0.75
+    python main.py profile --version v1
     python main.py evaluate
     python main.py dashboard
 """
 
 import argparse
+import statistics  # noqa: F401 - el estándar, antes de que src/statistics lo tape
 import sys
 from pathlib import Path
 
-# Agregar src al path ANTES de cualquier import
+# Agregar src al path ANTES de cualquier import. Los paquetes de src se
+# importan sin prefijo, igual que entre ellos (un solo módulo por paquete);
+# la excepción es `src.statistics`, que choca con el `statistics` estándar
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 
 def setup_dataset(args):
     """Paso 1: Configurar dataset automáticamente."""
-    from src.core.dataset_discovery import DatasetDiscovery
-    from src.core.auto_config_generator import AutoConfigGenerator
+    from core.dataset_discovery import DatasetDiscovery
+    from core.auto_config_generator import AutoConfigGenerator
     import yaml
     
     print("\n" + "="*70)
@@ -60,7 +68,14 @@ def setup_dataset(args):
     
     # Descubrir dataset
     print("Analizando estructura del dataset...")
-    discovery = DatasetDiscovery(str(dataset_path))
+    # El manifiesto permite re-escanear solo los directorios modificados
+    discovery = DatasetDiscovery(
+        str(dataset_path),
+        manifest_path='config/generated/dataset_manifest.sqlite',
+        scan_workers=args.scan_workers,
+        full_scan=args.full_scan,
+        probe_media=not args.no_probe
+    )
     report = discovery.discover()
     
     # Mostrar resumen
@@ -68,6 +83,8 @@ def setup_dataset(args):
     print(f"  • Tipo: {report['dataset_type']}")
     print(f"  • Total de clases: {report['total_classes']}")
     print(f"  • Total de archivos: {report['distribution']['total_files']}")
+    if report['quarantined_files']:
+        print(f"  • En cuarentena: {report['quarantined_files']} (ver quarantine.json)")
     print(f"  • Promedio por clase: {report['distribution']['avg_samples']:.1f}")
     
     # Mostrar algunas clases
@@ -81,12 +98,14 @@ def setup_dataset(args):
     
     # Generar configuración
     print("\nGenerando configuración automática...")
-    config_gen = AutoConfigGenerator(report)
+    config_gen = AutoConfigGenerator(report, plan_batch_size=args.plan_batch)
     config = config_gen.generate()
     
     print(f"Modelo: {config['model']['architecture']}")
     print(f"Backbone: {config['model']['backbone']}")
     print(f"Batch size: {config['dataset']['batch_size']}")
+    if config['training'].get('gradient_accumulation_steps', 1) > 1:
+        print(f"Acumulación de gradiente: {config['training']['gradient_accumulation_steps']} pasos")
     print(f"Epochs: {config['training']['epochs']}")
     
     # Guardar configuraciones
@@ -97,7 +116,35 @@ def setup_dataset(args):
     config_gen.save(output_dir)
     
     # Guardar config de data loaders
-    loader_config = discovery.get_data_loaders_config()
+    # El YAML solo guarda metadatos; las muestras y el split van en archivos binarios
+    # Las muestras de un setup anterior conservan su split
+    sample_index = discovery.build_sample_index(
+        previous_splits_path=output_dir / 'sample_splits.npz'
+    )
+    sample_index.save(output_dir / 'sample_index.npz')
+    sample_index.save_splits(output_dir / 'sample_splits.npz')
+    index_file, splits_file = 'sample_index.npz', 'sample_splits.npz'
+    
+    if args.dedup:
+        # Índice filtrado sin duplicados; el completo se conserva
+        print("\nDeduplicando dataset...")
+        sample_index, dedup_report = discovery.deduplicate(
+            sample_index, report_path=output_dir / 'dedup_report.json'
+        )
+        index_file, splits_file = 'sample_index_dedup.npz', 'sample_splits_dedup.npz'
+        sample_index.save(output_dir / index_file)
+        sample_index.save_splits(output_dir / splits_file)
+    
+    loader_config = discovery.get_data_loaders_config(
+        sample_index_file=index_file,
+        sample_splits_file=splits_file
+    )
+    if args.dedup:
+        loader_config['dedup'] = {
+            'report': 'dedup_report.json',
+            'total_samples': dedup_report['total_samples'],
+            'kept_samples': dedup_report['kept_samples']
+        }
     loader_config_path = output_dir / 'data_loaders_config.yaml'
     with open(loader_config_path, 'w', encoding='utf-8') as f:
         yaml.dump(loader_config, f, default_flow_style=False, allow_unicode=True)
@@ -115,18 +162,31 @@ def train_model(args):
     import torch
     import yaml
     import json
+    import shutil
     import numpy as np
-    from src.data.loaders.universal_loader import create_data_loaders
-    from src.algorithms.deep.simple_hybrid_model import SimpleHybridModel
-    from src.training.deep.hybrid_trainer import HybridTrainer
-    from src.core.version_manager import VersionManager
-    from src.core.experiment_logger import ExperimentLogger
-    from src.metrics.analysis.error_analyzer import ErrorAnalyzer
+    from data.loaders.universal_loader import create_data_loaders, close_data_loaders
+    from algorithms.deep.simple_hybrid_model import SimpleHybridModel
+    from algorithms.deep.early_exit_model import EarlyExitHybridModel
+    from training.deep.hybrid_trainer import HybridTrainer
+    from training.deep.early_exit_trainer import EarlyExitTrainer
+    from training.deep.profiling import StepProfiler, parse_step_range
+    from core.version_manager import VersionManager
+    from core.experiment_logger import ExperimentLogger
+    from src.statistics.analysis.error_analyzer import ErrorAnalyzer
+    from tools.monitoring import MetricsServer
     
     print("\n" + "="*70)
     print("PASO 2: ENTRENAMIENTO CON VERSIONADO AUTOMÁTICO")
     print("="*70 + "\n")
     
+    profile_steps = None
+    if getattr(args, 'profile_steps', None):
+        try:
+            profile_steps = parse_step_range(args.profile_steps)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+    
     # Verificar configuración
     config_path = Path('config/generated/auto_generated_config.yaml')
     if not config_path.exists():
@@ -145,23 +205,42 @@ def train_model(args):
     run_id = experiment_logger.start_run(config)
     print(f"Run ID: {run_id}")
     
+    loaders = {}
     try:
         # Crear data loaders
         print("\nPreparando datos...")
+        video_aug = config.get('augmentation', {}).get('video', {})
+        variable_length = video_aug.get('temporal_sampling') == 'fps'
+        
         loaders = create_data_loaders(
             config_path='config/generated/data_loaders_config.yaml',
             batch_size=config['dataset']['batch_size'],
             num_workers=config['dataset']['num_workers'],
-            extract_landmarks=config['features']['landmarks']['enabled']
+            extract_landmarks=config['features']['landmarks']['enabled'],
+            video_target_fps=video_aug.get('target_fps') if variable_length else None,
+            video_max_frames=video_aug.get('max_frames', 90),
+            landmark_server=config['features']['landmarks'].get('server', False),
+            prefetch_factor=config['dataset'].get('prefetch_factor', 2),
+            persistent_workers=config['dataset'].get('persistent_workers', False),
+            pin_memory=config['dataset'].get('pin_memory'),
+            batch_augmentation=config['augmentation']['image'].get('batch_level', False),
+            landmark_cache_dir=config['features']['landmarks'].get('cache_dir')
         )
         
         print(f"Train: {len(loaders['train'].dataset)} muestras")
         print(f"Val: {len(loaders['val'].dataset)} muestras")
         print(f"Test: {len(loaders['test'].dataset)} muestras")
         
-        # Crear modelo
+        # Crear modelo (con salidas tempranas si se pidió)
         print("\nConstruyendo modelo...")
-        model = SimpleHybridModel(
+        early_exit = getattr(args, 'early_exit', False) or \
+            config['model'].get('early_exit', {}).get('enabled', False)
+        if early_exit:
+            config['model'].setdefault('early_exit', {})['enabled'] = True
+        model_class = EarlyExitHybridModel if early_exit else SimpleHybridModel
+        trainer_class = EarlyExitTrainer if early_exit else HybridTrainer
+        
+        model = model_class(
             num_classes=config['dataset']['num_classes'],
             backbone=config['model']['backbone'],
             use_landmarks=config['model']['use_landmarks'],
@@ -180,14 +259,27 @@ def train_model(args):
         print("ENTRENANDO...")
         print("="*70)
         
-        trainer = HybridTrainer(
+        # Historial por época (incluye el tiempo por etapa) en el experimento
+        trainer = trainer_class(
             model=model,
             train_loader=loaders['train'],
             val_loader=loaders['val'],
             test_loader=loaders['test'],
-            config=config
+            config=config,
+            epoch_callback=lambda epoch, metrics: experiment_logger.log_epoch(run_id, epoch, metrics)
         )
         
+        # Endpoint de métricas (hilo daemon: termina con el proceso)
+        if getattr(args, 'metrics_port', None) is not None:
+            metrics_server = MetricsServer(port=args.metrics_port).start()
+            print(f"Métricas en: {metrics_server.url}")
+        
+        # La versión aún no existe: el perfil se mueve a evaluation/<versión>/profile al registrarla
+        profile_dir = Path('history') / 'profiles' / run_id
+        if profile_steps:
+            print(f"Perfilando pasos {profile_steps[0]}-{profile_steps[1]}")
+            trainer.step_profiler = StepProfiler(profile_steps, profile_dir, device=trainer.device)
+        
         results = trainer.train()
         
         # Análisis de errores
@@ -230,7 +322,7 @@ def train_model(args):
             eval_dir = Path('evaluation') / version_name
             
             # Modelo
-            trainer.save_model(version_dir / 'final' / 'model.pth')
+            trainer.save_model(version_dir / 'final' / 'model.pth', bundle=True)
             
             # Config
             with open(version_dir / 'config' / 'training_config.yaml', 'w') as f:
@@ -256,6 +348,21 @@ def train_model(args):
             with open(analysis_dir / 'error_analysis.json', 'w') as f:
                 json.dump(error_analysis, f, indent=2, ensure_ascii=False)
             
+            # Calibración de salidas tempranas (umbrales, latencia por salida)
+            if 'early_exit' in results:
+                early_exit_dir = eval_dir / 'early_exit'
+                early_exit_dir.mkdir(parents=True, exist_ok=True)
+                with open(early_exit_dir / 'calibration.json', 'w') as f:
+                    json.dump(results['early_exit'], f, indent=2)
+            
+            # Perfil de la ventana de pasos (trace de Chrome + top de operadores)
+            if profile_dir.exists():
+                eval_profile_dir = eval_dir / 'profile'
+                eval_profile_dir.mkdir(parents=True, exist_ok=True)
+                for profile_file in profile_dir.iterdir():
+                    shutil.move(str(profile_file), str(eval_profile_dir / profile_file.name))
+                profile_dir.rmdir()
+            
             # Visualizaciones
             trainer.plot_training_history(analysis_dir)
             trainer.plot_confusion_matrix(
@@ -279,6 +386,8 @@ def train_model(args):
             print(f"\nVersión: {version_name}")
             print(f"Modelo: models/{version_name}/final/model.pth")
             print(f"Evaluación: evaluation/{version_name}/")
+            if profile_steps:
+                print(f"Perfil: evaluation/{version_name}/profile/")
             print(f"\nMétricas:")
             print(f"  • Test Accuracy: {results['test_metrics']['test_accuracy']:.4f}")
             print(f"  • Test F1-Score: {results['test_metrics']['test_f1']:.4f}")
@@ -295,6 +404,8 @@ def train_model(args):
             return True
         else:
             print("\nNo se creó nueva versión (no hubo mejora suficiente)")
+            if profile_dir.exists():
+                print(f"Perfil: {profile_dir}/")
             experiment_logger.end_run(
                 run_id=run_id,
                 results=results['test_metrics'],
@@ -315,11 +426,529 @@ def train_model(args):
             success=False
         )
         return False
+    finally:
+        close_data_loaders(loaders)
+
+
+def tune_loader(args):
+    """Ajusta los parámetros del DataLoader midiendo throughput real."""
+    from core.loader_tuner import LoaderAutotuner
+    import yaml
+    
+    print("\n" + "="*70)
+    print("AJUSTE AUTOMÁTICO DEL DATALOADER")
+    print("="*70 + "\n")
+    
+    config_path = Path('config/generated/auto_generated_config.yaml')
+    loader_config_path = Path('config/generated/data_loaders_config.yaml')
+    if not config_path.exists() or not loader_config_path.exists():
+        print("Error: No se encontró configuración.")
+        print("   Ejecuta primero: python main.py setup --dataset /ruta/dataset")
+        return False
+    
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    tuner = LoaderAutotuner(
+        loader_config_path=str(loader_config_path),
+        config=config,
+        max_batches=args.max_batches,
+        epochs=args.epochs
+    )
+    
+    best = tuner.tune()
+    
+    print("\nMejor configuración:")
+    print(f"  • num_workers: {best['num_workers']}")
+    print(f"  • prefetch_factor: {best['prefetch_factor']}")
+    print(f"  • persistent_workers: {best['persistent_workers']}")
+    print(f"  • pin_memory: {best['pin_memory']}")
+    print(f"  • Throughput: {best['samples_per_sec']:.1f} muestras/s")
+    print(f"  • RSS pico: {best['peak_rss_mb']:.0f} MB")
+    
+    tuner.update_config(config_path, best)
+    
+    print("\n" + "="*70 + "\n")
+    return True
+
+
+def search_hyperparameters(args):
+    """Búsqueda de hiperparámetros con trials en paralelo y poda temprana."""
+    from training.deep.hyperparameter_search import HyperparameterSearch
+    from src.statistics.analysis.error_analyzer import ErrorAnalyzer
+    from core.version_manager import VersionManager
+    from training.deep.tensor_bundle import BUNDLE_NAME, export_inference_bundle
+    import torch
+    import yaml
+    import json
+    import numpy as np
+    
+    print("\n" + "="*70)
+    print("BÚSQUEDA DE HIPERPARÁMETROS")
+    print("="*70 + "\n")
+    
+    config_path = Path('config/generated/auto_generated_config.yaml')
+    loader_config_path = Path('config/generated/data_loaders_config.yaml')
+    if not config_path.exists() or not loader_config_path.exists():
+        print("Error: No se encontró configuración.")
+        print("   Ejecuta primero: python main.py setup --dataset /ruta/dataset")
+        return False
+    
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    try:
+        search = HyperparameterSearch(
+            config=config,
+            data_config_path=str(loader_config_path),
+            study_name=args.study_name,
+            n_trials=args.trials,
+            n_workers=args.workers,
+            epochs=args.epochs,
+            warmup_epochs=args.warmup_epochs,
+            freeze_backbone=args.freeze_backbone
+        )
+    except ImportError as e:
+        print(f"Error: {e}")
+        return False
+    
+    summary = search.run()
+    
+    print(f"\nTrials completos: {summary['n_complete']} | Podados: {summary['n_pruned']}")
+    if summary['best_trial'] is None:
+        print("Ningún trial terminó; no hay versión que registrar")
+        return False
+    
+    best = summary['best_trial']
+    print(f"\nMejor trial: #{best['number']} (val_acc {best['val_acc']:.4f})")
+    for name, value in best['params'].items():
+        print(f"  • {name}: {value}")
+    
+    # Registrar el mejor trial como versión
+    print("\n" + "="*70)
+    print("GESTIONANDO VERSIONES...")
+    print("="*70)
+    
+    model, best_config, checkpoint = search.load_best_model(summary)
+    trial_dir = Path(best['dir'])
+    with open(trial_dir / 'metrics.json', 'r', encoding='utf-8') as f:
+        test_metrics = json.load(f)
+    predictions = np.load(trial_dir / 'predictions.npz')
+    
+    error_analyzer = ErrorAnalyzer(
+        predictions=predictions['predictions'].tolist(),
+        labels=predictions['labels'].tolist(),
+        class_names=best_config['dataset']['class_names']
+    )
+    error_analysis = error_analyzer.analyze()
+    
+    version_manager = VersionManager()
+    version_name = version_manager.create_new_version(
+        model_info={
+            'architecture': best_config['model']['architecture'],
+            'backbone': best_config['model']['backbone'],
+            'total_params': sum(p.numel() for p in model.parameters()),
+            'trainable_params': sum(p.numel() for p in model.parameters() if p.requires_grad),
+            'search': {
+                'study_name': summary['study_name'],
+                'trial': best['number'],
+                'val_acc': best['val_acc']
+            }
+        },
+        metrics=test_metrics,
+        config=best_config,
+        force=args.force_version
+    )
+    
+    if not version_name:
+        print("\nNo se creó nueva versión (no hubo mejora suficiente)")
+        return False
+    
+    version_dir = Path('models') / version_name
+    eval_dir = Path('evaluation') / version_name
+    
+    torch.save({
+        'model_state_dict': model.state_dict(),
+        'config': best_config,
+        'history': checkpoint['history'],
+        'best_val_acc': checkpoint['best_val_acc']
+    }, version_dir / 'final' / 'model.pth')
+    export_inference_bundle(model, version_dir / 'final' / BUNDLE_NAME, best_config)
+    
+    with open(version_dir / 'config' / 'training_config.yaml', 'w') as f:
+        yaml.dump(best_config, f, default_flow_style=False, allow_unicode=True)
+    
+    metrics_dir = eval_dir / 'metrics'
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    with open(metrics_dir / 'test_metrics.json', 'w') as f:
+        json.dump(test_metrics, f, indent=2)
+    
+    analysis_dir = eval_dir / 'analysis'
+    analysis_dir.mkdir(parents=True, exist_ok=True)
+    with open(analysis_dir / 'error_analysis.json', 'w') as f:
+        json.dump(error_analysis, f, indent=2, ensure_ascii=False)
+    with open(analysis_dir / 'search_summary.json', 'w') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    
+    print(f"\nVersión: {version_name}")
+    print(f"Modelo: models/{version_name}/final/model.pth")
+    print(f"Estudio: {search.study_dir}")
+    print(f"  • Test Accuracy: {test_metrics['test_accuracy']:.4f}")
+    print("\n" + "="*70 + "\n")
+    return True
+
+
+def distill_model(args):
+    """Destila una versión registrada (teacher) en un modelo pequeño."""
+    from data.loaders.universal_loader import create_data_loaders, close_data_loaders
+    from training.deep.distillation_trainer import (
+        DistillationTrainer, create_model, load_registered_model, measure_latency
+    )
+    from core.version_manager import VersionManager
+    import copy
+    import torch
+    import yaml
+    import json
+    
+    print("\n" + "="*70)
+    print("DESTILACIÓN DE CONOCIMIENTO")
+    print("="*70 + "\n")
+    
+    loader_config_path = Path('config/generated/data_loaders_config.yaml')
+    if not loader_config_path.exists():
+        print("Error: No se encontró configuración.")
+        print("   Ejecuta primero: python main.py setup --dataset /ruta/dataset")
+        return False
+    
+    version_manager = VersionManager()
+    teacher_version = args.teacher or version_manager.get_best_version()
+    if teacher_version is None:
+        print("Error: No hay versiones registradas para usar como teacher.")
+        print("   Ejecuta primero: python main.py train")
+        return False
+    
+    teacher, teacher_config = load_registered_model(teacher_version)
+    print(f"Teacher: {teacher_version} ({teacher_config['model']['backbone']})")
+    
+    # Configuración del alumno: la del teacher con otro modelo
+    config = copy.deepcopy(teacher_config)
+    config['model']['backbone'] = args.student
+    config['model']['pretrained'] = False
+    if args.epochs is not None:
+        config['training']['epochs'] = args.epochs
+    config['distillation'] = {
+        'teacher_version': teacher_version,
+        'temperature': args.temperature,
+        'alpha': args.alpha
+    }
+    
+    landmarks_enabled = config['features']['landmarks']['enabled']
+    if args.student == 'landmark_mlp' and not landmarks_enabled:
+        print("Error: el alumno landmark_mlp requiere landmarks habilitados")
+        return False
+    
+    loaders = create_data_loaders(
+        config_path=str(loader_config_path),
+        batch_size=config['dataset']['batch_size'],
+        num_workers=config['dataset']['num_workers'],
+        extract_landmarks=landmarks_enabled,
+        landmark_server=config['features']['landmarks'].get('server', False),
+        prefetch_factor=config['dataset'].get('prefetch_factor', 2),
+        persistent_workers=config['dataset'].get('persistent_workers', False),
+        pin_memory=config['dataset'].get('pin_memory'),
+        batch_augmentation=config['augmentation']['image'].get('batch_level', False),
+        landmark_cache_dir=config['features']['landmarks'].get('cache_dir')
+    )
+    
+    student = create_model(config)
+    print(f"Alumno: {args.student} ({sum(p.numel() for p in student.parameters()):,} parámetros)")
+    
+    trainer = DistillationTrainer(
+        model=student,
+        train_loader=loaders['train'],
+        val_loader=loaders['val'],
+        test_loader=loaders['test'],
+        config=config,
+        teacher=teacher,
+        teacher_version=teacher_version,
+        temperature=args.temperature,
+        alpha=args.alpha
+    )
+    results = trainer.train()
+    close_data_loaders(loaders)
+    test_metrics = {
+        k: v for k, v in results['test_metrics'].items()
+        if k not in ['predictions', 'labels', 'probabilities']
+    }
+    
+    # Latencia de ambos modelos en las mismas condiciones (CPU, batch 1)
+    print("\nMidiendo latencia...")
+    teacher_latency = measure_latency(teacher, device='cpu')
+    student_latency = measure_latency(trainer.model, device='cpu')
+    teacher_metrics = version_manager.get_version_info(teacher_version)['metrics']
+    
+    comparison = {
+        'teacher': {
+            'version': teacher_version,
+            'backbone': teacher_config['model']['backbone'],
+            'test_accuracy': teacher_metrics.get('test_accuracy'),
+            'test_f1': teacher_metrics.get('test_f1'),
+            **teacher_latency
+        },
+        'student': {
+            'backbone': args.student,
+            'test_accuracy': test_metrics['test_accuracy'],
+            'test_f1': test_metrics['test_f1'],
+            **student_latency
+        },
+        'speedup': round(
+            teacher_latency['latency_ms_median'] / student_latency['latency_ms_median'], 2
+        ),
+        'size_ratio': round(student_latency['size_mb'] / teacher_latency['size_mb'], 4),
+        'distillation': config['distillation']
+    }
+    
+    print(f"\n{'':12s}{'Teacher':>14s}{'Alumno':>14s}")
+    print(f"{'Accuracy':12s}{comparison['teacher']['test_accuracy'] or 0:>14.4f}"
+          f"{comparison['student']['test_accuracy']:>14.4f}")
+    print(f"{'Latencia ms':12s}{teacher_latency['latency_ms_median']:>14.2f}"
+          f"{student_latency['latency_ms_median']:>14.2f}")
+    print(f"{'Tamaño MB':12s}{teacher_latency['size_mb']:>14.2f}{student_latency['size_mb']:>14.2f}")
+    
+    # El alumno es un artefacto distinto (para dispositivo): se registra
+    # aunque no supere al teacher
+    version_name = version_manager.create_new_version(
+        model_info={
+            'architecture': config['model']['architecture'],
+            'backbone': args.student,
+            'total_params': student_latency['total_params'],
+            'trainable_params': sum(p.numel() for p in trainer.model.parameters() if p.requires_grad),
+            'distilled_from': teacher_version
+        },
+        metrics=test_metrics,
+        config=config,
+        force=True
+    )
+    
+    version_dir = Path('models') / version_name
+    eval_dir = Path('evaluation') / version_name
+    
+    trainer.save_model(version_dir / 'final' / 'model.pth', bundle=True)
+    with open(version_dir / 'config' / 'training_config.yaml', 'w') as f:
+        yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+    
+    metrics_dir = eval_dir / 'metrics'
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    with open(metrics_dir / 'test_metrics.json', 'w') as f:
+        json.dump(test_metrics, f, indent=2)
+    
+    distillation_dir = eval_dir / 'distillation'
+    distillation_dir.mkdir(parents=True, exist_ok=True)
+    with open(distillation_dir / 'teacher_vs_student.json', 'w') as f:
+        json.dump(comparison, f, indent=2, ensure_ascii=False)
+    trainer.plot_training_history(distillation_dir)
+    
+    print(f"\nVersión: {version_name} (destilada de {teacher_version})")
+    print(f"Comparación: {distillation_dir / 'teacher_vs_student.json'}")
+    print("\n" + "="*70 + "\n")
+    return True
+
+
+def prune_model(args):
+    """Poda estructurada de canales con fine-tuning, a varios niveles de sparsity."""
+    from data.loaders.universal_loader import create_data_loaders, close_data_loaders
+    from algorithms.deep.channel_pruning import ChannelPruner, count_macs
+    from training.deep.hybrid_trainer import HybridTrainer
+    from training.deep.distillation_trainer import load_registered_model, measure_latency
+    from core.version_manager import VersionManager
+    import copy
+    import yaml
+    import json
+    
+    print("\n" + "="*70)
+    print("PODA ESTRUCTURADA DE CANALES")
+    print("="*70 + "\n")
+    
+    loader_config_path = Path('config/generated/data_loaders_config.yaml')
+    if not loader_config_path.exists():
+        print("Error: No se encontró configuración.")
+        print("   Ejecuta primero: python main.py setup --dataset /ruta/dataset")
+        return False
+    
+    version_manager = VersionManager()
+    base_version = args.version or version_manager.get_best_version()
+    if base_version is None:
+        print("Error: No hay versiones registradas para podar.")
+        print("   Ejecuta primero: python main.py train")
+        return False
+    
+    base_model, base_config = load_registered_model(base_version)
+    if not hasattr(base_model, 'visual_backbone'):
+        print(f"Error: la versión {base_version} no tiene backbone visual")
+        return False
+    
+    config = copy.deepcopy(base_config)
+    config['training']['epochs'] = args.epochs
+    config['training']['learning_rate'] = args.lr or base_config['training']['learning_rate'] * 0.1
+    
+    loaders = create_data_loaders(
+        config_path=str(loader_config_path),
+        batch_size=config['dataset']['batch_size'],
+        num_workers=config['dataset']['num_workers'],
+        extract_landmarks=config['features']['landmarks']['enabled'],
+        landmark_server=config['features']['landmarks'].get('server', False),
+        prefetch_factor=config['dataset'].get('prefetch_factor', 2),
+        persistent_workers=config['dataset'].get('persistent_workers', False),
+        pin_memory=config['dataset'].get('pin_memory'),
+        batch_augmentation=config['augmentation']['image'].get('batch_level', False),
+        landmark_cache_dir=config['features']['landmarks'].get('cache_dir')
+    )
+    
+    base_metrics = version_manager.get_version_info(base_version)['metrics']
+    variants = [{
+        'version': base_version,
+        'sparsity': 0.0,
+        'test_accuracy': base_metrics.get('test_accuracy'),
+        'macs': count_macs(base_model),
+        **measure_latency(base_model, device='cpu')
+    }]
+    print(f"Base: {base_version} ({base_config['model']['backbone']}, "
+          f"{variants[0]['latency_ms_median']:.2f} ms)")
+    
+    for sparsity in sorted(args.sparsity):
+        print(f"\n--- Sparsity {sparsity:.0%} ({args.criterion}) ---")
+        model, _ = load_registered_model(base_version)
+        channel_plan = ChannelPruner(model, criterion=args.criterion).prune(sparsity)
+        
+        variant_config = copy.deepcopy(config)
+        variant_config['pruning'] = {
+            'base_version': base_version,
+            'criterion': args.criterion,
+            'sparsity': sparsity
+        }
+        
+        trainer = HybridTrainer(
+            model=model,
+            train_loader=loaders['train'],
+            val_loader=loaders['val'],
+            test_loader=loaders['test'],
+            config=variant_config
+        )
+        results = trainer.train()
+        test_metrics = {
+            k: v for k, v in results['test_metrics'].items()
+            if k not in ['predictions', 'labels', 'probabilities']
+        }
+        
+        variant = {
+            'sparsity': sparsity,
+            'test_accuracy': test_metrics['test_accuracy'],
+            'macs': count_macs(trainer.model),
+            **measure_latency(trainer.model, device='cpu')
+        }
+        
+        # Cada nivel es un punto velocidad/precisión distinto: siempre se registra
+        version_name = version_manager.create_new_version(
+            model_info={
+                'architecture': variant_config['model']['architecture'],
+                'backbone': variant_config['model']['backbone'],
+                'total_params': variant['total_params'],
+                'trainable_params': sum(p.numel() for p in trainer.model.parameters() if p.requires_grad),
+                'pruned_from': base_version,
+                'sparsity': sparsity,
+                'macs': variant['macs']
+            },
+            metrics=test_metrics,
+            config=variant_config,
+            force=True
+        )
+        variant['version'] = version_name
+        variants.append(variant)
+        
+        version_dir = Path('models') / version_name
+        eval_dir = Path('evaluation') / version_name
+        
+        trainer.save_model(
+            version_dir / 'final' / 'model.pth', extra={'channel_plan': channel_plan}, bundle=True
+        )
+        with open(version_dir / 'config' / 'training_config.yaml', 'w') as f:
+            yaml.dump(variant_config, f, default_flow_style=False, allow_unicode=True)
+        with open(version_dir / 'artifacts' / 'channel_plan.json', 'w') as f:
+            json.dump(channel_plan, f, indent=2)
+        
+        metrics_dir = eval_dir / 'metrics'
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        with open(metrics_dir / 'test_metrics.json', 'w') as f:
+            json.dump(test_metrics, f, indent=2)
+        
+        pruning_dir = eval_dir / 'pruning'
+        pruning_dir.mkdir(parents=True, exist_ok=True)
+        with open(pruning_dir / 'pruning_report.json', 'w') as f:
+            json.dump({'base': variants[0], 'pruned': variant}, f, indent=2)
+    close_data_loaders(loaders)
+    
+    # Resumen de todos los puntos velocidad/precisión junto a la versión base
+    summary_dir = Path('evaluation') / base_version / 'pruning'
+    summary_dir.mkdir(parents=True, exist_ok=True)
+    with open(summary_dir / 'variants.json', 'w') as f:
+        json.dump({'criterion': args.criterion, 'variants': variants}, f, indent=2)
+    
+    print(f"\n{'Versión':10s}{'Sparsity':>10s}{'Accuracy':>10s}{'ms':>10s}{'MMACs':>10s}{'MB':>8s}")
+    for variant in variants:
+        print(f"{variant['version']:10s}{variant['sparsity']:>10.0%}{variant['test_accuracy'] or 0:>10.4f}"
+              f"{variant['latency_ms_median']:>10.2f}{variant['macs'] / 1e6:>10.1f}{variant['size_mb']:>8.2f}")
+    print(f"\nResumen: {summary_dir / 'variants.json'}")
+    print("\n" + "="*70 + "\n")
+    return True
+
+
+def profile_model(args):
+    """Perfila la inferencia de una versión registrada con torch.profiler."""
+    import torch
+    from core.version_manager import VersionManager
+    from training.deep.distillation_trainer import load_registered_model
+    from training.deep.profiling import profile_inference
+    
+    print("\n" + "="*70)
+    print("PERFILADO DE INFERENCIA")
+    print("="*70 + "\n")
+    
+    version = args.version or VersionManager().get_best_version()
+    if not version:
+        print("Error: No hay versiones registradas.")
+        print("   Ejecuta primero: python main.py train")
+        return False
+    
+    try:
+        model, config = load_registered_model(version)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return False
+    
+    device = args.device or ('cuda' if torch.cuda.is_available() else 'cpu')
+    print(f"Versión: {version} ({config['model']['backbone']})")
+    print(f"Device: {device} | Batch: {args.batch_size} | Iteraciones: {args.iterations}")
+    
+    output_dir = Path('evaluation') / version / 'profile'
+    exported = profile_inference(
+        model,
+        output_dir,
+        device=device,
+        batch_size=args.batch_size,
+        iterations=args.iterations,
+        metadata={'version': version, 'backbone': config['model']['backbone']}
+    )
+    
+    print(f"\nTrace de Chrome: {exported['trace']}")
+    print(f"Top de operadores: {exported['table']}")
+    print("\n" + "="*70 + "\n")
+    
+    return True
 
 
 def evaluate_models(args):
     """Paso 3: Evaluación detallada de modelos."""
-    from src.core.version_manager import VersionManager
+    from core.version_manager import VersionManager
     import json
     
     print("\n" + "="*70)
@@ -392,7 +1021,7 @@ def evaluate_models(args):
 
 def show_dashboard(args):
     """Mostrar dashboard del sistema."""
-    from src.tools.visualization.dashboard import SimpleDashboard
+    from tools.visualization.dashboard import SimpleDashboard
     
     dashboard = SimpleDashboard()
     dashboard.show_overview()
@@ -408,19 +1037,38 @@ Ejemplos de uso:
 
   # 1. Configurar dataset (solo la primera vez)
   python main.py setup --dataset /ruta/a/tu/dataset
-
-  # 2. Entrenar modelo
+  
+  # 2. Ajustar DataLoader al hardware (opcional)
+  python main.py tune-loader
+  
+  # 3. Entrenar modelo
   python main.py train
-
-  # 3. Ver resultados
+  
+  # 4. Ver resultados
   python main.py dashboard
   python main.py evaluate
-
-  # 4. Mejorar modelo (edita config y vuelve a entrenar)
+  
+  # 5. Mejorar modelo (edita config y vuelve a entrenar)
   python main.py train
-
-  # 5. Forzar nueva versión aunque no haya mejora
+  
+  # 6. Forzar nueva versión aunque no haya mejora
   python main.py train --force-version
+  
+  # 7. Buscar hiperparámetros (requiere optuna: pip install -e .[auto])
+  python main.py search --trials 20 --workers 2 --freeze-backbone
+  
+  # 8. Destilar la mejor versión en un modelo para dispositivo
+  python main.py distill --student mobilenet_v2_035
+  
+  # 9. Podar canales (una versión por nivel de sparsity)
+  python main.py prune --sparsity 0.25 0.5 0.75
+  
+  # 10. Perfilar pasos de entrenamiento o la inferencia de una versión
+  python main.py train --profile-steps 20-40
+  python main.py profile --version v1 --batch-size 8
+  
+  # 11. Métricas en vivo del entrenamiento (formato Prometheus)
+  python main.py train --metrics-port 9100
         """
     )
     
@@ -434,6 +1082,32 @@ Ejemplos de uso:
         required=True,
         help='Ruta al dataset'
     )
+    setup_parser.add_argument(
+        '--scan-workers',
+        type=int,
+        default=None,
+        help='Hilos para escanear directorios (default: automático)'
+    )
+    setup_parser.add_argument(
+        '--full-scan',
+        action='store_true',
+        help='Ignorar el manifiesto y re-escanear todo el dataset'
+    )
+    setup_parser.add_argument(
+        '--no-probe',
+        action='store_true',
+        help='No inspeccionar cabeceras de imágenes/videos (sin cuarentena)'
+    )
+    setup_parser.add_argument(
+        '--plan-batch',
+        action='store_true',
+        help='Medir el modelo en este equipo para elegir batch size y acumulación'
+    )
+    setup_parser.add_argument(
+        '--dedup',
+        action='store_true',
+        help='Eliminar duplicados exactos y casi-duplicados del índice de muestras'
+    )
     
     # Train
     train_parser = subparsers.add_parser('train', help='Entrenar modelo')
@@ -442,6 +1116,188 @@ Ejemplos de uso:
         action='store_true',
         help='Forzar creación de nueva versión'
     )
+    train_parser.add_argument(
+        '--early-exit',
+        action='store_true',
+        help='Entrenar con salidas tempranas y calibrar sus umbrales'
+    )
+    train_parser.add_argument(
+        '--profile-steps',
+        type=str,
+        default=None,
+        help='Perfilar una ventana de pasos con torch.profiler (ej: 20-40)'
+    )
+    train_parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=None,
+        help='Servir métricas en vivo en http://127.0.0.1:<puerto>/metrics'
+    )
+    
+    # Tune loader
+    tune_parser = subparsers.add_parser(
+        'tune-loader', help='Ajustar DataLoader midiendo throughput'
+    )
+    tune_parser.add_argument(
+        '--max-batches',
+        type=int,
+        default=20,
+        help='Batches medidos por época en cada prueba'
+    )
+    tune_parser.add_argument(
+        '--epochs',
+        type=int,
+        default=2,
+        help='Épocas cortas por prueba'
+    )
+    
+    # Search
+    search_parser = subparsers.add_parser(
+        'search', help='Búsqueda de hiperparámetros (Optuna)'
+    )
+    search_parser.add_argument(
+        '--trials',
+        type=int,
+        default=20,
+        help='Número total de trials'
+    )
+    search_parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Procesos que ejecutan trials en paralelo'
+    )
+    search_parser.add_argument(
+        '--epochs',
+        type=int,
+        default=None,
+        help='Épocas por trial (default: las de la configuración)'
+    )
+    search_parser.add_argument(
+        '--warmup-epochs',
+        type=int,
+        default=2,
+        help='Épocas antes de poder podar un trial'
+    )
+    search_parser.add_argument(
+        '--study-name',
+        type=str,
+        default=None,
+        help='Nombre del estudio (si existe, se reanuda)'
+    )
+    search_parser.add_argument(
+        '--freeze-backbone',
+        action='store_true',
+        help='Entrenar solo landmarks + clasificador sobre features compartidas'
+    )
+    search_parser.add_argument(
+        '--force-version',
+        action='store_true',
+        help='Forzar creación de nueva versión'
+    )
+    
+    # Distill
+    distill_parser = subparsers.add_parser(
+        'distill', help='Destilar una versión en un modelo pequeño'
+    )
+    distill_parser.add_argument(
+        '--teacher',
+        type=str,
+        default=None,
+        help='Versión teacher (default: la mejor registrada)'
+    )
+    distill_parser.add_argument(
+        '--student',
+        type=str,
+        default='mobilenet_v2_035',
+        choices=['mobilenet_v2_035', 'mobilenet_v2_050', 'landmark_mlp'],
+        help='Modelo alumno'
+    )
+    distill_parser.add_argument(
+        '--temperature',
+        type=float,
+        default=4.0,
+        help='Temperatura de los logits suaves'
+    )
+    distill_parser.add_argument(
+        '--alpha',
+        type=float,
+        default=0.7,
+        help='Peso de la pérdida de destilación (1 - alpha para la CE)'
+    )
+    distill_parser.add_argument(
+        '--epochs',
+        type=int,
+        default=None,
+        help='Épocas del alumno (default: las de la configuración)'
+    )
+    
+    # Prune
+    prune_parser = subparsers.add_parser(
+        'prune', help='Podar canales del backbone y registrar variantes'
+    )
+    prune_parser.add_argument(
+        '--version',
+        type=str,
+        default=None,
+        help='Versión a podar (default: la mejor registrada)'
+    )
+    prune_parser.add_argument(
+        '--sparsity',
+        type=float,
+        nargs='+',
+        default=[0.25, 0.5, 0.75],
+        help='Fracciones de canales a eliminar (una variante por valor)'
+    )
+    prune_parser.add_argument(
+        '--criterion',
+        type=str,
+        default='l1',
+        choices=['l1', 'bn_gamma'],
+        help='Criterio de importancia de canales'
+    )
+    prune_parser.add_argument(
+        '--epochs',
+        type=int,
+        default=5,
+        help='Épocas de fine-tuning por variante'
+    )
+    prune_parser.add_argument(
+        '--lr',
+        type=float,
+        default=None,
+        help='Learning rate del fine-tuning (default: 0.1 × el de la versión)'
+    )
+    
+    # Profile
+    profile_parser = subparsers.add_parser(
+        'profile', help='Perfilar la inferencia de una versión registrada'
+    )
+    profile_parser.add_argument(
+        '--version',
+        type=str,
+        default=None,
+        help='Versión a perfilar (default: la mejor registrada)'
+    )
+    profile_parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='Batch size de las entradas sintéticas'
+    )
+    profile_parser.add_argument(
+        '--iterations',
+        type=int,
+        default=20,
+        help='Forwards capturados'
+    )
+    profile_parser.add_argument(
+        '--device',
+        type=str,
+        default=None,
+        choices=['cpu', 'cuda'],
+        help='Device (default: cuda si está disponible)'
+    )
     
     # Evaluate
     subparsers.add_parser('evaluate', help='Evaluar modelos')
@@ -459,6 +1315,11 @@ Ejemplos de uso:
     commands = {
         'setup': setup_dataset,
         'train': train_model,
+        'tune-loader': tune_loader,
+        'search': search_hyperparameters,
+        'distill': distill_model,
+        'prune': prune_model,
+        'profile': profile_model,
         'evaluate': evaluate_models,
         'dashboard': show_dashboard
     }
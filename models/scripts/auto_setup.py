@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 17:36                                           *
+#  Last Updated : 2026-10-19 02:19                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -107,7 +107,17 @@ def main():
     config_gen.save(output_dir)
     
     # Guardar también config de data loaders
-    loader_config = discovery.get_data_loaders_config()
+    # El YAML solo guarda metadatos; las muestras y el split van en archivos binarios
+    loader_config = discovery.get_data_loaders_config(
+        sample_index_file='sample_index.npz',
+        sample_splits_file='sample_splits.npz'
+    )
+    # Las muestras de un setup anterior conservan su split
+    sample_index = discovery.build_sample_index(
+        previous_splits_path=output_dir / 'sample_splits.npz'
+    )
+    sample_index.save(output_dir / 'sample_index.npz')
+    sample_index.save_splits(output_dir / 'sample_splits.npz')
     loader_config_path = output_dir / 'data_loaders_config.yaml'
     with open(loader_config_path, 'w', encoding='utf-8') as f:
         yaml.dump(loader_config, f, default_flow_style=False, allow_unicode=True)
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:31                                           *
+#  Last Updated : 2026-10-19 02:35                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -26,5 +26,6 @@
 """Machine learning and deep learning algorithms."""
 
 from .deep.simple_hybrid_model import SimpleHybridModel
+from .deep.landmark_mlp import LandmarkMLP
 
-__all__ = ['SimpleHybridModel']
\ No newline at end of file
+__all__ = ['SimpleHybridModel', 'LandmarkMLP']
\ No newline at end of file
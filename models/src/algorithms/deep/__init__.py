@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:31                                           *
+#  Last Updated : 2026-10-19 02:41                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -26,5 +26,8 @@
 """Deep learning models."""
 
 from .simple_hybrid_model import SimpleHybridModel
+from .landmark_mlp import LandmarkMLP
+from .early_exit_model import EarlyExitHybridModel
+from .channel_pruning import ChannelPruner, count_macs
 
-__all__ = ['SimpleHybridModel']
\ No newline at end of file
+__all__ = ['SimpleHybridModel', 'LandmarkMLP', 'EarlyExitHybridModel', 'ChannelPruner', 'count_macs']
\ No newline at end of file
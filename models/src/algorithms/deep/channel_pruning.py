@@ -0,0 +1,225 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : channel_pruning.py                                         *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:38                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Poda estructurada de canales del backbone visual.
+
+Los canales se eliminan físicamente (se recortan pesos y buffers), así que
+el modelo podado es más pequeño y rápido sin cambiar de familia. Solo se
+podan canales internos de cada bloque, que no participan en la suma
+residual:
+    - ResNet: salida de conv1 (y conv2 en Bottleneck).
+    - MobileNetV2 / EfficientNet: canales de expansión (1×1 de expansión,
+      depthwise, squeeze-excitation y entrada de la proyección).
+
+El resultado se describe con un plan de canales (canales conservados por
+grupo) que permite reconstruir la arquitectura antes de cargar los pesos.
+"""
+
+from typing import Dict, List, Optional
+
+import torch
+import torch.nn as nn
+from torchvision.models.resnet import BasicBlock, Bottleneck
+from torchvision.models.mobilenetv2 import InvertedResidual
+from torchvision.models.efficientnet import MBConv
+
+
+def _slice_conv(conv: nn.Conv2d, out_idx: Optional[torch.Tensor] = None, in_idx: Optional[torch.Tensor] = None):
+    """Recorta canales de salida y/o entrada de una convolución (en el lugar)."""
+    weight = conv.weight.data
+    if conv.groups > 1 and out_idx is not None:
+        # Depthwise: cada canal es su propio grupo
+        weight = weight[out_idx]
+        conv.groups = len(out_idx)
+        conv.in_channels = len(out_idx)
+        conv.out_channels = len(out_idx)
+    else:
+        if out_idx is not None:
+            weight = weight[out_idx]
+            conv.out_channels = len(out_idx)
+        if in_idx is not None:
+            weight = weight[:, in_idx]
+            conv.in_channels = len(in_idx)
+    
+    conv.weight = nn.Parameter(weight.clone())
+    if conv.bias is not None and out_idx is not None:
+        conv.bias = nn.Parameter(conv.bias.data[out_idx].clone())
+
+
+def _slice_bn(bn: nn.BatchNorm2d, idx: torch.Tensor):
+    """Recorta canales de un BatchNorm (en el lugar)."""
+    bn.weight = nn.Parameter(bn.weight.data[idx].clone())
+    bn.bias = nn.Parameter(bn.bias.data[idx].clone())
+    bn.running_mean = bn.running_mean[idx].clone()
+    bn.running_var = bn.running_var[idx].clone()
+    bn.num_features = len(idx)
+
+
+def count_macs(model: nn.Module, input_size: int = 224) -> int:
+    """Multiplicaciones-acumulaciones de un forward (convoluciones y lineales)."""
+    total = [0]
+    
+    def conv_hook(module, inputs, output):
+        kernel = module.kernel_size[0] * module.kernel_size[1]
+        total[0] += output[0].numel() * (module.in_channels // module.groups) * kernel
+    
+    def linear_hook(module, inputs, output):
+        total[0] += output[0].numel() * module.in_features
+    
+    hooks = []
+    for module in model.modules():
+        if isinstance(module, nn.Conv2d):
+            hooks.append(module.register_forward_hook(conv_hook))
+        elif isinstance(module, nn.Linear):
+            hooks.append(module.register_forward_hook(linear_hook))
+    
+    device = next(model.parameters()).device
+    was_training = model.training
+    model.eval()
+    with torch.no_grad():
+        model(torch.zeros(1, 3, input_size, input_size, device=device), torch.zeros(1, 126, device=device))
+    model.train(was_training)
+    
+    for hook in hooks:
+        hook.remove()
+    return int(total[0])
+
+
+class ChannelPruner:
+    """Poda de canales por magnitud L1 o por |gamma| del BatchNorm."""
+    
+    CRITERIA = ('l1', 'bn_gamma')
+    
+    def __init__(self, model: nn.Module, criterion: str = 'l1'):
+        """
+        Args:
+            model: `SimpleHybridModel` (se modifica en el lugar)
+            criterion: 'l1' (norma L1 de los filtros que producen el canal)
+                o 'bn_gamma' (|gamma| del BatchNorm que lo normaliza)
+        """
+        if criterion not in self.CRITERIA:
+            raise ValueError(f"Criterio '{criterion}' no soportado. Usa: {', '.join(self.CRITERIA)}")
+        if not hasattr(model, 'visual_backbone'):
+            raise ValueError("El modelo no tiene backbone visual que podar")
+        
+        self.model = model
+        self.criterion = criterion
+    
+    @staticmethod
+    def groups(backbone: nn.Module) -> List[Dict]:
+        """
+        Grupos de canales podables del backbone.
+        
+        Cada grupo tiene la convolución que produce los canales, su BN,
+        las depthwise intermedias, el SE (si hay) y la convolución que los
+        consume.
+        """
+        groups = []
+        for name, module in backbone.named_modules():
+            if isinstance(module, BasicBlock):
+                groups.append({
+                    'name': f"{name}.conv1",
+                    'producer': module.conv1, 'bn': module.bn1,
+                    'depthwise': [], 'se': None, 'consumer': module.conv2
+                })
+            elif isinstance(module, Bottleneck):
+                for producer, bn, consumer in (('conv1', 'bn1', 'conv2'), ('conv2', 'bn2', 'conv3')):
+                    groups.append({
+                        'name': f"{name}.{producer}",
+                        'producer': getattr(module, producer), 'bn': getattr(module, bn),
+                        'depthwise': [], 'se': None, 'consumer': getattr(module, consumer)
+                    })
+            elif isinstance(module, InvertedResidual) and len(module.conv) == 4:
+                # [expansión 1×1, depthwise, proyección 1×1, BN]
+                expand, depthwise, project = module.conv[0], module.conv[1], module.conv[2]
+                groups.append({
+                    'name': f"{name}.expand",
+                    'producer': expand[0], 'bn': expand[1],
+                    'depthwise': [(depthwise[0], depthwise[1])], 'se': None, 'consumer': project
+                })
+            elif isinstance(module, MBConv) and len(module.block) == 4:
+                # [expansión, depthwise, squeeze-excitation, proyección]
+                expand, depthwise, se, project = module.block
+                groups.append({
+                    'name': f"{name}.expand",
+                    'producer': expand[0], 'bn': expand[1],
+                    'depthwise': [(depthwise[0], depthwise[1])], 'se': se, 'consumer': project[0]
+                })
+        return groups
+    
+    def _scores(self, group: Dict) -> torch.Tensor:
+        if self.criterion == 'bn_gamma':
+            return group['bn'].weight.detach().abs()
+        return group['producer'].weight.detach().abs().sum(dim=(1, 2, 3))
+    
+    @staticmethod
+    def _apply(group: Dict, keep_idx: torch.Tensor):
+        """Elimina físicamente los canales que no están en `keep_idx`."""
+        _slice_conv(group['producer'], out_idx=keep_idx)
+        _slice_bn(group['bn'], keep_idx)
+        for conv, bn in group['depthwise']:
+            _slice_conv(conv, out_idx=keep_idx)
+            _slice_bn(bn, keep_idx)
+        if group['se'] is not None:
+            _slice_conv(group['se'].fc1, in_idx=keep_idx)
+            _slice_conv(group['se'].fc2, out_idx=keep_idx)
+        _slice_conv(group['consumer'], in_idx=keep_idx)
+    
+    def prune(self, sparsity: float) -> Dict:
+        """
+        Poda la misma fracción de canales en cada grupo.
+        
+        Args:
+            sparsity: Fracción de canales a eliminar (0-1)
+        
+        Returns:
+            Plan de canales: {'criterion', 'sparsity', 'groups': {nombre: canales}}
+        """
+        if not 0 <= sparsity < 1:
+            raise ValueError("sparsity debe estar en [0, 1)")
+        
+        plan = {}
+        for group in self.groups(self.model.visual_backbone):
+            scores = self._scores(group)
+            keep = max(1, int(round(len(scores) * (1 - sparsity))))
+            # Conservar el orden original de los canales
+            keep_idx = torch.sort(torch.topk(scores, keep).indices).values
+            self._apply(group, keep_idx)
+            plan[group['name']] = keep
+        
+        return {'criterion': self.criterion, 'sparsity': sparsity, 'groups': plan}
+    
+    @classmethod
+    def apply_plan(cls, model: nn.Module, plan: Dict):
+        """
+        Reconstruye la arquitectura podada de un plan (antes de cargar pesos).
+        
+        Se conservan los primeros canales de cada grupo; los valores reales
+        vienen después del state_dict del modelo podado.
+        """
+        for group in cls.groups(model.visual_backbone):
+            if group['name'] in plan['groups']:
+                cls._apply(group, torch.arange(plan['groups'][group['name']]))
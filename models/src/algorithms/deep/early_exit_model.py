@@ -0,0 +1,237 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : early_exit_model.py                                        *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:41                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Modelo híbrido con salidas tempranas.
+
+Agrega cabezas de clasificación después de etapas intermedias del backbone.
+En entrenamiento se optimizan junto con la cabeza principal; en inferencia
+una muestra sale en la primera cabeza cuya confianza (probabilidad máxima)
+supera su umbral, así que las entradas fáciles no recorren todo el backbone.
+"""
+
+from typing import List, Optional, Tuple
+
+import torch
+import torch.nn as nn
+
+from .simple_hybrid_model import SimpleHybridModel
+
+
+class EarlyExitHybridModel(SimpleHybridModel):
+    """
+    `SimpleHybridModel` con cabezas intermedias.
+    
+    Los parámetros del backbone, la rama de landmarks y el clasificador
+    tienen los mismos nombres que en `SimpleHybridModel`, así que se pueden
+    inicializar desde una versión registrada.
+    """
+    
+    # Etapas del backbone: módulos que se ejecutan antes de cada salida
+    # (la última etapa termina en la cabeza principal)
+    RESNET_STAGES = [
+        ['conv1', 'bn1', 'relu', 'maxpool', 'layer1', 'layer2'],
+        ['layer3'],
+        ['layer4']
+    ]
+    # Índices de corte de `features` (MobileNetV2 y EfficientNet)
+    FEATURE_SPLITS = {
+        'mobilenet_v2': [7, 14],
+        'mobilenet_v2_035': [7, 14],
+        'mobilenet_v2_050': [7, 14],
+        'efficientnet_b0': [4, 6]
+    }
+    
+    def __init__(
+        self,
+        num_classes: int,
+        backbone: str = 'efficientnet_b0',
+        use_landmarks: bool = True,
+        pretrained: bool = True,
+        dropout: float = 0.5,
+        exit_thresholds: Optional[List[float]] = None
+    ):
+        """
+        Args:
+            exit_thresholds: Confianza mínima para salir en cada cabeza
+                intermedia (None = 1.0, nunca salir antes; se calibran con
+                `EarlyExitTrainer.calibrate_exits`)
+        
+        El resto de argumentos son los de `SimpleHybridModel`.
+        """
+        super().__init__(
+            num_classes=num_classes,
+            backbone=backbone,
+            use_landmarks=use_landmarks,
+            pretrained=pretrained,
+            dropout=dropout
+        )
+        
+        # Lista simple (no ModuleList): los módulos ya están registrados en
+        # visual_backbone y no deben duplicarse en el state_dict
+        self._stages = self._split_backbone()
+        num_exits = len(self._stages) - 1
+        
+        exit_channels = self._exit_channels()
+        landmark_dim = 128 if use_landmarks else 0
+        self.exit_heads = nn.ModuleList([
+            nn.Sequential(
+                nn.Linear(channels + landmark_dim, 256),
+                nn.ReLU(inplace=True),
+                nn.Dropout(dropout * 0.6),
+                nn.Linear(256, num_classes)
+            )
+            for channels in exit_channels
+        ])
+        
+        # Buffer: los umbrales calibrados viajan en el state_dict
+        self.register_buffer(
+            'exit_thresholds',
+            torch.tensor(exit_thresholds or [1.0] * num_exits, dtype=torch.float32)
+        )
+        self.exit_logits = []
+    
+    def _split_backbone(self) -> List[List[nn.Module]]:
+        """Módulos del backbone agrupados por etapa."""
+        backbone = self.visual_backbone
+        if self.backbone_name.startswith('resnet'):
+            return [[getattr(backbone, name) for name in stage] for stage in self.RESNET_STAGES]
+        
+        if self.backbone_name not in self.FEATURE_SPLITS:
+            raise ValueError(f"Salidas tempranas no soportadas para '{self.backbone_name}'")
+        
+        features = list(backbone.features)
+        bounds = [0] + self.FEATURE_SPLITS[self.backbone_name] + [len(features)]
+        return [features[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    
+    def _exit_channels(self) -> List[int]:
+        """Canales de salida de cada etapa intermedia (forward de prueba)."""
+        channels = []
+        was_training = self.training
+        self.eval()
+        with torch.no_grad():
+            x = torch.zeros(1, 3, 224, 224)
+            for stage in self._stages[:-1]:
+                x = self._run_stage(stage, x)
+                channels.append(x.shape[1])
+        self.train(was_training)
+        return channels
+    
+    @staticmethod
+    def _run_stage(stage: List[nn.Module], x: torch.Tensor) -> torch.Tensor:
+        for module in stage:
+            x = module(x)
+        return x
+    
+    def _pool(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.flatten(nn.functional.adaptive_avg_pool2d(x, 1), 1)
+    
+    def _landmark_features(self, landmarks: Optional[torch.Tensor], batch_size: int, device) -> Optional[torch.Tensor]:
+        """Features de landmarks (ceros si no hay manos), como en `SimpleHybridModel`."""
+        if not self.use_landmarks:
+            return None
+        if landmarks is not None and (landmarks.abs().sum(dim=1) > 0).any():
+            return self.landmark_processor(landmarks)
+        return torch.zeros(batch_size, 128, device=device)
+    
+    def _head_input(self, pooled: torch.Tensor, landmark_features: Optional[torch.Tensor]) -> torch.Tensor:
+        if landmark_features is None:
+            return pooled
+        return torch.cat([pooled, landmark_features], dim=1)
+    
+    def forward_all(self, image, landmarks=None) -> List[torch.Tensor]:
+        """
+        Logits de todas las salidas (intermedias y principal).
+        
+        Returns:
+            Lista [salida_1, ..., salida_n, principal], cada una [batch, clases]
+        """
+        landmark_features = self._landmark_features(landmarks, image.size(0), image.device)
+        
+        outputs = []
+        x = image
+        for stage, head in zip(self._stages[:-1], self.exit_heads):
+            x = self._run_stage(stage, x)
+            outputs.append(head(self._head_input(self._pool(x), landmark_features)))
+        
+        x = self._run_stage(self._stages[-1], x)
+        outputs.append(self.classifier(self._head_input(self._pool(x), landmark_features)))
+        return outputs
+    
+    def forward(self, image, landmarks=None):
+        """
+        Logits de la cabeza principal.
+        
+        En modo entrenamiento guarda los logits de las salidas intermedias en
+        `self.exit_logits` para la pérdida conjunta del trainer.
+        """
+        if not self.training:
+            return self.forward_early_exit(image, landmarks)[0]
+        
+        outputs = self.forward_all(image, landmarks)
+        self.exit_logits = outputs[:-1]
+        return outputs[-1]
+    
+    def forward_early_exit(self, image, landmarks=None) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Inferencia con salida temprana por confianza.
+        
+        Cada muestra del batch sale en la primera cabeza cuya probabilidad
+        máxima alcanza su umbral; solo las restantes siguen por el backbone.
+        
+        Returns:
+            (logits [batch, clases], índice de salida por muestra; la
+            cabeza principal es len(exit_heads))
+        """
+        batch_size = image.size(0)
+        landmark_features = self._landmark_features(landmarks, batch_size, image.device)
+        
+        logits = torch.zeros(batch_size, self.num_classes, device=image.device)
+        exit_index = torch.full((batch_size,), len(self.exit_heads), dtype=torch.long, device=image.device)
+        active = torch.arange(batch_size, device=image.device)
+        
+        x = image
+        for i, (stage, head) in enumerate(zip(self._stages[:-1], self.exit_heads)):
+            x = self._run_stage(stage, x)
+            threshold = float(self.exit_thresholds[i])
+            if threshold >= 1.0:
+                continue  # Salida deshabilitada: no calcular la cabeza
+            
+            head_landmarks = None if landmark_features is None else landmark_features[active]
+            exit_logits = head(self._head_input(self._pool(x), head_landmarks))
+            
+            confident = torch.softmax(exit_logits, dim=1).max(dim=1).values >= threshold
+            if confident.any():
+                logits[active[confident]] = exit_logits[confident]
+                exit_index[active[confident]] = i
+                active = active[~confident]
+                x = x[~confident]
+                if len(active) == 0:
+                    return logits, exit_index
+        
+        x = self._run_stage(self._stages[-1], x)
+        head_landmarks = None if landmark_features is None else landmark_features[active]
+        logits[active] = self.classifier(self._head_input(self._pool(x), head_landmarks))
+        return logits, exit_index
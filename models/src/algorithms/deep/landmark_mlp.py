@@ -0,0 +1,87 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : landmark_mlp.py                                            *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:35                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Modelo solo de landmarks (MLP).
+Alumno mínimo para destilación: no procesa la imagen.
+"""
+
+import torch.nn as nn
+
+
+class LandmarkMLP(nn.Module):
+    """
+    Clasificador MLP sobre los 126 valores de landmarks de MediaPipe.
+    
+    Mantiene la firma forward(image, landmarks) de `SimpleHybridModel` para
+    poder entrenarse con el mismo trainer; la imagen se ignora.
+    """
+    
+    def __init__(
+        self,
+        num_classes: int,
+        hidden_dims: tuple = (256, 128),
+        dropout: float = 0.3
+    ):
+        """
+        Args:
+            num_classes: Número de clases a predecir
+            hidden_dims: Tamaño de las capas ocultas
+            dropout: Tasa de dropout
+        """
+        super().__init__()
+        
+        self.num_classes = num_classes
+        self.use_landmarks = True
+        self.backbone_name = 'landmark_mlp'
+        
+        layers = []
+        in_dim = 126  # 2 manos × 21 puntos × 3 coords (x, y, z)
+        for hidden_dim in hidden_dims:
+            layers += [
+                nn.Linear(in_dim, hidden_dim),
+                nn.BatchNorm1d(hidden_dim),
+                nn.ReLU(inplace=True),
+                nn.Dropout(dropout)
+            ]
+            in_dim = hidden_dim
+        layers.append(nn.Linear(in_dim, num_classes))
+        
+        self.classifier = nn.Sequential(*layers)
+    
+    def forward(self, image, landmarks=None):
+        """
+        Forward pass.
+        
+        Args:
+            image: Ignorada (compatibilidad con `SimpleHybridModel`)
+            landmarks: Tensor [batch_size, 126]
+        
+        Returns:
+            logits: Tensor [batch_size, num_classes]
+        """
+        if landmarks is None:
+            raise ValueError("LandmarkMLP requiere landmarks")
+        return self.classifier(landmarks)
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:33                                           *
+#  Last Updated : 2026-10-19 02:35                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -44,6 +44,12 @@ class SimpleHybridModel(nn.Module):
         - Classifier: Capas densas para clasificación final
     """
     
+    # MobileNetV2 con multiplicador de ancho reducido
+    MOBILENET_WIDTHS = {
+        'mobilenet_v2_035': 0.35,
+        'mobilenet_v2_050': 0.5
+    }
+    
     def __init__(
         self,
         num_classes: int,
@@ -55,7 +61,8 @@ class SimpleHybridModel(nn.Module):
         """
         Args:
             num_classes: Número de clases a predecir
-            backbone: Arquitectura CNN ('efficientnet_b0', 'resnet18', 'mobilenet_v2')
+            backbone: Arquitectura CNN ('efficientnet_b0', 'resnet18', 'mobilenet_v2',
+                'mobilenet_v2_035', 'mobilenet_v2_050')
             use_landmarks: Si usar landmarks de MediaPipe
             pretrained: Si usar pesos pre-entrenados en ImageNet
             dropout: Tasa de dropout
@@ -134,10 +141,18 @@ class SimpleHybridModel(nn.Module):
             features_dim = 1280
             model.classifier = nn.Identity()
         
+        elif backbone in self.MOBILENET_WIDTHS:
+            # Variantes angostas para dispositivo (alumnos de destilación);
+            # torchvision no tiene pesos ImageNet para estos anchos
+            model = models.mobilenet_v2(width_mult=self.MOBILENET_WIDTHS[backbone])
+            features_dim = model.last_channel
+            model.classifier = nn.Identity()
+        
         else:
             raise ValueError(
                 f"Backbone '{backbone}' no soportado. "
-                f"Usa: efficientnet_b0, resnet18, resnet34, mobilenet_v2"
+                f"Usa: efficientnet_b0, resnet18, resnet34, mobilenet_v2, "
+                f"{', '.join(self.MOBILENET_WIDTHS)}"
             )
         
         return model, features_dim
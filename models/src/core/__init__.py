@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:19                                           *
+#  Last Updated : 2026-10-19 02:24                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -29,10 +29,21 @@ from .dataset_discovery import DatasetDiscovery
 from .auto_config_generator import AutoConfigGenerator
 from .version_manager import VersionManager
 from .experiment_logger import ExperimentLogger
+from .loader_tuner import LoaderAutotuner
+from .dataset_manifest import DatasetManifest, ParallelDirectoryScanner
+from .dataset_dedup import DatasetDeduplicator
+from .media_probe import MediaProber
+from .batch_size_planner import BatchSizePlanner
 
 __all__ = [
     'DatasetDiscovery',
     'AutoConfigGenerator', 
     'VersionManager',
-    'ExperimentLogger'
+    'ExperimentLogger',
+    'LoaderAutotuner',
+    'DatasetManifest',
+    'ParallelDirectoryScanner',
+    'DatasetDeduplicator',
+    'MediaProber',
+    'BatchSizePlanner'
 ]
\ No newline at end of file
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 17:34                                           *
+#  Last Updated : 2026-10-19 02:50                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -27,6 +27,7 @@
 Genera automáticamente configuraciones de entrenamiento basadas en el dataset.
 """
 
+import os
 from typing import Dict  # ← AGREGAR ESTA LÍNEA
 from pathlib import Path
 import yaml
@@ -34,8 +35,15 @@ import yaml
 class AutoConfigGenerator:
     """Genera configuraciones automáticas para entrenamiento."""
     
-    def __init__(self, dataset_report: Dict):
+    def __init__(self, dataset_report: Dict, plan_batch_size: bool = False):
+        """
+        Args:
+            dataset_report: Reporte de DatasetDiscovery
+            plan_batch_size: Si medir el modelo en este equipo para elegir
+                batch size y acumulación de gradiente (BatchSizePlanner)
+        """
         self.report = dataset_report
+        self.plan_batch_size = plan_batch_size
         self.config = {}
     
     def generate(self) -> Dict:
@@ -49,8 +57,37 @@ class AutoConfigGenerator:
             'features': self._generate_features_config()
         }
         
+        if self.plan_batch_size:
+            self._apply_batch_plan()
+        
         return self.config
     
+    def _apply_batch_plan(self):
+        """Reemplaza el batch size heurístico por uno medido en este equipo."""
+        from .batch_size_planner import BatchSizePlanner
+        
+        model_config = self.config['model']
+        if self.report['dataset_type'] != 'image':
+            print("Planificador de batch size: solo disponible para modelos de imagen")
+            return
+        
+        planner = BatchSizePlanner(
+            backbone=model_config['backbone'],
+            num_classes=model_config['num_classes'],
+            use_landmarks=model_config['use_landmarks'],
+            # El batch heurístico se conserva como batch efectivo
+            target_batch_size=self.config['dataset']['batch_size']
+        )
+        plan = planner.plan()
+        
+        self.config['dataset']['batch_size'] = plan['batch_size']
+        self.config['training']['gradient_accumulation_steps'] = plan['gradient_accumulation_steps']
+        self.config['training']['batch_planning'] = plan['planning']
+        
+        print(f"Batch size planificado: {plan['batch_size']} × "
+              f"{plan['gradient_accumulation_steps']} acumulación "
+              f"(efectivo {plan['effective_batch_size']})")
+    
     def _generate_dataset_config(self) -> Dict:
         """Configuración del dataset."""
         return {
@@ -64,7 +101,9 @@ class AutoConfigGenerator:
                 'test': 0.15
             },
             'batch_size': self._calculate_batch_size(),
-            'num_workers': 4
+            'num_workers': self._calculate_num_workers(),
+            'prefetch_factor': 2,
+            'persistent_workers': False
         }
     
     def _generate_model_config(self) -> Dict:
@@ -79,7 +118,14 @@ class AutoConfigGenerator:
                 'backbone': 'efficientnet_b0',
                 'use_landmarks': True,
                 'num_classes': num_classes,
-                'pretrained': True
+                'pretrained': True,
+                'early_exit': {
+                    'enabled': False,
+                    # Peso de la pérdida de cada salida intermedia
+                    'loss_weights': [0.3, 0.3],
+                    # Pérdida de accuracy tolerada al calibrar umbrales
+                    'tolerance': 0.01
+                }
             }
         elif dataset_type == 'video':
             return {
@@ -111,6 +157,7 @@ class AutoConfigGenerator:
             'optimizer': 'adamw',
             'scheduler': 'cosine_annealing',
             'loss': 'cross_entropy',
+            'gradient_accumulation_steps': 1,
             'metrics': ['accuracy', 'f1_score', 'precision', 'recall'],
             'early_stopping': {
                 'patience': 10,
@@ -119,6 +166,10 @@ class AutoConfigGenerator:
             'checkpointing': {
                 'save_best': True,
                 'save_frequency': 5
+            },
+            # Sincronizar CUDA por etapa: tiempos exactos, pero frena el paso
+            'instrumentation': {
+                'cuda_sync': False
             }
         }
     
@@ -133,6 +184,8 @@ class AutoConfigGenerator:
                 'rotation': 15,
                 'brightness': 0.2,
                 'contrast': 0.2,
+                # True: workers solo cargan/redimensionan; augmentación por batch
+                'batch_level': False,
                 'normalization': {
                     'mean': [0.485, 0.456, 0.406],
                     'std': [0.229, 0.224, 0.225]
@@ -142,8 +195,11 @@ class AutoConfigGenerator:
         
         if dataset_type == 'video':
             base_aug['video'] = {
+                # 'uniform': num_frames fijos | 'fps': longitud variable a target_fps
                 'temporal_sampling': 'uniform',
                 'num_frames': 30,
+                'target_fps': 10,
+                'max_frames': 90,
                 'temporal_jitter': True
             }
         
@@ -154,6 +210,10 @@ class AutoConfigGenerator:
         return {
             'landmarks': {
                 'enabled': True,
+                # Un solo detector en un proceso aparte, consultado por lotes
+                'server': False,
+                # Landmarks de la imagen original cacheados en disco (None = sin caché)
+                'cache_dir': 'cache/landmarks',
                 'hands': True,
                 'pose': True,
                 'face': False  # Opcional para expresiones
@@ -178,6 +238,11 @@ class AutoConfigGenerator:
         else:
             return 64
     
+    def _calculate_num_workers(self) -> int:
+        """Workers por defecto según los núcleos (afinar con 'main.py tune-loader')."""
+        cpus = os.cpu_count() or 1
+        return max(0, min(4, cpus - 1))
+    
     def _calculate_epochs(self, total_samples: int) -> int:
         """Calcula número de epochs recomendado."""
         if total_samples < 100:
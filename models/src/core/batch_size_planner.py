@@ -0,0 +1,236 @@
+# ======================================================                     *
+#  Project      : core                                                       *
+#  File         : batch_size_planner.py                                      *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:24                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Planificador de batch size según el modelo y el hardware.
+
+Construye el modelo configurado (mismo backbone que `SimpleHybridModel`) y
+mide memoria y tiempo por paso con unos pocos forward/backward reales para
+cada batch size candidato. La memoria es el pico total del entrenamiento
+(pesos, gradientes, estado de AdamW y activaciones) respecto a una línea base
+tomada antes de crear el modelo. Elige el batch size físico con mayor
+throughput que cabe en memoria y los pasos de acumulación de gradiente
+necesarios para alcanzar el batch size efectivo deseado.
+"""
+
+import os
+import gc
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .loader_tuner import _PeakRSSMonitor, psutil
+
+
+class BatchSizePlanner:
+    """Mide y elige batch size + acumulación de gradiente."""
+    
+    def __init__(
+        self,
+        backbone: str,
+        num_classes: int,
+        use_landmarks: bool = True,
+        candidates: Optional[List[int]] = None,
+        target_batch_size: int = 32,
+        max_memory_fraction: float = 0.8,
+        steps: int = 3,
+        device: Optional[str] = None
+    ):
+        """
+        Args:
+            backbone: Backbone de `SimpleHybridModel`
+            num_classes: Número de clases
+            use_landmarks: Si el modelo usa la rama de landmarks
+            candidates: Batch sizes a medir (None = 8..128)
+            target_batch_size: Batch size efectivo deseado (por gradiente)
+            max_memory_fraction: Fracción de la memoria disponible utilizable
+            steps: Pasos medidos por candidato (tras uno de calentamiento)
+            device: 'cuda' o 'cpu' (None = automático)
+        """
+        import torch
+        
+        self.backbone = backbone
+        self.num_classes = num_classes
+        self.use_landmarks = use_landmarks
+        self.candidates = sorted(candidates or [8, 16, 32, 64, 128])
+        self.target_batch_size = target_batch_size
+        self.max_memory_fraction = max_memory_fraction
+        self.steps = steps
+        self.device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        self.measurements = []
+    
+    def _memory_budget(self) -> Optional[int]:
+        """Bytes utilizables por el entrenamiento (None si no se puede saber)."""
+        import torch
+        
+        if self.device == 'cuda':
+            total = torch.cuda.get_device_properties(0).total_memory
+            return int(total * self.max_memory_fraction)
+        if psutil is not None:
+            return int(psutil.virtual_memory().available * self.max_memory_fraction)
+        try:
+            available = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+            return int(available * self.max_memory_fraction)
+        except (ValueError, OSError, AttributeError):
+            return None
+    
+    def _memory_in_use(self) -> int:
+        """Memoria en uso ahora (CUDA: asignada por torch; CPU: RSS del proceso)."""
+        import torch
+        
+        if self.device == 'cuda':
+            torch.cuda.synchronize()
+            return torch.cuda.memory_allocated()
+        return _PeakRSSMonitor()._current_rss()
+    
+    def _build_model(self):
+        from algorithms.deep.simple_hybrid_model import SimpleHybridModel
+        
+        # Sin pesos pre-entrenados: la memoria y el tiempo son los mismos
+        return SimpleHybridModel(
+            num_classes=self.num_classes,
+            backbone=self.backbone,
+            use_landmarks=self.use_landmarks,
+            pretrained=False
+        ).to(self.device)
+    
+    def _measure(self, model, optimizer, batch_size: int, baseline: int) -> Dict:
+        """
+        Forward/backward reales con datos sintéticos.
+        
+        Args:
+            baseline: Memoria en uso antes de crear modelo y optimizador; el
+                pico se reporta respecto a ella (no respecto al inicio de
+                este candidato, que ya incluye lo de los anteriores)
+        """
+        import torch
+        
+        images = torch.randn(batch_size, 3, 224, 224, device=self.device)
+        landmarks = torch.rand(batch_size, 126, device=self.device)
+        labels = torch.randint(0, self.num_classes, (batch_size,), device=self.device)
+        criterion = torch.nn.CrossEntropyLoss()
+        
+        def step():
+            optimizer.zero_grad()
+            loss = criterion(model(images, landmarks), labels)
+            loss.backward()
+            optimizer.step()
+        
+        if self.device == 'cuda':
+            torch.cuda.synchronize()
+            torch.cuda.reset_peak_memory_stats()
+            step()  # Calentamiento (cuDNN autotune, estado del optimizador)
+            torch.cuda.synchronize()
+            start = time.perf_counter()
+            for _ in range(self.steps):
+                step()
+            torch.cuda.synchronize()
+            elapsed = time.perf_counter() - start
+            peak_bytes = torch.cuda.max_memory_allocated() - baseline
+        else:
+            # En CPU el allocator retiene memoria de candidatos anteriores: como
+            # se miden de menor a mayor, el pico absoluto solo puede sobrestimar
+            with _PeakRSSMonitor(interval=0.01) as monitor:
+                step()
+                start = time.perf_counter()
+                for _ in range(self.steps):
+                    step()
+                elapsed = time.perf_counter() - start
+            peak_bytes = monitor.peak_bytes - baseline
+        
+        step_seconds = elapsed / self.steps
+        return {
+            'batch_size': batch_size,
+            'step_ms': round(step_seconds * 1000, 2),
+            'samples_per_sec': round(batch_size / step_seconds, 2),
+            'peak_memory_mb': round(peak_bytes / 1024 ** 2, 1)
+        }
+    
+    def plan(self) -> Dict:
+        """
+        Mide los candidatos y elige batch size y acumulación.
+        
+        Returns:
+            Dict con 'batch_size', 'gradient_accumulation_steps' y las mediciones
+        """
+        import torch
+        
+        budget = self._memory_budget()
+        baseline = self._memory_in_use()
+        model = self._build_model()
+        model.train()
+        optimizer = torch.optim.AdamW(model.parameters(), lr=1e-3)
+        
+        print(f"Planificando batch size ({self.backbone}, {self.device})...")
+        self.measurements = []
+        for batch_size in self.candidates:
+            try:
+                result = self._measure(model, optimizer, batch_size, baseline)
+            except RuntimeError as e:
+                # Sin memoria: los candidatos mayores tampoco caben
+                if 'out of memory' in str(e).lower():
+                    print(f"  batch {batch_size}: sin memoria")
+                    break
+                raise
+            finally:
+                gc.collect()
+                if self.device == 'cuda':
+                    torch.cuda.empty_cache()
+            
+            result['fits'] = budget is None or result['peak_memory_mb'] * 1024 ** 2 <= budget
+            print(f"  batch {batch_size}: {result['step_ms']:.0f} ms/paso, "
+                  f"{result['samples_per_sec']:.1f} muestras/s, {result['peak_memory_mb']:.0f} MB")
+            self.measurements.append(result)
+            if not result['fits']:
+                break
+        
+        del model, optimizer
+        gc.collect()
+        
+        # Candidatos que caben y no superan el batch efectivo deseado
+        fitting = [m for m in self.measurements if m['fits']]
+        usable = [m for m in fitting if m['batch_size'] <= self.target_batch_size] or fitting[:1]
+        if not usable:
+            raise RuntimeError("Ningún batch size candidato cabe en memoria")
+        
+        best = max(usable, key=lambda m: m['samples_per_sec'])
+        accumulation = max(1, math.ceil(self.target_batch_size / best['batch_size']))
+        
+        return {
+            'batch_size': best['batch_size'],
+            'gradient_accumulation_steps': accumulation,
+            'effective_batch_size': best['batch_size'] * accumulation,
+            'planning': {
+                'planned_at': datetime.now().isoformat(),
+                'backbone': self.backbone,
+                'device': self.device,
+                'cpu_count': os.cpu_count(),
+                'torch_threads': torch.get_num_threads(),
+                'memory_budget_mb': round(budget / 1024 ** 2, 1) if budget else None,
+                'target_batch_size': self.target_batch_size,
+                'measurements': self.measurements
+            }
+        }
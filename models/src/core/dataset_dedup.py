@@ -0,0 +1,400 @@
+# ======================================================                     *
+#  Project      : core                                                       *
+#  File         : dataset_dedup.py                                           *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:21                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Deduplicación del dataset.
+
+Dos etapas sobre el índice de muestras:
+    1. Duplicados exactos: hash del contenido (solo entre archivos del
+       mismo tamaño), calculado en paralelo.
+    2. Casi-duplicados (imágenes): hash perceptual dHash de 64 bits.
+       Los hashes idénticos se agrupan directamente; entre hashes distintos,
+       multi-index hashing (tablas por banda con búsqueda a radio pequeño)
+       y confirmación por distancia de Hamming.
+
+De cada grupo de duplicados con la misma etiqueta se conserva una muestra
+(preferentemente de train), lo que además evita fugas entre train y test.
+Los grupos con etiquetas distintas solo se reportan.
+"""
+
+import os
+import json
+import hashlib
+import itertools
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """Bits en 1 de cada uint64."""
+    as_bytes = np.ascontiguousarray(values, dtype=np.uint64).view(np.uint8).reshape(-1, 8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+class _UnionFind:
+    """Union-find sobre índices de fila."""
+    
+    def __init__(self, size: int):
+        self.parent = np.arange(size)
+    
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+    
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def file_content_hash(path: str, chunk_size: int = 1 << 20) -> Optional[str]:
+    """Hash BLAKE2b del contenido del archivo (None si no se puede leer)."""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def image_dhash(path: str) -> Optional[int]:
+    """
+    Hash perceptual por diferencias (dHash) de 64 bits.
+    
+    Compara brillo de píxeles vecinos en una miniatura de 9×8 en grises;
+    es robusto a recompresión, reescalado y pequeños cambios de color.
+    """
+    from PIL import Image
+    
+    try:
+        with Image.open(path) as img:
+            # En JPEG decodifica directamente a baja resolución
+            img.draft('L', (64, 64))
+            pixels = np.asarray(
+                img.convert('L').resize((9, 8), Image.BILINEAR), dtype=np.int16
+            )
+    except Exception:
+        return None
+    
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+class DatasetDeduplicator:
+    """Detecta duplicados exactos y casi-duplicados de un `SampleIndex`."""
+    
+    # Cubetas con más hashes que esto no se expanden en pares: sus miembros
+    # se comparan contra a lo sumo MAX_REPRESENTATIVES representantes
+    MAX_BUCKET = 256
+    MAX_REPRESENTATIVES = 1024
+    # Hashes consultados por bloque (acota la memoria de los candidatos)
+    QUERY_CHUNK = 1 << 15
+    # Bandas de hasta estos bits usan una tabla directa clave -> cubeta
+    DIRECT_TABLE_BITS = 24
+    
+    def __init__(
+        self,
+        sample_index,
+        hamming_threshold: int = 4,
+        near_duplicates: bool = True,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            sample_index: Índice de muestras (data.loaders.sample_index)
+            hamming_threshold: Distancia máxima entre dHash para considerar
+                dos imágenes casi-duplicadas (de 64 bits)
+            near_duplicates: Si buscar casi-duplicados además de exactos
+            max_workers: Hilos para leer archivos (None = automático)
+        """
+        self.index = sample_index
+        self.hamming_threshold = hamming_threshold
+        self.near_duplicates = near_duplicates
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.paths = [sample_index.path(row) for row in range(len(sample_index))]
+        self.content_hashes = {}
+    
+    def _map(self, fn, items: List) -> List:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(fn, items, chunksize=64))
+    
+    def _exact_pairs(self) -> List[Tuple[int, int]]:
+        """Pares de filas con contenido idéntico."""
+        def size_of(path):
+            try:
+                return os.stat(path).st_size
+            except OSError:
+                return -1
+        
+        sizes = self._map(size_of, self.paths)
+        
+        # Solo archivos que comparten tamaño pueden ser idénticos
+        by_size = defaultdict(list)
+        for row, size in enumerate(sizes):
+            if size >= 0:
+                by_size[size].append(row)
+        candidates = [row for rows in by_size.values() if len(rows) > 1 for row in rows]
+        
+        hashes = self._map(file_content_hash, [self.paths[row] for row in candidates])
+        
+        first_by_hash = {}
+        pairs = []
+        for row, digest in zip(candidates, hashes):
+            if digest is None:
+                continue
+            self.content_hashes[row] = digest
+            if digest in first_by_hash:
+                pairs.append((first_by_hash[digest], row))
+            else:
+                first_by_hash[digest] = row
+        return pairs
+    
+    def _near_pairs(self) -> List[Tuple[int, int]]:
+        """
+        Pares de imágenes con dHash a distancia <= umbral.
+        
+        Las imágenes con el mismo dHash se enlazan a la primera de su grupo
+        (lineal, aunque haya miles con fondo uniforme); entre los hashes
+        distintos se buscan vecinos con `_match_hashes`.
+        """
+        from data.loaders.sample_index import MEDIA_IMAGE
+        
+        image_rows = np.flatnonzero(self.index.media == MEDIA_IMAGE).tolist()
+        hashes = self._map(image_dhash, [self.paths[row] for row in image_rows])
+        
+        valid = [(row, h) for row, h in zip(image_rows, hashes) if h is not None]
+        if not valid:
+            return []
+        rows = np.array([row for row, _ in valid], dtype=np.int64)
+        values = np.array([h for _, h in valid], dtype=np.uint64)
+        
+        unique_values, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+        representatives = rows[first]
+        group_rows = representatives[inverse.ravel()]
+        linked = group_rows != rows
+        pairs = list(zip(group_rows[linked].tolist(), rows[linked].tolist()))
+        
+        matched = self._match_hashes(unique_values)
+        pairs.extend(zip(
+            representatives[matched[:, 0]].tolist(), representatives[matched[:, 1]].tolist()
+        ))
+        return pairs
+    
+    def _match_hashes(self, values: np.ndarray) -> np.ndarray:
+        """
+        Pares (i, j), i < j, de hashes distintos a distancia <= umbral.
+        
+        Multi-index hashing: el hash se parte en m bandas y dos hashes a
+        distancia <= umbral difieren en a lo sumo umbral // m bits en alguna
+        banda, así que basta consultar cada tabla a ese radio. m se elige
+        para que las bandas tengan ~log2(n) bits (pocas colisiones al azar)
+        con radio <= 1 (pocas consultas por hash). Las cubetas de más de
+        MAX_BUCKET hashes no se consultan: se resuelven con
+        `_match_by_representatives`.
+        """
+        n = len(values)
+        threshold = self.hamming_threshold
+        if n < 2:
+            return np.zeros((0, 2), dtype=np.int64)
+        
+        num_bands = int(np.clip(64 // max(1, int(np.log2(n))), -(-(threshold + 1) // 2), threshold + 1))
+        radius = threshold // num_bands
+        band_edges = np.linspace(0, 64, num_bands + 1).astype(int)
+        
+        found = []
+        for start, end in zip(band_edges[:-1], band_edges[1:]):
+            width = int(end - start)
+            band_mask = np.uint64((1 << width) - 1) if width < 64 else np.uint64(2 ** 64 - 1)
+            keys = (values >> np.uint64(start)) & band_mask
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            
+            bucket_keys, bucket_starts, bucket_sizes = np.unique(
+                sorted_keys, return_index=True, return_counts=True
+            )
+            oversized = bucket_sizes > self.MAX_BUCKET
+            for bucket_start, size in zip(bucket_starts[oversized], bucket_sizes[oversized]):
+                found.append(self._match_by_representatives(
+                    values, np.sort(order[bucket_start:bucket_start + size])
+                ))
+            queryable = np.flatnonzero(~np.isin(keys, bucket_keys[oversized]))
+            # Las cubetas grandes no se consultan: como si tuvieran 0 miembros
+            bucket_sizes[oversized] = 0
+            
+            if width <= self.DIRECT_TABLE_BITS:
+                # Tabla directa clave -> cubeta (evita búsquedas binarias)
+                bucket_of_key = np.full(1 << width, -1, dtype=np.int64)
+                bucket_of_key[bucket_keys.astype(np.int64)] = np.arange(len(bucket_keys))
+                
+                def find_buckets(query):
+                    return bucket_of_key[query.astype(np.int64)]
+            else:
+                def find_buckets(query):
+                    positions = np.minimum(np.searchsorted(bucket_keys, query), len(bucket_keys) - 1)
+                    return np.where(bucket_keys[positions] == query, positions, -1)
+            
+            probes = [
+                sum(1 << bit for bit in bits)
+                for distance in range(radius + 1)
+                for bits in itertools.combinations(range(width), distance)
+            ]
+            for chunk_start in range(0, len(queryable), self.QUERY_CHUNK):
+                sources = queryable[chunk_start:chunk_start + self.QUERY_CHUNK]
+                for probe in probes:
+                    buckets = find_buckets(keys[sources] ^ np.uint64(probe))
+                    hit = buckets >= 0
+                    counts = np.where(hit, bucket_sizes[buckets], 0)
+                    left = bucket_starts[buckets]
+                    total = int(counts.sum())
+                    if not total:
+                        continue
+                    
+                    src = np.repeat(sources, counts)
+                    within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                    dst = order[np.repeat(left, counts) + within]
+                    ordered = src < dst
+                    src, dst = src[ordered], dst[ordered]
+                    close = _popcount64(values[src] ^ values[dst]) <= threshold
+                    found.append(np.stack([src[close], dst[close]], axis=1))
+        
+        found = [pairs for pairs in found if len(pairs)]
+        if not found:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.unique(np.concatenate(found), axis=0)
+    
+    def _match_by_representatives(self, values: np.ndarray, members: np.ndarray) -> np.ndarray:
+        """
+        Casi-duplicados dentro de una cubeta grande sin expandirla en pares.
+        
+        Cada miembro se compara contra los representantes de los grupos ya
+        vistos y se enlaza al más cercano si está dentro del umbral; si no,
+        abre un grupo nuevo (hasta MAX_REPRESENTATIVES; después solo se
+        compara).
+        """
+        representatives = np.zeros(0, dtype=np.int64)
+        pairs = []
+        for member in members.tolist():
+            if len(representatives):
+                distances = _popcount64(values[representatives] ^ values[member])
+                nearest = int(np.argmin(distances))
+                if distances[nearest] <= self.hamming_threshold:
+                    pairs.append(sorted((int(representatives[nearest]), member)))
+                    continue
+            if len(representatives) < self.MAX_REPRESENTATIVES:
+                representatives = np.append(representatives, member)
+        return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    
+    def run(self) -> Tuple[np.ndarray, Dict]:
+        """
+        Ejecuta la deduplicación.
+        
+        Returns:
+            (máscara bool de filas a conservar, reporte)
+        """
+        num_samples = len(self.index)
+        union_find = _UnionFind(num_samples)
+        
+        print("Buscando duplicados exactos...")
+        exact_pairs = self._exact_pairs()
+        for a, b in exact_pairs:
+            union_find.union(a, b)
+        
+        near_pairs = []
+        if self.near_duplicates:
+            print("Buscando casi-duplicados (dHash)...")
+            near_pairs = self._near_pairs()
+            for a, b in near_pairs:
+                union_find.union(a, b)
+        
+        groups = defaultdict(list)
+        for row in range(num_samples):
+            groups[union_find.find(row)].append(row)
+        
+        keep = np.ones(num_samples, dtype=bool)
+        duplicate_groups = []
+        label_conflicts = []
+        
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            
+            labels = {int(self.index.labels[row]) for row in members}
+            entry = {
+                'paths': [self.paths[row] for row in members],
+                'labels': sorted(labels),
+                'exact': len({self.content_hashes.get(row, row) for row in members}) == 1
+            }
+            
+            if len(labels) > 1:
+                # Misma imagen con etiquetas distintas: requiere revisión manual
+                label_conflicts.append(entry)
+                continue
+            
+            # Conservar una muestra, priorizando train (split 0)
+            kept = min(members, key=lambda row: (int(self.index.splits[row]), row))
+            for row in members:
+                if row != kept:
+                    keep[row] = False
+            entry['kept'] = self.paths[kept]
+            duplicate_groups.append(entry)
+        
+        report = {
+            'created_at': datetime.now().isoformat(),
+            'total_samples': num_samples,
+            'kept_samples': int(keep.sum()),
+            'removed_samples': int((~keep).sum()),
+            'exact_pairs': len(exact_pairs),
+            'near_pairs': len(near_pairs),
+            'hamming_threshold': self.hamming_threshold,
+            'duplicate_groups': duplicate_groups,
+            'label_conflicts': label_conflicts
+        }
+        
+        print(f"Duplicados: {report['removed_samples']} muestras eliminadas "
+              f"({len(duplicate_groups)} grupos, {len(label_conflicts)} con etiquetas en conflicto)")
+        
+        return keep, report
+    
+    @staticmethod
+    def save_report(report: Dict, output_path: str):
+        """Guarda el reporte de deduplicación en JSON."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Reporte de duplicados guardado en: {output_path}")
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 17:33                                           *
+#  Last Updated : 2026-10-19 02:23                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -34,12 +34,38 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
 import yaml
+import numpy as np
+
+from .dataset_manifest import DatasetManifest, ParallelDirectoryScanner
+from .media_probe import MediaProber
 
 class DatasetDiscovery:
     """Descubre y analiza automáticamente cualquier estructura de dataset."""
     
-    def __init__(self, dataset_path: str):
+    def __init__(
+        self,
+        dataset_path: str,
+        manifest_path: Optional[str] = None,
+        scan_workers: Optional[int] = None,
+        full_scan: bool = False,
+        probe_media: bool = True
+    ):
+        """
+        Args:
+            dataset_path: Raíz del dataset
+            manifest_path: Manifiesto SQLite para escaneos incrementales
+                (None = manifiesto en memoria, siempre escaneo completo)
+            scan_workers: Hilos del escáner (None = automático)
+            full_scan: Si ignorar el manifiesto y re-escanear todo
+            probe_media: Si inspeccionar cabeceras de imágenes/videos y
+                poner en cuarentena los archivos ilegibles
+        """
         self.dataset_path = Path(dataset_path)
+        self.manifest_path = manifest_path
+        self.scan_workers = scan_workers
+        self.full_scan = full_scan
+        self.probe_media = probe_media
+        self.quarantine = []  # Archivos ilegibles: {'path', 'error'}
         self.structure = {}
         self.classes = []
         self.dataset_type = None  # 'image', 'video', 'mixed'
@@ -75,7 +101,7 @@ class DatasetDiscovery:
         return report
     
     def _analyze_directory_structure(self) -> Dict:
-        """Analiza recursivamente la estructura de directorios."""
+        """Analiza la estructura de directorios (escaneo paralelo e incremental)."""
         structure = {
             'root': str(self.dataset_path),
             'tree': {},
@@ -83,24 +109,71 @@ class DatasetDiscovery:
             'leaf_dirs': []  # Directorios que contienen archivos
         }
         
-        for root, dirs, files in os.walk(self.dataset_path):
+        manifest = DatasetManifest(self.manifest_path or ':memory:', str(self.dataset_path))
+        if self.full_scan:
+            manifest.clear()
+        
+        try:
+            scanner = ParallelDirectoryScanner(
+                str(self.dataset_path),
+                is_valid_file=self._is_valid_file,
+                class_name_fn=self._normalize_class_name,
+                manifest=manifest,
+                max_workers=self.scan_workers
+            )
+            leaf_dirs = scanner.scan()
+            
+            print(f"Directorios escaneados: {scanner.stats['scanned']}, "
+                  f"sin cambios: {scanner.stats['reused']}, "
+                  f"eliminados: {scanner.stats['removed']}")
+            
+            if self.probe_media:
+                self._probe_media(manifest)
+                leaf_dirs = manifest.leaf_dirs()
+        finally:
+            manifest.close()
+        
+        self.quarantine = []
+        for leaf_dir in leaf_dirs:
+            root = leaf_dir['path']
             rel_path = os.path.relpath(root, self.dataset_path)
             
-            # Filtrar archivos válidos (imágenes/videos)
-            valid_files = [f for f in files if self._is_valid_file(f)]
+            self.quarantine.extend(
+                {'path': os.path.join(root, item['name']), 'error': item['error']}
+                for item in leaf_dir.get('quarantined', [])
+            )
+            if not leaf_dir['files']:
+                continue
             
-            if valid_files:  # Es un directorio hoja con archivos
-                structure['leaf_dirs'].append({
-                    'path': root,
-                    'relative_path': rel_path,
-                    'name': os.path.basename(root),
-                    'files': valid_files,
-                    'count': len(valid_files)
-                })
-                structure['all_paths'].append(rel_path)
+            structure['leaf_dirs'].append({
+                'path': root,
+                'relative_path': rel_path,
+                'name': os.path.basename(root),
+                'files': leaf_dir['files'],
+                'media': leaf_dir.get('media'),
+                'count': len(leaf_dir['files'])
+            })
+            structure['all_paths'].append(rel_path)
+        
+        if self.quarantine:
+            print(f"Archivos en cuarentena (ilegibles): {len(self.quarantine)}")
         
         return structure
     
+    def _probe_media(self, manifest: DatasetManifest):
+        """Inspecciona cabeceras de los archivos nuevos o modificados."""
+        pending = manifest.unprobed_files()
+        if not pending:
+            return
+        
+        print(f"Inspeccionando {len(pending)} archivos (solo cabeceras)...")
+        prober = MediaProber(max_workers=self.scan_workers)
+        results = prober.probe([os.path.join(dir_path, name) for dir_path, name in pending])
+        manifest.store_probes([
+            (dir_path, name, info) for (dir_path, name), info in zip(pending, results)
+        ])
+        manifest.commit()
+    
     def _detect_data_type(self) -> str:
         """Detecta si el dataset contiene imágenes, videos o ambos."""
         image_exts = {'.jpg', '.jpeg', '.png', '.bmp', '.gif'}
@@ -233,6 +306,7 @@ class DatasetDiscovery:
             'classes': self.classes,
             'hierarchy': self.hierarchy,
             'distribution': self.metadata,
+            'quarantined_files': len(self.quarantine),
             'structure': {
                 'total_directories': len(self.structure['leaf_dirs']),
                 'paths': self.structure['all_paths']
@@ -255,9 +329,29 @@ class DatasetDiscovery:
         
         print(f"Reporte guardado en: {json_path}")
         print(f"Reporte guardado en: {yaml_path}")
+        
+        # Archivos ilegibles detectados al inspeccionar cabeceras
+        quarantine_path = Path(output_path) / 'quarantine.json'
+        with open(quarantine_path, 'w', encoding='utf-8') as f:
+            json.dump(self.quarantine, f, indent=2, ensure_ascii=False)
+        if self.quarantine:
+            print(f"Cuarentena guardada en: {quarantine_path}")
     
-    def get_data_loaders_config(self) -> Dict:
-        """Genera configuración automática para los data loaders."""
+    def get_data_loaders_config(
+        self,
+        sample_index_file: Optional[str] = None,
+        sample_splits_file: Optional[str] = None
+    ) -> Dict:
+        """
+        Genera configuración automática para los data loaders.
+        
+        Solo contiene metadatos; la lista de archivos va en el índice
+        binario (`build_sample_index`), referenciado por `sample_index`.
+        
+        Args:
+            sample_index_file: Nombre del archivo de índice, relativo al YAML
+            sample_splits_file: Nombre del archivo de splits, relativo al YAML
+        """
         config = {
             'dataset_path': str(self.dataset_path),
             'dataset_type': self.dataset_type,
@@ -266,6 +360,10 @@ class DatasetDiscovery:
             'class_to_idx': {cls: idx for idx, cls in enumerate(self.classes)},
             'data_paths': []
         }
+        if sample_index_file:
+            config['sample_index'] = sample_index_file
+        if sample_splits_file:
+            config['sample_splits'] = sample_splits_file
         
         # Generar paths para cada clase
         for leaf_dir in self.structure['leaf_dirs']:
@@ -276,8 +374,84 @@ class DatasetDiscovery:
                 'class_name': class_name,
                 'class_idx': class_idx,
                 'path': leaf_dir['path'],
-                'num_samples': leaf_dir['count'],
-                'files': leaf_dir['files']
+                'num_samples': leaf_dir['count']
             })
         
-        return config
\ No newline at end of file
+        return config
+    
+    def build_sample_index(
+        self,
+        split_ratios: Optional[Dict] = None,
+        previous_splits_path: Optional[str] = None
+    ):
+        """
+        Construye el índice binario de muestras (rutas, etiquetas, split).
+        
+        El split se calcula aquí una sola vez (por hash de la ruta relativa
+        a la raíz del dataset) y se guarda con `save_splits`.
+        
+        Args:
+            split_ratios: Proporciones train/val/test
+            previous_splits_path: Split guardado por un setup anterior; sus
+                muestras conservan el split y solo las nuevas se asignan
+        
+        Returns:
+            SampleIndex listo para guardar junto al YAML de data loaders
+        """
+        from data.loaders.sample_index import SampleIndex, load_split_assignment
+        
+        class_to_idx = {cls: idx for idx, cls in enumerate(self.classes)}
+        samples = []
+        media_info = [] if self.probe_media else None
+        for leaf_dir in self.structure['leaf_dirs']:
+            class_idx = class_to_idx[self._normalize_class_name(leaf_dir['name'])]
+            root = leaf_dir['path']
+            samples.extend(
+                (os.path.join(root, file_name), class_idx) for file_name in leaf_dir['files']
+            )
+            if media_info is not None:
+                media_info.extend(leaf_dir['media'])
+        
+        previous_splits = None
+        saved = load_split_assignment(previous_splits_path)
+        if saved is not None and saved['key_hashes'] is not None:
+            previous_splits = (saved['key_hashes'], saved['splits'])
+        
+        return SampleIndex.build(
+            samples, root=str(self.dataset_path),
+            split_ratios=split_ratios, media_info=media_info,
+            previous_splits=previous_splits
+        )
+    
+    def deduplicate(
+        self,
+        sample_index,
+        report_path: Optional[str] = None,
+        hamming_threshold: int = 4,
+        near_duplicates: bool = True
+    ):
+        """
+        Elimina duplicados exactos y casi-duplicados del índice.
+        
+        Args:
+            sample_index: Índice de `build_sample_index`
+            report_path: Ruta de dedup_report.json (None = no guardar)
+            hamming_threshold: Distancia máxima entre hashes perceptuales
+            near_duplicates: Si buscar también casi-duplicados
+        
+        Returns:
+            (índice filtrado, reporte)
+        """
+        from .dataset_dedup import DatasetDeduplicator
+        
+        deduplicator = DatasetDeduplicator(
+            sample_index,
+            hamming_threshold=hamming_threshold,
+            near_duplicates=near_duplicates
+        )
+        keep, report = deduplicator.run()
+        
+        if report_path is not None:
+            deduplicator.save_report(report, report_path)
+        
+        return sample_index.take(np.flatnonzero(keep)), report
@@ -0,0 +1,334 @@
+# ======================================================                     *
+#  Project      : core                                                       *
+#  File         : dataset_manifest.py                                        *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:23                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Manifiesto persistente del dataset y escáner paralelo incremental.
+
+El manifiesto (SQLite) guarda cada directorio con su mtime y cada archivo
+válido con tamaño, mtime y clase. En un re-escaneo solo se listan los
+directorios cuyo mtime cambió (se agregaron, borraron o renombraron
+entradas); para el resto se reutiliza lo guardado y solo se hace un stat.
+
+También guarda los metadatos de inspección (`media_probe`) de cada archivo,
+que se conservan mientras el archivo no cambie de tamaño ni de mtime.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class DatasetManifest:
+    """Manifiesto SQLite: directorios (path, parent, mtime) y archivos."""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS dirs (
+            path TEXT PRIMARY KEY,
+            parent TEXT,
+            mtime_ns INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS files (
+            dir TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER,
+            mtime_ns INTEGER,
+            class_name TEXT,
+            PRIMARY KEY (dir, name)
+        );
+        CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs(parent);
+    """
+    
+    # Columnas de inspección (NULL en probe_ok = aún no inspeccionado)
+    PROBE_COLUMNS = {
+        'probe_ok': 'INTEGER',
+        'probe_error': 'TEXT',
+        'width': 'INTEGER',
+        'height': 'INTEGER',
+        'frames': 'INTEGER',
+        'fps': 'REAL'
+    }
+    
+    def __init__(self, manifest_path: str, root: str):
+        """
+        Args:
+            manifest_path: Ruta del archivo SQLite
+            root: Raíz del dataset (si cambia, el manifiesto se reinicia)
+        """
+        self.manifest_path = Path(manifest_path)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self.root = str(Path(root).resolve())
+        
+        self.conn = sqlite3.connect(str(self.manifest_path))
+        self.conn.executescript(self.SCHEMA)
+        self._add_missing_columns()
+        
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+        if row is None or row[0] != self.root:
+            self.clear()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('root', ?)", (self.root,)
+            )
+            self.conn.commit()
+    
+    def _add_missing_columns(self):
+        """Migra manifiestos creados antes de agregar columnas de inspección."""
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}
+        for column, column_type in self.PROBE_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE files ADD COLUMN {column} {column_type}")
+        self.conn.commit()
+    
+    def clear(self):
+        """Elimina todo el contenido (fuerza un escaneo completo)."""
+        self.conn.execute("DELETE FROM dirs")
+        self.conn.execute("DELETE FROM files")
+        self.conn.commit()
+    
+    def known_dirs(self) -> Dict[str, Tuple[int, List[str]]]:
+        """{path: (mtime_ns, [subdirectorios])} del último escaneo."""
+        known = {}
+        children = {}
+        for path, parent, mtime_ns in self.conn.execute("SELECT path, parent, mtime_ns FROM dirs"):
+            known[path] = mtime_ns
+            if parent is not None:
+                children.setdefault(parent, []).append(path)
+        return {path: (mtime_ns, children.get(path, [])) for path, mtime_ns in known.items()}
+    
+    def replace_dir(
+        self,
+        path: str,
+        parent: Optional[str],
+        mtime_ns: int,
+        files: List[Tuple[str, int, int]],
+        class_name: str
+    ):
+        """
+        Reemplaza un directorio y sus archivos (name, size, mtime_ns).
+        
+        Los archivos que no cambiaron (mismo tamaño y mtime) conservan sus
+        metadatos de inspección.
+        """
+        probe_columns = list(self.PROBE_COLUMNS)
+        previous = {
+            row[0]: row[1:]
+            for row in self.conn.execute(
+                f"SELECT name, size, mtime_ns, {', '.join(probe_columns)} FROM files WHERE dir = ?",
+                (path,)
+            )
+        }
+        
+        rows = []
+        for name, size, mtime in files:
+            old = previous.get(name)
+            probe = old[2:] if old is not None and old[:2] == (size, mtime) else (None,) * len(probe_columns)
+            rows.append((path, name, size, mtime, class_name) + tuple(probe))
+        
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (path, parent, mtime_ns)
+        )
+        self.conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+        placeholders = ', '.join('?' * (5 + len(probe_columns)))
+        self.conn.executemany(
+            f"INSERT INTO files (dir, name, size, mtime_ns, class_name, {', '.join(probe_columns)}) "
+            f"VALUES ({placeholders})",
+            rows
+        )
+    
+    def remove_dirs(self, paths: List[str]):
+        """Elimina directorios que ya no existen."""
+        self.conn.executemany("DELETE FROM dirs WHERE path = ?", [(p,) for p in paths])
+        self.conn.executemany("DELETE FROM files WHERE dir = ?", [(p,) for p in paths])
+    
+    def commit(self):
+        self.conn.commit()
+    
+    def unprobed_files(self) -> List[Tuple[str, str]]:
+        """Archivos (dir, name) sin metadatos de inspección."""
+        return self.conn.execute(
+            "SELECT dir, name FROM files WHERE probe_ok IS NULL"
+        ).fetchall()
+    
+    def store_probes(self, probes: List[Tuple[str, str, Dict]]):
+        """Guarda resultados de `media_probe` como (dir, name, info)."""
+        self.conn.executemany(
+            "UPDATE files SET probe_ok = ?, probe_error = ?, width = ?, height = ?, "
+            "frames = ?, fps = ? WHERE dir = ? AND name = ?",
+            [
+                (
+                    int(info['ok']), info.get('error'), info.get('width'),
+                    info.get('height'), info.get('frames'), info.get('fps'),
+                    dir_path, name
+                )
+                for dir_path, name, info in probes
+            ]
+        )
+    
+    def leaf_dirs(self) -> List[Dict]:
+        """
+        Directorios con archivos válidos, ordenados por ruta.
+        
+        Cada entrada tiene 'files' (legibles o sin inspeccionar), 'media'
+        (width, height, frames, fps por archivo; -1 si se desconoce) y
+        'quarantined' (archivos ilegibles con el motivo).
+        """
+        leaf_dirs = {}
+        rows = self.conn.execute(
+            "SELECT dir, name, probe_ok, probe_error, width, height, frames, fps "
+            "FROM files ORDER BY dir, name"
+        )
+        for dir_path, name, probe_ok, probe_error, width, height, frames, fps in rows:
+            entry = leaf_dirs.setdefault(
+                dir_path, {'path': dir_path, 'files': [], 'media': [], 'quarantined': []}
+            )
+            if probe_ok == 0:
+                entry['quarantined'].append({'name': name, 'error': probe_error})
+                continue
+            entry['files'].append(name)
+            entry['media'].append(tuple(
+                -1 if value is None else value for value in (width, height, frames, fps)
+            ))
+        
+        return list(leaf_dirs.values())
+    
+    def close(self):
+        self.conn.close()
+
+
+class ParallelDirectoryScanner:
+    """
+    Escáner de directorios con un pool de hilos (`os.scandir` por directorio).
+    
+    Recorre el árbol por niveles: todos los directorios de un nivel se
+    procesan en paralelo, lo que en montajes de red oculta la latencia de
+    cada listado.
+    """
+    
+    def __init__(
+        self,
+        root: str,
+        is_valid_file: Callable[[str], bool],
+        class_name_fn: Callable[[str], str],
+        manifest: DatasetManifest,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            root: Directorio raíz del dataset
+            is_valid_file: Filtro por nombre de archivo
+            class_name_fn: Nombre de clase a partir del nombre del directorio
+            manifest: Manifiesto donde persistir el escaneo
+            max_workers: Hilos del pool (None = min(32, 4 × CPUs))
+        """
+        self.root = str(root)
+        self.is_valid_file = is_valid_file
+        self.class_name_fn = class_name_fn
+        self.manifest = manifest
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.stats = {'scanned': 0, 'reused': 0, 'removed': 0}
+    
+    def _visit(self, path: str, known_mtime: Optional[int]):
+        """
+        Procesa un directorio (en un hilo del pool).
+        
+        Returns:
+            (mtime_ns, subdirs, files) o (mtime_ns, None, None) si no cambió
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None, None, None
+        
+        if known_mtime == mtime_ns:
+            return mtime_ns, None, None
+        
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # Como os.walk: no se siguen enlaces a directorios
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif self.is_valid_file(entry.name):
+                            stat = entry.stat()
+                            files.append((entry.name, stat.st_size, stat.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            return None, None, None
+        
+        return mtime_ns, subdirs, files
+    
+    def scan(self) -> List[Dict]:
+        """
+        Escanea el árbol (incremental respecto al manifiesto).
+        
+        Returns:
+            Lista de directorios hoja: {'path', 'files'} ordenados por ruta
+        """
+        known = self.manifest.known_dirs()
+        visited = set()
+        frontier = [(self.root, None)]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while frontier:
+                futures = [
+                    (path, parent, pool.submit(self._visit, path, known.get(path, (None, []))[0]))
+                    for path, parent in frontier
+                ]
+                frontier = []
+                
+                for path, parent, future in futures:
+                    mtime_ns, subdirs, files = future.result()
+                    if mtime_ns is None:
+                        continue
+                    visited.add(path)
+                    
+                    if subdirs is None:
+                        # Sin cambios: subdirectorios y archivos del manifiesto
+                        self.stats['reused'] += 1
+                        subdirs = known[path][1]
+                    else:
+                        self.stats['scanned'] += 1
+                        class_name = self.class_name_fn(os.path.basename(path))
+                        self.manifest.replace_dir(path, parent, mtime_ns, files, class_name)
+                    
+                    frontier.extend((subdir, path) for subdir in subdirs)
+        
+        removed = [path for path in known if path not in visited]
+        if removed:
+            self.manifest.remove_dirs(removed)
+            self.stats['removed'] = len(removed)
+        self.manifest.commit()
+        
+        return self.manifest.leaf_dirs()
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 20:51                                           *
+#  Last Updated : 2026-10-19 02:50                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -139,6 +139,29 @@ class ExperimentLogger:
         
         return run_id
     
+    def log_epoch(self, run_id: str, epoch: int, metrics: Dict):
+        """
+        Agrega las métricas de una época al historial del experimento.
+        
+        Args:
+            run_id: ID del experimento
+            epoch: Índice de la época (desde 0)
+            metrics: Métricas de la época (pérdidas, accuracy, tiempo por
+                etapa del entrenamiento y de carga de datos)
+        """
+        metrics_converted = self._convert_numpy_types(metrics)
+        
+        for run in self.runs:
+            if run['run_id'] == run_id:
+                run.setdefault('epochs', []).append({
+                    'epoch': epoch + 1,
+                    'logged_at': datetime.now().isoformat(),
+                    **metrics_converted
+                })
+                break
+        
+        self._save_runs()
+    
     def end_run(
         self,
         run_id: str,
@@ -0,0 +1,289 @@
+# ======================================================                     *
+#  Project      : core                                                       *
+#  File         : loader_tuner.py                                            *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:10                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Autotuner de DataLoaders.
+Mide throughput real (muestras/seg) y memoria pico para distintas
+configuraciones del DataLoader y guarda la mejor en la configuración.
+"""
+
+import os
+import gc
+import time
+import threading
+import itertools
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+import yaml
+
+try:
+    import psutil
+except ImportError:  # psutil es opcional: sin él se usa resource (solo Unix)
+    psutil = None
+
+
+class _PeakRSSMonitor:
+    """Muestrea en segundo plano el RSS del proceso + sus workers."""
+    
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _current_rss(self) -> int:
+        if psutil is None:
+            import resource
+            # ru_maxrss está en KB en Linux; es el pico, no el valor actual
+            own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            return (own + children) * 1024
+        
+        process = psutil.Process(os.getpid())
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return total
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._current_rss())
+            self._stop.wait(self.interval)
+    
+    def __enter__(self):
+        self.peak_bytes = self._current_rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class LoaderAutotuner:
+    """
+    Barrido temporizado de parámetros del DataLoader.
+    
+    Etapa 1: num_workers (con prefetch y pin por defecto).
+    Etapa 2: prefetch_factor × persistent_workers × pin_memory sobre el
+    mejor resultado de la etapa 1. Cada prueba recorre `epochs` épocas
+    cortas de `max_batches` batches para que cuente el arranque de workers.
+    
+    Los loaders se crean con las mismas opciones que el entrenamiento
+    (batch size, landmarks, caché, augmentación por batch, video); el batch
+    size no se ajusta: lo fija la configuración o el planificador de memoria.
+    """
+    
+    def __init__(
+        self,
+        loader_config_path: str,
+        config: Dict,
+        max_batches: int = 20,
+        epochs: int = 2,
+        max_memory_fraction: float = 0.8
+    ):
+        """
+        Args:
+            loader_config_path: Ruta a data_loaders_config.yaml
+            config: Configuración de entrenamiento (auto_generated_config.yaml)
+            max_batches: Batches medidos por época
+            epochs: Épocas cortas por prueba
+            max_memory_fraction: Fracción máxima de RAM total permitida
+        """
+        landmarks = config['features']['landmarks']
+        video_aug = config.get('augmentation', {}).get('video', {})
+        variable_length = video_aug.get('temporal_sampling') == 'fps'
+        
+        self.loader_config_path = loader_config_path
+        self.batch_size = config['dataset']['batch_size']
+        self.extract_landmarks = landmarks['enabled']
+        self.landmark_server = landmarks.get('server', False)
+        # Mismas opciones que create_data_loaders en `main.py train`
+        self.loader_options = {
+            'video_target_fps': video_aug.get('target_fps') if variable_length else None,
+            'video_max_frames': video_aug.get('max_frames', 90),
+            'batch_augmentation': config['augmentation']['image'].get('batch_level', False),
+            'landmark_cache_dir': landmarks.get('cache_dir')
+        }
+        self.max_batches = max_batches
+        self.epochs = epochs
+        self.max_memory_fraction = max_memory_fraction
+        self.results = []
+        self._landmark_client = None
+    
+    def _worker_candidates(self) -> List[int]:
+        """Candidatos de num_workers según los núcleos disponibles."""
+        cpus = os.cpu_count() or 1
+        candidates = {0, 2, 4, cpus // 2, cpus - 1, cpus}
+        return sorted(w for w in candidates if 0 <= w <= cpus)
+    
+    def _memory_limit(self) -> Optional[int]:
+        if psutil is None:
+            return None
+        return int(psutil.virtual_memory().total * self.max_memory_fraction)
+    
+    def _measure(self, params: Dict) -> Dict:
+        """Mide una configuración: muestras/seg y RSS pico."""
+        from data.loaders.universal_loader import create_data_loaders
+        
+        loaders = create_data_loaders(
+            config_path=self.loader_config_path,
+            batch_size=self.batch_size,
+            num_workers=params['num_workers'],
+            extract_landmarks=self.extract_landmarks,
+            landmark_client=self._landmark_client,
+            prefetch_factor=params['prefetch_factor'],
+            persistent_workers=params['persistent_workers'],
+            pin_memory=params['pin_memory'],
+            **self.loader_options
+        )
+        loader = loaders['train']
+        
+        samples = 0
+        with _PeakRSSMonitor() as monitor:
+            start = time.perf_counter()
+            for _ in range(self.epochs):
+                for batch in itertools.islice(loader, self.max_batches):
+                    samples += len(batch['label'])
+            elapsed = time.perf_counter() - start
+        
+        # Liberar workers persistentes antes de la siguiente prueba
+        del loaders, loader
+        gc.collect()
+        
+        result = dict(params)
+        result['samples_per_sec'] = samples / elapsed if elapsed > 0 else 0.0
+        result['peak_rss_mb'] = monitor.peak_bytes / (1024 ** 2)
+        result['seconds'] = elapsed
+        return result
+    
+    def _run_trials(self, grid: List[Dict]) -> List[Dict]:
+        memory_limit = self._memory_limit()
+        trials = []
+        
+        for params in grid:
+            print(f"  Probando {params} ...", end=' ', flush=True)
+            try:
+                result = self._measure(params)
+            except Exception as e:
+                print(f"falló ({e})")
+                continue
+            
+            result['within_memory'] = (
+                memory_limit is None or result['peak_rss_mb'] * 1024 ** 2 <= memory_limit
+            )
+            print(f"{result['samples_per_sec']:.1f} muestras/s, "
+                  f"{result['peak_rss_mb']:.0f} MB")
+            trials.append(result)
+        
+        self.results.extend(trials)
+        return trials
+    
+    @staticmethod
+    def _best(trials: List[Dict]) -> Optional[Dict]:
+        valid = [t for t in trials if t['within_memory']] or trials
+        if not valid:
+            return None
+        return max(valid, key=lambda t: t['samples_per_sec'])
+    
+    def tune(self) -> Dict:
+        """Ejecuta el barrido y retorna la mejor configuración."""
+        # Un solo servidor de landmarks para todas las pruebas: uno por prueba
+        # quedaría vivo hasta el final e inflaría el RSS de las siguientes
+        server = None
+        if self.extract_landmarks and self.landmark_server:
+            from data.loaders.landmark_detector import LandmarkServer
+            server = LandmarkServer().start()
+            self._landmark_client = server.client()
+        try:
+            return self._tune()
+        finally:
+            if server is not None:
+                server.stop()
+            self._landmark_client = None
+    
+    def _tune(self) -> Dict:
+        import torch
+        cuda = torch.cuda.is_available()
+        
+        print(f"\nEtapa 1: num_workers (batch_size {self.batch_size})")
+        stage1 = [
+            {
+                'num_workers': w,
+                'prefetch_factor': 2,
+                'persistent_workers': False,
+                'pin_memory': cuda
+            }
+            for w in self._worker_candidates()
+        ]
+        best = self._best(self._run_trials(stage1))
+        if best is None:
+            raise RuntimeError("Ninguna configuración del DataLoader pudo medirse")
+        
+        if best['num_workers'] > 0:
+            print("\nEtapa 2: prefetch_factor × persistent_workers × pin_memory")
+            stage2 = [
+                {
+                    'num_workers': best['num_workers'],
+                    'prefetch_factor': prefetch,
+                    'persistent_workers': persistent,
+                    'pin_memory': pin
+                }
+                for prefetch in [2, 4, 8]
+                for persistent in [False, True]
+                for pin in ([False, True] if cuda else [False])
+            ]
+            best = self._best([best] + self._run_trials(stage2))
+        
+        return best
+    
+    def update_config(self, config_path: str, best: Dict):
+        """Escribe la mejor configuración en auto_generated_config.yaml."""
+        config_path = Path(config_path)
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        
+        for key in ['num_workers', 'prefetch_factor', 'persistent_workers', 'pin_memory']:
+            config['dataset'][key] = best[key]
+        
+        config['dataset']['loader_tuning'] = {
+            'tuned_at': datetime.now().isoformat(),
+            'cpu_count': os.cpu_count(),
+            'extract_landmarks': self.extract_landmarks,
+            'batch_size': self.batch_size,
+            'samples_per_sec': round(best['samples_per_sec'], 2),
+            'peak_rss_mb': round(best['peak_rss_mb'], 1),
+            'trials': len(self.results)
+        }
+        
+        with open(config_path, 'w', encoding='utf-8') as f:
+            yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
+        
+        print(f"Configuración del DataLoader guardada en: {config_path}")
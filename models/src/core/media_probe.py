@@ -0,0 +1,161 @@
+# ======================================================                     *
+#  Project      : core                                                       *
+#  File         : media_probe.py                                             *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:23                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Inspección rápida de archivos multimedia (solo cabeceras).
+
+Imágenes: PIL abre el archivo de forma perezosa y solo lee la cabecera
+(tamaño, modo, formato). Para detectar archivos truncados se busca el
+marcador de fin de JPEG/PNG al final del archivo; solo si no está (p. ej. hay
+datos agregados después) se decodifica la imagen para confirmarlo.
+Videos: metadatos del contenedor (frames, fps, duración) vía OpenCV, sin
+decodificar frames.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+
+_JPEG_END = b'\xff\xd9'
+_PNG_END = b'IEND\xaeB`\x82'
+
+
+def _has_end_marker(path: str, image_format: Optional[str]) -> bool:
+    """Marcador de fin al final del archivo (camino rápido, sin decodificar)."""
+    if image_format == 'JPEG':
+        marker = _JPEG_END
+        tail_size = 64  # Puede haber bytes de relleno tras el marcador
+    elif image_format == 'PNG':
+        marker = _PNG_END
+        tail_size = len(_PNG_END)
+    else:
+        return True
+    
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - tail_size))
+        tail = f.read()
+    return marker in tail
+
+
+def _decodes_fully(path: str) -> bool:
+    """
+    Decodifica la imagen completa; False si los datos se acaban antes.
+    
+    Los JPEG se decodifican a 1/8 de escala (libjpeg igual recorre todos los
+    datos comprimidos, así que un archivo truncado falla igual).
+    """
+    from PIL import Image
+    
+    try:
+        with Image.open(path) as img:
+            if img.format == 'JPEG':
+                img.draft(img.mode, (max(1, img.width // 8), max(1, img.height // 8)))
+            img.load()
+        return True
+    except Exception:
+        return False
+
+
+def probe_image(path: str) -> Dict:
+    """
+    Lee la cabecera de una imagen.
+    
+    Returns:
+        Dict con 'ok', 'width', 'height', 'mode', 'format' o 'error'
+    """
+    from PIL import Image
+    
+    try:
+        with Image.open(path) as img:
+            info = {
+                'ok': True,
+                'width': img.width,
+                'height': img.height,
+                'mode': img.mode,
+                'format': img.format
+            }
+        # Sin marcador al final puede haber datos agregados (relleno de la
+        # cámara, video de una "motion photo", metadatos de editores)
+        if not _has_end_marker(path, info['format']) and not _decodes_fully(path):
+            return {'ok': False, 'error': 'archivo truncado'}
+        return info
+    except Exception as e:
+        return {'ok': False, 'error': str(e) or type(e).__name__}
+
+
+def probe_video(path: str) -> Dict:
+    """
+    Lee los metadatos del contenedor de un video.
+    
+    Returns:
+        Dict con 'ok', 'width', 'height', 'frames', 'fps', 'duration' o 'error'
+    """
+    import cv2
+    
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            return {'ok': False, 'error': 'no se pudo abrir el video'}
+        
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        if frames <= 0:
+            return {'ok': False, 'error': 'video sin frames'}
+        
+        return {
+            'ok': True,
+            'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'frames': frames,
+            'fps': fps,
+            'duration': frames / fps if fps > 0 else 0.0
+        }
+    finally:
+        cap.release()
+
+
+def probe_file(path: str) -> Dict:
+    """Inspecciona una imagen o un video según su extensión."""
+    if os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS:
+        return probe_video(path)
+    return probe_image(path)
+
+
+class MediaProber:
+    """Inspección en paralelo (pool de hilos: la E/S domina)."""
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    
+    def probe(self, paths: List[str]) -> List[Dict]:
+        """Inspecciona los archivos y retorna sus metadatos en el mismo orden."""
+        if not paths:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(probe_file, paths, chunksize=64))
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 17:45                                           *
+#  Last Updated : 2026-10-19 02:35                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -208,6 +208,11 @@ class VersionManager:
         improvements = {}
         
         for key in metrics:
+            # Solo métricas escalares (no matriz de confusión ni predicciones)
+            if not isinstance(metrics[key], (int, float, type(None))):
+                continue
+            if not isinstance(last_metrics.get(key), (int, float, type(None))):
+                continue
             if key in last_metrics:
                 # Asegurar que son floats nativos
                 current_val = float(metrics[key]) if metrics[key] is not None else 0.0
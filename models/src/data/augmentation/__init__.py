@@ -0,0 +1,37 @@
+# ======================================================                     *
+#  Project      : augmentation                                               *
+#  File         : __init__.py                                                *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:15                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""Data augmentation modules."""
+
+from .batch_augmenter import BatchAugmenter
+from .landmark_ops import flip_landmarks, rotate_landmarks
+from .paired_transforms import LandmarkConsistentAugment
+
+__all__ = [
+    'BatchAugmenter',
+    'LandmarkConsistentAugment',
+    'flip_landmarks',
+    'rotate_landmarks'
+]
@@ -0,0 +1,168 @@
+# ======================================================                     *
+#  Project      : augmentation                                               *
+#  File         : batch_augmenter.py                                         *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:12                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Augmentación vectorizada a nivel de batch.
+
+Los workers del DataLoader solo cargan y redimensionan (tensores uint8);
+flip, rotación y brillo/contraste se aplican aquí sobre el batch completo
+(en GPU si está disponible), con los landmarks transformados igual que la
+imagen.
+"""
+
+import math
+import torch
+import torch.nn.functional as F
+from typing import Dict, Optional, Tuple
+
+from .landmark_ops import flip_landmarks, rotate_landmarks
+
+
+class BatchAugmenter:
+    """
+    Augmentación + normalización de batches uint8 [B, 3, H, W].
+    
+    Equivalente por batch a RandomHorizontalFlip + RandomRotation +
+    ColorJitter(brightness, contrast) + Normalize.
+    """
+    
+    def __init__(
+        self,
+        horizontal_flip: float = 0.5,
+        rotation: float = 15,
+        brightness: float = 0.2,
+        contrast: float = 0.2,
+        mean: Tuple[float, ...] = (0.485, 0.456, 0.406),
+        std: Tuple[float, ...] = (0.229, 0.224, 0.225)
+    ):
+        """
+        Args:
+            horizontal_flip: Probabilidad de espejo horizontal
+            rotation: Rotación máxima en grados (uniforme en [-r, r])
+            brightness: Variación máxima de brillo (factor en [1-b, 1+b])
+            contrast: Variación máxima de contraste (factor en [1-c, 1+c])
+            mean: Media de normalización por canal
+            std: Desviación estándar de normalización por canal
+        """
+        self.horizontal_flip = horizontal_flip
+        self.rotation = rotation
+        self.brightness = brightness
+        self.contrast = contrast
+        self.mean = torch.tensor(mean).view(1, 3, 1, 1)
+        self.std = torch.tensor(std).view(1, 3, 1, 1)
+    
+    @classmethod
+    def from_config(cls, aug_config: Dict) -> 'BatchAugmenter':
+        """Crea el augmenter desde config['augmentation']['image']."""
+        normalization = aug_config.get('normalization', {})
+        return cls(
+            horizontal_flip=aug_config.get('horizontal_flip', 0.5),
+            rotation=aug_config.get('rotation', 15),
+            brightness=aug_config.get('brightness', 0.2),
+            contrast=aug_config.get('contrast', 0.2),
+            mean=tuple(normalization.get('mean', [0.485, 0.456, 0.406])),
+            std=tuple(normalization.get('std', [0.229, 0.224, 0.225]))
+        )
+    
+    def __call__(
+        self,
+        images: torch.Tensor,
+        landmarks: Optional[torch.Tensor] = None,
+        train: bool = True
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+        """
+        Args:
+            images: Tensor uint8 [B, 3, H, W]
+            landmarks: Tensor [B, 126] (opcional)
+            train: Si aplicar augmentación (False = solo normalizar)
+        
+        Returns:
+            (imágenes float normalizadas, landmarks transformados)
+        """
+        x = images.float().div_(255.0)
+        
+        if train:
+            x, landmarks = self._augment(x, landmarks)
+        
+        mean = self.mean.to(x.device)
+        std = self.std.to(x.device)
+        x = (x - mean) / std
+        
+        return x, landmarks
+    
+    def _augment(
+        self,
+        x: torch.Tensor,
+        landmarks: Optional[torch.Tensor]
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+        batch_size, _, height, width = x.shape
+        device = x.device
+        
+        # Flip horizontal
+        if self.horizontal_flip > 0:
+            flip_mask = torch.rand(batch_size, device=device) < self.horizontal_flip
+            x = torch.where(flip_mask[:, None, None, None], x.flip(-1), x)
+            if landmarks is not None:
+                landmarks = flip_landmarks(landmarks, flip_mask.to(landmarks.device))
+        
+        # Rotación (una matriz afín por muestra, un solo grid_sample)
+        if self.rotation > 0:
+            angles = (torch.rand(batch_size, device=device) * 2 - 1) * self.rotation
+            x = self._rotate(x, angles)
+            if landmarks is not None:
+                landmarks = rotate_landmarks(
+                    landmarks, angles.to(landmarks.device), aspect_ratio=width / height
+                )
+        
+        # Brillo y contraste
+        if self.brightness > 0:
+            factor = 1 + (torch.rand(batch_size, 1, 1, 1, device=device) * 2 - 1) * self.brightness
+            x = (x * factor).clamp_(0, 1)
+        
+        if self.contrast > 0:
+            factor = 1 + (torch.rand(batch_size, 1, 1, 1, device=device) * 2 - 1) * self.contrast
+            gray = (0.299 * x[:, 0] + 0.587 * x[:, 1] + 0.114 * x[:, 2])
+            gray_mean = gray.mean(dim=(1, 2)).view(batch_size, 1, 1, 1)
+            x = ((x - gray_mean) * factor + gray_mean).clamp_(0, 1)
+        
+        return x, landmarks
+    
+    @staticmethod
+    def _rotate(x: torch.Tensor, angles: torch.Tensor) -> torch.Tensor:
+        """Rota cada imagen (antihorario, relleno negro) como RandomRotation."""
+        _, _, height, width = x.shape
+        radians = angles * (math.pi / 180.0)
+        cos, sin = torch.cos(radians), torch.sin(radians)
+        
+        # affine_grid mapea salida -> entrada en coords normalizadas [-1, 1];
+        # se corrige el aspecto para que la rotación sea rígida en píxeles
+        theta = torch.zeros(x.shape[0], 2, 3, device=x.device, dtype=x.dtype)
+        theta[:, 0, 0] = cos
+        theta[:, 0, 1] = -sin * height / width
+        theta[:, 1, 0] = sin * width / height
+        theta[:, 1, 1] = cos
+        
+        grid = F.affine_grid(theta, list(x.shape), align_corners=False)
+        return F.grid_sample(x, grid, mode='bilinear', padding_mode='zeros', align_corners=False)
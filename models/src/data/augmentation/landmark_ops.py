@@ -0,0 +1,118 @@
+# ======================================================                     *
+#  Project      : augmentation                                               *
+#  File         : landmark_ops.py                                            *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:15                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Transformaciones geométricas sobre landmarks de MediaPipe.
+
+Los landmarks vienen en coordenadas normalizadas de imagen ([0, 1], eje y
+hacia abajo), en un vector de 126 valores = 2 manos × 21 puntos × (x, y, z).
+El slot 0 es la mano izquierda y el slot 1 la derecha (según MediaPipe).
+Las manos no detectadas son todo ceros y se conservan así.
+"""
+
+import math
+import torch
+
+
+NUM_HANDS = 2
+POINTS_PER_HAND = 21
+
+
+def _as_hands(landmarks: torch.Tensor) -> torch.Tensor:
+    """[B, 126] -> [B, 2, 21, 3]"""
+    return landmarks.reshape(landmarks.shape[0], NUM_HANDS, POINTS_PER_HAND, 3)
+
+
+def valid_hands_mask(landmarks: torch.Tensor) -> torch.Tensor:
+    """Máscara [B, 2] de manos detectadas (alguna coordenada distinta de cero)."""
+    return _as_hands(landmarks).abs().sum(dim=(2, 3)) > 0
+
+
+def flip_landmarks(
+    landmarks: torch.Tensor,
+    flip_mask: torch.Tensor,
+    swap_hands: bool = True
+) -> torch.Tensor:
+    """
+    Espejo horizontal (x -> 1 - x) de las muestras indicadas.
+    
+    Los slots de mano están ordenados por lateralidad (izquierda, derecha),
+    así que al reflejar la imagen también se intercambian.
+    
+    Args:
+        landmarks: Tensor [B, 126]
+        flip_mask: Tensor bool [B]
+        swap_hands: Si intercambiar los slots izquierda/derecha
+    
+    Returns:
+        Tensor [B, 126]
+    """
+    hands = _as_hands(landmarks).clone()
+    apply = flip_mask[:, None] & valid_hands_mask(landmarks)
+    hands[..., 0] = torch.where(apply[..., None], 1.0 - hands[..., 0], hands[..., 0])
+    
+    if swap_hands:
+        swapped = hands.flip(1)
+        hands = torch.where(flip_mask[:, None, None, None], swapped, hands)
+    
+    return hands.reshape(landmarks.shape)
+
+
+def rotate_landmarks(
+    landmarks: torch.Tensor,
+    angles: torch.Tensor,
+    aspect_ratio: float = 1.0
+) -> torch.Tensor:
+    """
+    Rota los landmarks alrededor del centro de la imagen.
+    
+    Usa la misma convención que torchvision (ángulo positivo = giro
+    antihorario en pantalla). z no cambia con una rotación en el plano.
+    
+    Args:
+        landmarks: Tensor [B, 126]
+        angles: Tensor [B] en grados
+        aspect_ratio: Ancho / alto de la imagen sobre la que se rota
+    
+    Returns:
+        Tensor [B, 126]
+    """
+    hands = _as_hands(landmarks).clone()
+    valid = valid_hands_mask(landmarks)
+    
+    radians = angles.to(landmarks.dtype) * (math.pi / 180.0)
+    cos = torch.cos(radians)[:, None, None]
+    sin = torch.sin(radians)[:, None, None]
+    
+    # Pasar a unidades proporcionales a píxeles (centro en 0)
+    dx = (hands[..., 0] - 0.5) * aspect_ratio
+    dy = hands[..., 1] - 0.5
+    
+    new_x = (dx * cos + dy * sin) / aspect_ratio + 0.5
+    new_y = -dx * sin + dy * cos + 0.5
+    
+    hands[..., 0] = torch.where(valid[..., None], new_x, hands[..., 0])
+    hands[..., 1] = torch.where(valid[..., None], new_y, hands[..., 1])
+    return hands.reshape(landmarks.shape)
@@ -0,0 +1,104 @@
+# ======================================================                     *
+#  Project      : augmentation                                               *
+#  File         : paired_transforms.py                                       *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:15                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Augmentación geométrica por muestra consistente con los landmarks.
+
+Aplica flip/rotación a la imagen PIL y la misma transformación, de forma
+analítica, al vector de landmarks (incluido el intercambio de manos en el
+flip). Así la augmentación geométrica puede usarse con landmarks cacheados
+sin volver a ejecutar MediaPipe sobre la imagen aumentada.
+"""
+
+import random
+import numpy as np
+import torch
+import torchvision.transforms.functional as TF
+from PIL import Image
+from typing import Optional, Tuple
+
+from .landmark_ops import flip_landmarks, rotate_landmarks
+
+
+class LandmarkConsistentAugment:
+    """
+    Resize + RandomHorizontalFlip + RandomRotation sobre (imagen, landmarks).
+    
+    Reemplaza a esas tres transformaciones de torchvision en el pipeline de
+    entrenamiento; el resto (ColorJitter, ToTensor, Normalize) no cambia la
+    geometría y se aplica después.
+    """
+    
+    def __init__(
+        self,
+        resize: Optional[Tuple[int, int]] = (224, 224),
+        horizontal_flip: float = 0.5,
+        rotation: float = 15
+    ):
+        """
+        Args:
+            resize: Tamaño (alto, ancho) antes de rotar; None = sin resize
+            horizontal_flip: Probabilidad de espejo horizontal
+            rotation: Rotación máxima en grados (uniforme en [-r, r])
+        """
+        self.resize = resize
+        self.horizontal_flip = horizontal_flip
+        self.rotation = rotation
+    
+    def __call__(
+        self,
+        image: Image.Image,
+        landmarks: np.ndarray
+    ) -> Tuple[Image.Image, np.ndarray]:
+        """
+        Args:
+            image: Imagen PIL RGB
+            landmarks: Array [126] en coordenadas normalizadas
+        
+        Returns:
+            (imagen transformada, landmarks transformados)
+        """
+        if self.resize is not None:
+            # Coordenadas normalizadas: el resize no cambia los landmarks
+            image = TF.resize(image, list(self.resize))
+        
+        lm = torch.from_numpy(np.asarray(landmarks, dtype=np.float32)).unsqueeze(0)
+        
+        if random.random() < self.horizontal_flip:
+            image = TF.hflip(image)
+            lm = flip_landmarks(lm, torch.tensor([True]))
+        
+        if self.rotation > 0:
+            angle = random.uniform(-self.rotation, self.rotation)
+            image = TF.rotate(image, angle)
+            lm = rotate_landmarks(
+                lm, torch.tensor([angle]), aspect_ratio=image.width / image.height
+            )
+        
+        return image, lm.squeeze(0).numpy()
+    
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(resize={self.resize}, "
+                f"horizontal_flip={self.horizontal_flip}, rotation={self.rotation})")
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:24                                           *
+#  Last Updated : 2026-10-19 02:50                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -28,13 +28,40 @@
 from .universal_loader import (
     UniversalImageDataset,
     UniversalVideoDataset,
-    create_data_loaders
+    create_data_loaders,
+    close_data_loaders
 )
 from .data_splitter import AutoDataSplitter
+from .video_batching import (
+    LengthBucketBatchSampler,
+    collate_variable_length,
+    pack_frame_features
+)
+from .landmark_detector import (
+    LandmarkServer,
+    LandmarkClient,
+    get_hands_detector,
+    landmark_worker_init_fn
+)
+from .landmark_cache import LandmarkCache
+from .load_stats import LoadStats
+from .sample_index import SampleIndex, load_sample_index
 
 __all__ = [
     'UniversalImageDataset',
     'UniversalVideoDataset',
     'create_data_loaders',
-    'AutoDataSplitter'
+    'close_data_loaders',
+    'AutoDataSplitter',
+    'LengthBucketBatchSampler',
+    'collate_variable_length',
+    'pack_frame_features',
+    'LandmarkServer',
+    'LandmarkClient',
+    'get_hands_detector',
+    'landmark_worker_init_fn',
+    'LandmarkCache',
+    'LoadStats',
+    'SampleIndex',
+    'load_sample_index'
 ]
\ No newline at end of file
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:30                                           *
+#  Last Updated : 2026-10-19 02:19                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -27,80 +27,55 @@
 Split automático de datos en train/val/test.
 """
 
-from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional
 import random
-import yaml
+
+from .sample_index import SPLIT_NAMES, load_sample_index
 
 
 class AutoDataSplitter:
-    """Split automático de datos manteniendo distribución de clases."""
+    """
+    Split automático de datos manteniendo distribución de clases.
+    
+    Usa la misma asignación que los datasets (`sample_index.assign_splits`,
+    guardada en `sample_splits`), así que ambos siempre coinciden.
+    """
     
     def __init__(
         self,
         data_config: Dict,
         split_ratios: Dict = None,
-        seed: int = 42
+        seed: int = 42,
+        config_path: Optional[str] = None
     ):
-        if split_ratios is None:
-            split_ratios = {'train': 0.7, 'val': 0.15, 'test': 0.15}
-        
+        """
+        Args:
+            data_config: Configuración de data loaders
+            split_ratios: Proporciones (None = las guardadas con el índice)
+            seed: Semilla para el orden de las muestras dentro de cada split
+            config_path: Ruta del YAML (para resolver el índice relativo)
+        """
         self.data_config = data_config
         self.split_ratios = split_ratios
         self.seed = seed
-        random.seed(seed)
+        self.config_path = config_path
         
         # Validar ratios
-        total = sum(split_ratios.values())
-        assert abs(total - 1.0) < 0.01, f"Split ratios must sum to 1.0, got {total}"
+        if split_ratios is not None:
+            total = sum(split_ratios.values())
+            assert abs(total - 1.0) < 0.01, f"Split ratios must sum to 1.0, got {total}"
     
     def split(self) -> Dict[str, List]:
-        """Realiza el split estratificado de datos."""
-        splits = {'train': [], 'val': [], 'test': []}
-        
-        # Agrupar por clase
-        files_by_class = {}
-        for class_data in self.data_config['data_paths']:
-            class_idx = class_data['class_idx']
-            class_path = Path(class_data['path'])
-            
-            files = []
-            for file_name in class_data['files']:
-                file_path = class_path / file_name
-                if file_path.exists():
-                    files.append((str(file_path), class_idx))
-            
-            if files:
-                files_by_class[class_idx] = files
-        
-        # Split por clase
-        for class_idx, files in files_by_class.items():
-            random.shuffle(files)
-            
-            n_files = len(files)
-            n_train = int(n_files * self.split_ratios['train'])
-            n_val = int(n_files * self.split_ratios['val'])
-            
-            if n_files >= 3:
-                n_train = max(1, n_train)
-                n_val = max(1, n_val)
-                n_test = max(1, n_files - n_train - n_val)
-            elif n_files == 2:
-                n_train = 1
-                n_val = 0
-                n_test = 1
-            else:
-                n_train = 1
-                n_val = 0
-                n_test = 0
-            
-            splits['train'].extend(files[:n_train])
-            splits['val'].extend(files[n_train:n_train + n_val])
-            splits['test'].extend(files[n_train + n_val:])
+        """Retorna las muestras (ruta, etiqueta) de cada split."""
+        index = load_sample_index(self.data_config, self.config_path, self.split_ratios)
+        rng = random.Random(self.seed)
         
-        # Shuffle final
-        for split_data in splits.values():
-            random.shuffle(split_data)
+        splits = {}
+        for split_name in SPLIT_NAMES:
+            split_data = list(index.subset(split_name))
+            # Shuffle final
+            rng.shuffle(split_data)
+            splits[split_name] = split_data
         
         return splits
     
@@ -0,0 +1,75 @@
+# ======================================================                     *
+#  Project      : loaders                                                    *
+#  File         : landmark_cache.py                                          *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:15                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Caché en disco de landmarks por imagen.
+
+Los landmarks se calculan una sola vez sobre la imagen original y se
+reutilizan en todas las épocas (y entre procesos/workers). La clave incluye
+tamaño y mtime del archivo, así que una imagen modificada se recalcula.
+"""
+
+import os
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Optional
+
+
+class LandmarkCache:
+    """Un archivo .npy por imagen, distribuido en subdirectorios."""
+    
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _entry_path(self, file_path: str) -> Optional[Path]:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.npy"
+    
+    def get(self, file_path: str) -> Optional[np.ndarray]:
+        """Landmarks cacheados de la imagen o None."""
+        entry = self._entry_path(file_path)
+        if entry is None or not entry.exists():
+            return None
+        try:
+            return np.load(entry)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, file_path: str, landmarks: np.ndarray):
+        """Guarda landmarks (escritura atómica: seguro con varios workers)."""
+        entry = self._entry_path(file_path)
+        if entry is None:
+            return
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry.with_name(f"{entry.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp_path, np.asarray(landmarks, dtype=np.float32))
+        os.replace(tmp_path, entry)
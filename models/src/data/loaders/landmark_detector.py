@@ -0,0 +1,303 @@
+# ======================================================                     *
+#  Project      : loaders                                                    *
+#  File         : landmark_detector.py                                       *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:15                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Detector de landmarks de manos (MediaPipe) compartido.
+
+Hay un único detector por proceso: se crea de forma perezosa en el primer
+uso (o en `landmark_worker_init_fn` dentro de cada worker del DataLoader) y
+lo comparten todos los splits que ese proceso atienda. Nunca se hereda una
+instancia creada antes del fork.
+
+Opcionalmente, `LandmarkServer` mantiene un solo detector en un proceso
+aparte y los workers le envían lotes de imágenes con `LandmarkClient`.
+"""
+
+import os
+import atexit
+import secrets
+import threading
+import multiprocessing as mp
+from multiprocessing.connection import Listener, Client
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+LANDMARK_DIM = 126  # 2 manos × 21 puntos × 3 coords (x, y, z)
+
+# Detector del proceso actual (se invalida si el PID cambia tras un fork)
+_detector = None
+_detector_pid = None
+_detector_lock = threading.Lock()
+
+
+def mediapipe_available() -> bool:
+    """Verifica si MediaPipe está instalado sin inicializar ningún detector."""
+    try:
+        import mediapipe  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_hands_detector():
+    """Crea una instancia de MediaPipe Hands (None si no es posible)."""
+    try:
+        import mediapipe as mp_lib
+        # Manejo compatible con diferentes versiones de MediaPipe
+        if hasattr(mp_lib, 'solutions'):
+            # MediaPipe versión antigua (< 0.10.8)
+            mp_hands = mp_lib.solutions.hands
+        else:
+            # MediaPipe versión nueva (>= 0.10.8)
+            from mediapipe.python.solutions import hands as mp_hands
+        
+        return mp_hands.Hands(
+            static_image_mode=True,
+            max_num_hands=2,
+            min_detection_confidence=0.5
+        )
+    except ImportError:
+        print("⚠️ MediaPipe no instalado. Landmarks desactivados.")
+    except AttributeError as e:
+        print(f"⚠️ Error de compatibilidad con MediaPipe: {e}")
+    return None
+
+
+def get_hands_detector():
+    """
+    Retorna el detector del proceso actual, creándolo si no existe.
+    
+    Si el proceso es un fork de otro que ya tenía detector, se crea uno
+    nuevo en lugar de reutilizar la copia heredada.
+    """
+    global _detector, _detector_pid
+    
+    pid = os.getpid()
+    if _detector is None or _detector_pid != pid:
+        with _detector_lock:
+            if _detector is None or _detector_pid != pid:
+                _detector = create_hands_detector()
+                _detector_pid = pid
+                if _detector is not None:
+                    print(f"✅ MediaPipe Hands inicializado (pid {pid})")
+    return _detector
+
+
+def landmark_worker_init_fn(worker_id: int):
+    """
+    `worker_init_fn` para DataLoader: crea el detector del worker.
+    
+    Si el dataset usa un servidor de landmarks, solo abre la conexión.
+    """
+    from torch.utils.data import get_worker_info
+    
+    info = get_worker_info()
+    dataset = info.dataset if info is not None else None
+    client = getattr(dataset, 'landmark_client', None)
+    
+    if client is not None:
+        client.connect()
+    elif getattr(dataset, 'extract_landmarks', False):
+        get_hands_detector()
+
+
+def extract_hand_landmarks(hands, img_np: np.ndarray) -> np.ndarray:
+    """
+    Extrae el vector de 126 landmarks de una imagen RGB.
+    
+    Las manos se ordenan por lateralidad: slot 0 = izquierda, slot 1 =
+    derecha (un slot vacío queda en ceros). Si MediaPipe asigna la misma
+    lateralidad a ambas manos se conserva el orden de detección.
+    
+    Args:
+        hands: Detector MediaPipe Hands
+        img_np: Imagen RGB uint8 [H, W, 3]
+    
+    Returns:
+        Array float32 [126] (ceros si no se detectaron manos)
+    """
+    landmarks = np.zeros(LANDMARK_DIM, dtype=np.float32)
+    
+    try:
+        results = hands.process(img_np)
+        
+        if results.multi_hand_landmarks:
+            detected = results.multi_hand_landmarks[:2]
+            labels = []
+            for handedness in (results.multi_handedness or [])[:len(detected)]:
+                labels.append(handedness.classification[0].label)
+            
+            if len(labels) == len(detected) and len(set(labels)) == len(labels):
+                slots = [0 if label == 'Left' else 1 for label in labels]
+            else:
+                slots = list(range(len(detected)))
+            
+            for slot, hand_landmarks in zip(slots, detected):
+                coords = [
+                    value
+                    for landmark in hand_landmarks.landmark
+                    for value in (landmark.x, landmark.y, landmark.z)
+                ]
+                landmarks[slot * 63:(slot + 1) * 63] = coords
+    except Exception:
+        # Error al procesar: sin landmarks
+        landmarks[:] = 0
+    
+    return landmarks
+
+
+# ==================== SERVIDOR FUERA DE PROCESO ====================
+
+def _serve_client(conn, hands, lock: threading.Lock):
+    """Atiende a un cliente: recibe lotes de imágenes y responde landmarks."""
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == 'close':
+                break
+            if message[0] == 'extract':
+                images = message[1]
+                with lock:
+                    if hands is None:
+                        results = [np.zeros(LANDMARK_DIM, dtype=np.float32) for _ in images]
+                    else:
+                        results = [extract_hand_landmarks(hands, img) for img in images]
+                conn.send(results)
+    except (EOFError, ConnectionResetError, BrokenPipeError):
+        pass
+    finally:
+        conn.close()
+
+
+def _server_main(address_queue, authkey: bytes):
+    """Proceso servidor: un solo detector para todos los clientes."""
+    hands = create_hands_detector()
+    lock = threading.Lock()  # MediaPipe no es thread-safe
+    
+    listener = Listener(('127.0.0.1', 0), authkey=authkey)
+    address_queue.put(listener.address)
+    
+    while True:
+        conn = listener.accept()
+        threading.Thread(
+            target=_serve_client, args=(conn, hands, lock), daemon=True
+        ).start()
+
+
+class LandmarkServer:
+    """
+    Servidor de landmarks en un proceso independiente.
+    
+    Uso:
+        server = LandmarkServer().start()
+        client = server.client()      # picklable, se pasa al dataset
+        landmarks = client.extract_batch([img1, img2, ...])
+        server.stop()
+    """
+    
+    def __init__(self):
+        self.authkey = secrets.token_bytes(16)
+        self.address = None
+        self._process = None
+    
+    def start(self) -> 'LandmarkServer':
+        """Lanza el proceso servidor y espera a que publique su dirección."""
+        # 'spawn' para no heredar el estado de torch/CUDA del proceso padre
+        ctx = mp.get_context('spawn')
+        address_queue = ctx.Queue()
+        self._process = ctx.Process(
+            target=_server_main,
+            args=(address_queue, self.authkey),
+            daemon=True
+        )
+        self._process.start()
+        self.address = address_queue.get(timeout=60)
+        atexit.register(self.stop)
+        
+        print(f"Servidor de landmarks activo en {self.address[0]}:{self.address[1]}")
+        return self
+    
+    def client(self) -> 'LandmarkClient':
+        """Crea un cliente para este servidor."""
+        return LandmarkClient(self.address, self.authkey)
+    
+    def stop(self):
+        """Detiene el proceso servidor."""
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=5)
+        self._process = None
+        atexit.unregister(self.stop)
+
+
+class LandmarkClient:
+    """
+    Cliente del servidor de landmarks.
+    
+    La conexión se abre de forma perezosa en cada proceso (no se pickea),
+    por lo que el mismo cliente puede pasarse a los workers del DataLoader.
+    """
+    
+    def __init__(self, address: Tuple[str, int], authkey: bytes):
+        self.address = tuple(address)
+        self.authkey = authkey
+        self._conn = None
+        self._conn_pid = None
+    
+    def __getstate__(self):
+        return {'address': self.address, 'authkey': self.authkey}
+    
+    def __setstate__(self, state):
+        self.address = state['address']
+        self.authkey = state['authkey']
+        self._conn = None
+        self._conn_pid = None
+    
+    def connect(self):
+        """Abre la conexión del proceso actual si aún no existe."""
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            self._conn = Client(self.address, authkey=self.authkey)
+            self._conn_pid = pid
+        return self._conn
+    
+    def extract_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        """Envía un lote de imágenes RGB uint8 y retorna sus landmarks."""
+        if not images:
+            return []
+        conn = self.connect()
+        conn.send(('extract', images))
+        return conn.recv()
+    
+    def close(self):
+        """Cierra la conexión del proceso actual."""
+        if self._conn is not None and self._conn_pid == os.getpid():
+            try:
+                self._conn.send(('close',))
+            except (OSError, EOFError):
+                pass
+            self._conn.close()
+        self._conn = None
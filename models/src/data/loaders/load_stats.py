@@ -0,0 +1,102 @@
+# ======================================================                     *
+#  Project      : loaders                                                    *
+#  File         : load_stats.py                                              *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:50                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Contadores de tiempo de carga compartidos entre workers del DataLoader.
+
+Los valores viven en memoria compartida (`multiprocessing.RawArray`) creada
+por el proceso principal junto con el dataset; cada worker la hereda y suma
+sus tiempos ahí, así que el trainer ve el total de todos los workers sin
+canales extra.
+"""
+
+import multiprocessing as mp
+from typing import Dict
+
+
+class LoadStats:
+    """
+    Tiempo acumulado de decodificación, landmarks y transformaciones, y
+    cuántas imágenes pidieron landmarks y en cuántas se detectó alguna mano.
+    """
+    
+    TIME_FIELDS = ('decode', 'landmarks', 'transform')
+    FIELDS = TIME_FIELDS + ('samples', 'landmark_images', 'landmark_hits')
+    
+    def __init__(self):
+        self._values = mp.RawArray('d', len(self.FIELDS))
+        self._lock = mp.Lock()
+    
+    def add(
+        self,
+        decode: float,
+        landmarks: float,
+        transform: float,
+        samples: int,
+        landmark_images: int = 0,
+        landmark_hits: int = 0
+    ):
+        """Suma los tiempos (segundos) y conteos de un batch cargado en este proceso."""
+        with self._lock:
+            self._values[0] += decode
+            self._values[1] += landmarks
+            self._values[2] += transform
+            self._values[3] += samples
+            self._values[4] += landmark_images
+            self._values[5] += landmark_hits
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Totales acumulados desde la creación (o el último `reset`)."""
+        with self._lock:
+            return dict(zip(self.FIELDS, self._values[:]))
+    
+    def get(self, field: str) -> float:
+        """Un total sin tomar el lock (lectura para métricas, puede ir un batch atrás)."""
+        return self._values[self.FIELDS.index(field)]
+    
+    def reset(self):
+        with self._lock:
+            for i in range(len(self.FIELDS)):
+                self._values[i] = 0.0
+    
+    @staticmethod
+    def delta(after: Dict[str, float], before: Dict[str, float]) -> Dict:
+        """
+        Diferencia entre dos snapshots.
+        
+        Returns:
+            Segundos por etapa, muestras y ms por muestra de cada etapa
+            (tiempo de CPU sumado entre workers, no tiempo de pared), y la
+            tasa de detección de landmarks si se extrajeron
+        """
+        stats = {field: after[field] - before[field] for field in LoadStats.FIELDS}
+        samples = int(stats['samples'])
+        result = {'samples': samples}
+        for field in LoadStats.TIME_FIELDS:
+            result[f'{field}_s'] = round(stats[field], 4)
+            result[f'{field}_ms_per_sample'] = round(stats[field] * 1000 / samples, 3) if samples else 0.0
+        if stats['landmark_images']:
+            result['landmark_detection_rate'] = round(stats['landmark_hits'] / stats['landmark_images'], 4)
+        return result
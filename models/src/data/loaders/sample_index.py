@@ -0,0 +1,454 @@
+# ======================================================                     *
+#  Project      : loaders                                                    *
+#  File         : sample_index.py                                            *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:23                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+
+"""
+Índice binario de muestras del dataset y asignación de splits.
+
+Guarda la lista de muestras en columnas NumPy (.npz) en lugar de listas de
+archivos en YAML:
+    - paths: tabla de strings UTF-8 concatenados + offsets (int64)
+    - labels: int32
+    - media: int8 (0 = imagen, 1 = video)
+    - metadatos opcionales de la inspección de cabeceras: width, height,
+      frames (int32) y fps (float32); -1 si se desconocen
+
+El split (int8: 0 = train, 1 = val, 2 = test) se calcula una sola vez y se
+guarda en un archivo aparte junto al índice, con el hash de la ruta relativa
+de cada muestra. Una muestra nueva cae en un split según ese hash; una ya
+guardada conserva su split, así que agregar archivos nunca mueve de split a
+las muestras existentes.
+
+Clases pequeñas: igual que el split aleatorio anterior, cada clase tiene al
+menos una muestra de train, una de test si tiene 2 o más y una de val si
+tiene 3 o más. Esos mínimos solo se cubren con muestras nuevas; si una clase
+pierde archivos, no se reasignan las que quedan (puede quedar sin val/test).
+
+Cargarlo es una lectura de arreglos, independiente de cuántos archivos haya.
+"""
+
+import os
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+SPLIT_NAMES = ('train', 'val', 'test')
+MEDIA_IMAGE = 0
+MEDIA_VIDEO = 1
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+DEFAULT_SPLIT_RATIOS = {'train': 0.7, 'val': 0.15, 'test': 0.15}
+
+
+def split_hashes(keys: Sequence[str]) -> np.ndarray:
+    """Hash estable de 64 bits por clave (ruta relativa)."""
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+            for key in keys
+        ),
+        dtype=np.uint64, count=len(keys)
+    )
+
+
+def split_buckets(keys: Sequence[str]) -> np.ndarray:
+    """Valor estable en [0, 1) por clave (hash de 64 bits de la ruta)."""
+    return split_hashes(keys) / float(2 ** 64)
+
+
+def _class_minimums(num_samples: int) -> List[int]:
+    """Splits que una clase debe tener según su tamaño, en orden de prioridad."""
+    required = [SPLIT_NAMES.index('train')]
+    if num_samples >= 2:
+        required.append(SPLIT_NAMES.index('test'))
+    if num_samples >= 3:
+        required.append(SPLIT_NAMES.index('val'))
+    return required
+
+
+def assign_splits(
+    keys: Sequence[str],
+    labels: np.ndarray,
+    split_ratios: Dict,
+    previous: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Split por hash de la ruta, estratificado en esperanza por clase.
+    
+    Cada muestra nueva va a train/val/test según en qué tramo de [0, 1) cae
+    el hash de su clave; las que aparecen en `previous` conservan su split.
+    Si a una clase le falta train (o test con 2+ muestras, o val con 3+), se
+    mueve una de sus muestras nuevas, la de menor hash entre las que no dejan
+    sin mínimo a su split. Las muestras de `previous` nunca se mueven.
+    
+    Args:
+        keys: Clave estable por muestra (ruta relativa a la raíz del dataset)
+        labels: Etiqueta por muestra
+        split_ratios: Proporciones train/val/test
+        previous: (hashes de clave, splits) de una asignación guardada
+    
+    Returns:
+        Array int8 con el código de split de cada muestra
+    """
+    hashes = split_hashes(keys)
+    if previous is not None and np.array_equal(previous[0], hashes):
+        # Mismas claves en el mismo orden: el split guardado vale tal cual
+        return np.asarray(previous[1], dtype=np.int8).copy()
+    buckets = hashes / float(2 ** 64)
+    train_end = split_ratios['train']
+    val_end = train_end + split_ratios['val']
+    
+    splits = np.full(len(keys), SPLIT_NAMES.index('test'), dtype=np.int8)
+    splits[buckets < val_end] = SPLIT_NAMES.index('val')
+    splits[buckets < train_end] = SPLIT_NAMES.index('train')
+    
+    is_new = np.ones(len(keys), dtype=bool)
+    if previous is not None and len(previous[0]) and len(keys):
+        previous_hashes, previous_splits = previous
+        order = np.argsort(previous_hashes)
+        sorted_hashes = previous_hashes[order]
+        pos = np.minimum(np.searchsorted(sorted_hashes, hashes), len(sorted_hashes) - 1)
+        known = sorted_hashes[pos] == hashes
+        splits[known] = previous_splits[order[pos[known]]]
+        is_new = ~known
+    
+    # Mínimos por clase, cubiertos solo con muestras nuevas
+    for class_idx in np.unique(labels):
+        class_rows = np.flatnonzero(labels == class_idx)
+        required = _class_minimums(len(class_rows))
+        for code in required:
+            counts = np.bincount(splits[class_rows], minlength=len(SPLIT_NAMES))
+            if counts[code]:
+                continue
+            donor_splits = splits[class_rows]
+            can_move = is_new[class_rows] & (
+                (counts[donor_splits] > 1) | ~np.isin(donor_splits, required)
+            )
+            if not np.any(can_move):
+                continue
+            donors = class_rows[can_move]
+            splits[donors[np.argmin(buckets[donors])]] = code
+    
+    return splits
+
+
+def load_split_assignment(splits_path: str) -> Optional[Dict]:
+    """
+    Lee un archivo de `save_splits`.
+    
+    Returns:
+        {'splits', 'split_ratios', 'key_hashes'} (key_hashes es None en
+        archivos anteriores que no lo guardaban) o None si no existe
+    """
+    if splits_path is None or not Path(splits_path).exists():
+        return None
+    with np.load(splits_path, allow_pickle=False) as data:
+        return {
+            'splits': data['splits'],
+            'split_ratios': dict(zip(SPLIT_NAMES, data['split_ratios'].tolist())),
+            'key_hashes': data['key_hashes'] if 'key_hashes' in data.files else None
+        }
+
+
+class SampleIndex:
+    """Índice columnar de muestras (ruta, etiqueta, tipo de medio) + split."""
+    
+    def __init__(
+        self,
+        path_blob: np.ndarray,
+        offsets: np.ndarray,
+        labels: np.ndarray,
+        media: np.ndarray,
+        root: str = '',
+        splits: Optional[np.ndarray] = None,
+        split_ratios: Optional[Dict] = None,
+        metadata: Optional[Dict[str, np.ndarray]] = None,
+        previous_splits: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ):
+        self.path_blob = path_blob
+        self.offsets = offsets
+        self.labels = labels
+        self.media = media
+        self.root = root
+        self.metadata = dict(metadata or {})
+        self.split_ratios = dict(split_ratios or DEFAULT_SPLIT_RATIOS)
+        if splits is None:
+            splits = self.compute_splits(self.split_ratios, previous_splits)
+        self.splits = splits
+    
+    @classmethod
+    def build(
+        cls,
+        samples: Sequence[Tuple[str, int]],
+        root: str = '',
+        split_ratios: Optional[Dict] = None,
+        media_info: Optional[Sequence[Tuple]] = None,
+        previous_splits: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> 'SampleIndex':
+        """
+        Construye el índice a partir de pares (ruta, etiqueta).
+        
+        Args:
+            samples: Lista de (ruta absoluta, índice de clase)
+            root: Raíz del dataset (las claves del split son relativas a ella)
+            split_ratios: Proporciones train/val/test
+            media_info: (width, height, frames, fps) por muestra, de la
+                inspección de cabeceras
+            previous_splits: (hashes de clave, splits) de un split guardado;
+                las muestras que ya estaban conservan su split
+        """
+        encoded = [path.encode('utf-8') for path, _ in samples]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        path_blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        
+        labels = np.fromiter((label for _, label in samples), dtype=np.int32, count=len(samples))
+        media = np.fromiter(
+            (MEDIA_VIDEO if os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS else MEDIA_IMAGE
+             for path, _ in samples),
+            dtype=np.int8, count=len(samples)
+        )
+        
+        metadata = None
+        if media_info is not None:
+            info = np.asarray(media_info, dtype=np.float64).reshape(-1, 4)
+            metadata = {
+                'width': info[:, 0].astype(np.int32),
+                'height': info[:, 1].astype(np.int32),
+                'frames': info[:, 2].astype(np.int32),
+                'fps': info[:, 3].astype(np.float32)
+            }
+        
+        return cls(
+            path_blob, offsets, labels, media,
+            root=str(root), split_ratios=split_ratios, metadata=metadata,
+            previous_splits=previous_splits
+        )
+    
+    @classmethod
+    def from_loader_config(
+        cls,
+        data_config: Dict,
+        split_ratios: Optional[Dict] = None
+    ) -> 'SampleIndex':
+        """Índice en memoria desde una configuración con listas `files` (formato antiguo)."""
+        samples = []
+        for class_data in data_config['data_paths']:
+            class_path = class_data['path']
+            for file_name in class_data.get('files', []):
+                samples.append((os.path.join(class_path, file_name), class_data['class_idx']))
+        return cls.build(samples, data_config.get('dataset_path', ''), split_ratios)
+    
+    @classmethod
+    def load(cls, index_path: str, splits_path: Optional[str] = None) -> 'SampleIndex':
+        """
+        Carga un índice guardado con `save`.
+        
+        Si `splits_path` existe, sus muestras conservan el split guardado
+        (emparejadas por hash de clave, no por posición) y solo las nuevas se
+        asignan. Un split de antes de los hashes de clave solo se escribía
+        junto a su índice: se usa tal cual si tiene su longitud y, si no, se
+        recalcula.
+        """
+        with np.load(index_path, allow_pickle=False) as data:
+            index_data = {key: data[key] for key in data.files}
+        
+        splits = split_ratios = previous_splits = None
+        saved = load_split_assignment(splits_path)
+        if saved is not None:
+            split_ratios = saved['split_ratios']
+            if saved['key_hashes'] is not None:
+                previous_splits = (saved['key_hashes'], saved['splits'])
+            elif len(saved['splits']) == len(index_data['labels']):
+                splits = saved['splits']
+        
+        return cls(
+            path_blob=index_data['path_blob'],
+            offsets=index_data['offsets'],
+            labels=index_data['labels'],
+            media=index_data['media'],
+            root=str(index_data['root']),
+            splits=splits,
+            split_ratios=split_ratios,
+            metadata={
+                key[len('meta_'):]: value
+                for key, value in index_data.items() if key.startswith('meta_')
+            },
+            previous_splits=previous_splits
+        )
+    
+    def save(self, index_path: str):
+        """Guarda el índice como .npz sin comprimir (carga más rápida)."""
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            index_path,
+            path_blob=self.path_blob,
+            offsets=self.offsets,
+            labels=self.labels,
+            media=self.media,
+            root=np.array(self.root),
+            **{f'meta_{key}': value for key, value in self.metadata.items()}
+        )
+    
+    def save_splits(self, splits_path: str):
+        """Guarda la asignación de splits (y el hash de cada clave) junto al índice."""
+        splits_path = Path(splits_path)
+        splits_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            splits_path,
+            splits=self.splits,
+            key_hashes=split_hashes(self.split_keys()),
+            split_ratios=np.array([self.split_ratios[name] for name in SPLIT_NAMES])
+        )
+    
+    def __len__(self) -> int:
+        return len(self.labels)
+    
+    def path(self, row: int) -> str:
+        """Ruta de la muestra `row`."""
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return self.path_blob[start:end].tobytes().decode('utf-8')
+    
+    def split_keys(self) -> List[str]:
+        """Clave de split de cada muestra: ruta relativa a la raíz."""
+        paths = (self.path(row) for row in range(len(self)))
+        if not self.root:
+            return list(paths)
+        return [os.path.relpath(path, self.root) for path in paths]
+    
+    def compute_splits(
+        self,
+        split_ratios: Dict,
+        previous_splits: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> np.ndarray:
+        """Calcula el split de todas las muestras para las proporciones dadas."""
+        return assign_splits(self.split_keys(), self.labels, split_ratios, previous_splits)
+    
+    def with_split_ratios(self, split_ratios: Dict) -> 'SampleIndex':
+        """Mismo índice con el split recalculado desde cero para otras proporciones."""
+        if dict(split_ratios) == self.split_ratios:
+            return self
+        return SampleIndex(
+            self.path_blob, self.offsets, self.labels, self.media,
+            root=self.root, split_ratios=split_ratios, metadata=self.metadata
+        )
+    
+    def take(self, rows: np.ndarray) -> 'SampleIndex':
+        """Nuevo índice solo con las filas dadas (conserva su split)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if len(rows):
+            path_blob = np.concatenate([
+                self.path_blob[start:start + length] for start, length in zip(starts, lengths)
+            ])
+        else:
+            path_blob = np.zeros(0, dtype=np.uint8)
+        
+        return SampleIndex(
+            path_blob, offsets, self.labels[rows], self.media[rows],
+            root=self.root, splits=self.splits[rows], split_ratios=self.split_ratios,
+            metadata={key: value[rows] for key, value in self.metadata.items()}
+        )
+    
+    def subset(self, split: str, media: Optional[int] = None) -> 'IndexedSamples':
+        """Muestras de un split (y opcionalmente de un tipo de medio)."""
+        mask = self.splits == SPLIT_NAMES.index(split)
+        if media is not None:
+            mask &= self.media == media
+        return IndexedSamples(self, np.flatnonzero(mask))
+
+
+class IndexedSamples:
+    """Vista de un subconjunto del índice: `samples[i]` -> (ruta, etiqueta)."""
+    
+    def __init__(self, index: SampleIndex, rows: np.ndarray):
+        self.index = index
+        self.rows = rows
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def __getitem__(self, i: int) -> Tuple[str, int]:
+        row = self.rows[i]
+        return self.index.path(row), int(self.index.labels[row])
+    
+    def __iter__(self):
+        for i in range(len(self.rows)):
+            yield self[i]
+    
+    def labels(self) -> np.ndarray:
+        """Etiquetas del subconjunto (sin decodificar rutas)."""
+        return self.index.labels[self.rows]
+    
+    def metadata(self, key: str) -> Optional[np.ndarray]:
+        """Columna de metadatos del subconjunto (None si el índice no la tiene)."""
+        column = self.index.metadata.get(key)
+        return None if column is None else column[self.rows]
+
+
+def load_sample_index(
+    data_config: Dict,
+    config_path: Optional[str] = None,
+    split_ratios: Optional[Dict] = None
+) -> SampleIndex:
+    """
+    Índice de muestras de una configuración de data loaders.
+    
+    Usa los archivos `sample_index` y `sample_splits` (relativos al YAML,
+    por eso se necesita `config_path` si no son absolutos) si existen; si la
+    configuración es del formato antiguo con listas `files`, construye el
+    índice en memoria.
+    """
+    def resolve(file_name: str) -> str:
+        path = Path(file_name)
+        if not path.is_absolute():
+            if config_path is None:
+                raise ValueError(
+                    f"'{file_name}' es relativo al YAML de data loaders: "
+                    f"indica config_path"
+                )
+            path = Path(config_path).parent / path
+        return str(path)
+    
+    index_file = data_config.get('sample_index')
+    if index_file:
+        splits_file = data_config.get('sample_splits')
+        index = SampleIndex.load(
+            resolve(index_file), resolve(splits_file) if splits_file else None
+        )
+    else:
+        index = SampleIndex.from_loader_config(data_config, split_ratios)
+    
+    if split_ratios is not None:
+        index = index.with_split_ratios(split_ratios)
+    return index
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:27                                           *
+#  Last Updated : 2026-10-19 02:50                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -33,11 +33,25 @@ from torch.utils.data import Dataset, DataLoader
 from torchvision import transforms
 from PIL import Image
 import cv2
+import time
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import yaml
-import random
+
+from .video_batching import LengthBucketBatchSampler, collate_variable_length
+from .landmark_cache import LandmarkCache
+from .load_stats import LoadStats
+from .sample_index import MEDIA_IMAGE, MEDIA_VIDEO, SampleIndex, load_sample_index
+from ..augmentation import LandmarkConsistentAugment
+from .landmark_detector import (
+    LandmarkClient,
+    LandmarkServer,
+    extract_hand_landmarks,
+    get_hands_detector,
+    landmark_worker_init_fn,
+    mediapipe_available
+)
 
 
 class UniversalImageDataset(Dataset):
@@ -49,7 +63,12 @@ class UniversalImageDataset(Dataset):
         split: str = 'train',
         transform: Optional[transforms.Compose] = None,
         extract_landmarks: bool = True,
-        split_ratios: Dict = None
+        split_ratios: Dict = None,
+        landmark_client: Optional[LandmarkClient] = None,
+        geometric_transform: Optional[Callable] = None,
+        landmark_cache: Optional[LandmarkCache] = None,
+        sample_index: Optional[SampleIndex] = None,
+        config_path: Optional[str] = None
     ):
         """
         Args:
@@ -58,105 +77,45 @@ class UniversalImageDataset(Dataset):
             transform: Transformaciones de imagen
             extract_landmarks: Si extraer landmarks con MediaPipe
             split_ratios: Proporciones de split (train/val/test)
+            landmark_client: Cliente de `LandmarkServer`; si se define, los
+                landmarks se piden por lotes al servidor en vez de usar un
+                detector local
+            geometric_transform: Transformación (imagen, landmarks) ->
+                (imagen, landmarks), p. ej. `LandmarkConsistentAugment`. Se
+                aplica antes de `transform`, con landmarks de la imagen original
+            landmark_cache: Caché en disco de landmarks por imagen
+            sample_index: Índice de muestras ya cargado (compartido entre
+                splits); si es None se obtiene de `data_config`
+            config_path: Ruta del YAML de `data_config`; sus archivos
+                `sample_index`/`sample_splits` son relativos a él
         """
         self.data_config = data_config
         self.split = split
         self.transform = transform
+        self.geometric_transform = geometric_transform
         self.extract_landmarks = extract_landmarks
+        self.landmark_client = landmark_client if extract_landmarks else None
+        self.landmark_cache = landmark_cache if extract_landmarks else None
         
-        if split_ratios is None:
-            split_ratios = {'train': 0.7, 'val': 0.15, 'test': 0.15}
+        # El detector MediaPipe no se crea aquí: es uno por proceso y se
+        # inicializa de forma perezosa (ver landmark_detector.py)
+        if extract_landmarks and landmark_client is None and not mediapipe_available():
+            print("⚠️ MediaPipe no instalado. Landmarks desactivados.")
+            self.extract_landmarks = False
         
-        # Cargar MediaPipe si es necesario
-        self.hands = None
-        if extract_landmarks:
-            try:
-                import mediapipe as mp
-                # CAMBIO: Manejo compatible con diferentes versiones de MediaPipe
-                if hasattr(mp, 'solutions'):
-                    # MediaPipe versión antigua (< 0.10.8)
-                    self.mp_hands = mp.solutions.hands
-                    self.hands = self.mp_hands.Hands(
-                        static_image_mode=True,
-                        max_num_hands=2,
-                        min_detection_confidence=0.5
-                    )
-                else:
-                    # MediaPipe versión nueva (>= 0.10.8)
-                    from mediapipe.python.solutions import hands as mp_hands
-                    self.mp_hands = mp_hands
-                    self.hands = mp_hands.Hands(
-                        static_image_mode=True,
-                        max_num_hands=2,
-                        min_detection_confidence=0.5
-                    )
-                print("✅ MediaPipe Hands inicializado correctamente")
-            except ImportError:
-                print("⚠️ MediaPipe no instalado. Landmarks desactivados.")
-                self.extract_landmarks = False
-            except AttributeError as e:
-                print(f"⚠️ Error de compatibilidad con MediaPipe: {e}")
-                print("⚠️ Intentando sin MediaPipe...")
-                self.extract_landmarks = False
-        
-        # Construir lista de samples con split
-        self.samples = self._build_samples_with_split(split_ratios)
+        # Muestras del split (vista sobre el índice, sin stat por archivo)
+        if sample_index is None:
+            sample_index = load_sample_index(data_config, config_path, split_ratios)
+        elif split_ratios is not None:
+            sample_index = sample_index.with_split_ratios(split_ratios)
+        self.samples = sample_index.subset(split, media=MEDIA_IMAGE)
         self.class_to_idx = data_config['class_to_idx']
         
+        # Tiempos de carga sumados por todos los workers (memoria compartida)
+        self.load_stats = LoadStats()
+        
         print(f"{split.capitalize()}: {len(self.samples)} muestras")
     
-    def _build_samples_with_split(self, split_ratios: Dict) -> List[Tuple[str, int]]:
-        """Construye lista de samples con split estratificado por clase."""
-        all_samples_by_class = {}
-        
-        # Agrupar por clase
-        for class_data in self.data_config['data_paths']:
-            class_path = Path(class_data['path'])
-            class_idx = class_data['class_idx']
-            
-            samples = []
-            for file_name in class_data['files']:
-                file_path = class_path / file_name
-                if file_path.exists():
-                    samples.append((str(file_path), class_idx))
-            
-            if samples:
-                all_samples_by_class[class_idx] = samples
-        
-        # Split estratificado por clase
-        split_samples = []
-        for class_idx, class_samples in all_samples_by_class.items():
-            # Shuffle con seed fijo para reproducibilidad
-            random.seed(42)
-            random.shuffle(class_samples)
-            
-            n_samples = len(class_samples)
-            n_train = int(n_samples * split_ratios['train'])
-            n_val = int(n_samples * split_ratios['val'])
-            
-            # Asegurar al menos 1 muestra por split si es posible
-            if n_samples >= 3:
-                n_train = max(1, n_train)
-                n_val = max(1, n_val)
-            elif n_samples == 2:
-                n_train = 1
-                n_val = 0
-            else:  # n_samples == 1
-                n_train = 1
-                n_val = 0
-            
-            # Asignar samples al split correspondiente
-            if self.split == 'train':
-                split_samples.extend(class_samples[:n_train])
-            elif self.split == 'val':
-                split_samples.extend(class_samples[n_train:n_train + n_val])
-            else:  # test
-                split_samples.extend(class_samples[n_train + n_val:])
-        
-        # Shuffle final
-        random.shuffle(split_samples)
-        return split_samples
-    
     def __len__(self) -> int:
         return len(self.samples)
     
@@ -167,83 +126,149 @@ class UniversalImageDataset(Dataset):
         Returns:
             Dict con 'image', 'landmarks', 'label', 'class_name', 'path'
         """
-        img_path, label = self.samples[idx]
+        return self.__getitems__([idx])[0]
+    
+    def __getitems__(self, indices: List[int]) -> List[Dict]:
+        """
+        Carga un batch completo de samples.
         
-        try:
-            # Cargar imagen
-            image = Image.open(img_path).convert('RGB')
-            
-            # Extraer landmarks si está habilitado
-            landmarks = None
-            if self.extract_landmarks and self.hands is not None:
-                landmarks = self._extract_landmarks(image)
-            
-            # Si no se extrajeron landmarks, usar ceros
-            if landmarks is None:
-                landmarks = np.zeros(126, dtype=np.float32)
-            
-            # Aplicar transformaciones
-            if self.transform:
-                image = self.transform(image)
-            
-            # Obtener nombre de clase
+        El DataLoader lo usa en lugar de __getitem__ cuando existe, lo que
+        permite extraer los landmarks de todo el batch en una sola llamada
+        (una sola ida y vuelta al servidor de landmarks).
+        """
+        images = {}
+        errors = {}
+        
+        # Cargar imágenes
+        start = time.perf_counter()
+        for idx in indices:
+            img_path, _ = self.samples[idx]
+            try:
+                images[idx] = Image.open(img_path).convert('RGB')
+            except Exception as e:
+                errors[idx] = e
+        
+        decode_time = time.perf_counter() - start
+        
+        # Extraer landmarks del batch (siempre sobre la imagen original)
+        start = time.perf_counter()
+        landmarks_by_idx = {}
+        if self.extract_landmarks and images:
+            landmarks_by_idx = self._get_landmarks(images)
+        landmark_time = time.perf_counter() - start
+        landmark_hits = sum(1 for landmarks in landmarks_by_idx.values() if landmarks.any())
+        
+        start = time.perf_counter()
+        samples = []
+        for idx in indices:
+            img_path, label = self.samples[idx]
             class_name = self.data_config['class_names'][label]
             
-            return {
-                'image': image,
-                'landmarks': torch.from_numpy(landmarks),
-                'label': label,
-                'class_name': class_name,
-                'path': img_path
-            }
+            try:
+                if idx in errors:
+                    raise errors[idx]
+                
+                # Si no se extrajeron landmarks, usar ceros
+                landmarks = landmarks_by_idx.get(idx)
+                if landmarks is None:
+                    landmarks = np.zeros(126, dtype=np.float32)
+                
+                # Aplicar transformaciones (las geométricas también a landmarks)
+                image = images[idx]
+                if self.geometric_transform is not None:
+                    image, landmarks = self.geometric_transform(image, landmarks)
+                if self.transform:
+                    image = self.transform(image)
+                
+                samples.append({
+                    'image': image,
+                    'landmarks': torch.from_numpy(landmarks),
+                    'label': label,
+                    'class_name': class_name,
+                    'path': img_path
+                })
+            
+            except Exception as e:
+                print(f"Error cargando {img_path}: {e}")
+                # Retornar sample dummy en caso de error (mismo dtype que el
+                # transform para que el collate no falle con batches uint8)
+                samples.append({
+                    'image': torch.zeros(3, 224, 224, dtype=self._image_dtype()),
+                    'landmarks': torch.zeros(126),
+                    'label': label,
+                    'class_name': class_name,
+                    'path': img_path
+                })
         
-        except Exception as e:
-            print(f"Error cargando {img_path}: {e}")
-            # Retornar sample dummy en caso de error
-            dummy_image = torch.zeros(3, 224, 224)
-            dummy_landmarks = torch.zeros(126)
-            return {
-                'image': dummy_image,
-                'landmarks': dummy_landmarks,
-                'label': label,
-                'class_name': self.data_config['class_names'][label],
-                'path': img_path
-            }
+        self.load_stats.add(
+            decode=decode_time,
+            landmarks=landmark_time,
+            transform=time.perf_counter() - start,
+            samples=len(indices),
+            landmark_images=len(landmarks_by_idx),
+            landmark_hits=landmark_hits
+        )
+        return samples
+    
+    def _image_dtype(self) -> torch.dtype:
+        """dtype de las imágenes que produce el transform."""
+        if self.transform is not None and any(
+            isinstance(t, transforms.PILToTensor)
+            for t in getattr(self.transform, 'transforms', [])
+        ):
+            return torch.uint8
+        return torch.float32
+    
+    def _get_landmarks(self, images: Dict[int, Image.Image]) -> Dict[int, np.ndarray]:
+        """Landmarks por índice: primero la caché, luego el detector para el resto."""
+        landmarks_by_idx = {}
+        missing = []
+        
+        for idx in images:
+            cached = None
+            if self.landmark_cache is not None:
+                cached = self.landmark_cache.get(self.samples[idx][0])
+            if cached is not None:
+                landmarks_by_idx[idx] = cached
+            else:
+                missing.append(idx)
+        
+        if missing:
+            extracted = self._extract_landmarks_batch([images[i] for i in missing])
+            for idx, landmarks in zip(missing, extracted):
+                landmarks_by_idx[idx] = landmarks
+                if self.landmark_cache is not None:
+                    self.landmark_cache.put(self.samples[idx][0], landmarks)
+        
+        return landmarks_by_idx
     
     def _extract_landmarks(self, image: Image.Image) -> Optional[np.ndarray]:
         """Extrae landmarks de la imagen usando MediaPipe."""
-        try:
-            # Convertir PIL a numpy
-            img_np = np.array(image)
-            
-            # Procesar con MediaPipe
-            results = self.hands.process(img_np)
-            
-            if results.multi_hand_landmarks:
-                # Extraer landmarks de todas las manos detectadas
-                all_landmarks = []
-                for hand_landmarks in results.multi_hand_landmarks:
-                    landmarks = []
-                    for landmark in hand_landmarks.landmark:
-                        landmarks.extend([landmark.x, landmark.y, landmark.z])
-                    all_landmarks.extend(landmarks)
-                
-                # Padding si solo hay una mano (63 valores)
-                if len(all_landmarks) == 63:
-                    all_landmarks.extend([0.0] * 63)  # Agregar mano vacía
-                
-                return np.array(all_landmarks[:126], dtype=np.float32)
-            else:
-                # No se detectaron manos
-                return np.zeros(126, dtype=np.float32)
+        return self._extract_landmarks_batch([image])[0]
+    
+    def _extract_landmarks_batch(self, images: List[Image.Image]) -> List[np.ndarray]:
+        """Extrae landmarks de varias imágenes (servidor remoto o detector local)."""
+        arrays = [np.array(image) for image in images]
         
-        except Exception as e:
-            # Error al procesar
-            return np.zeros(126, dtype=np.float32)
+        if self.landmark_client is not None:
+            return self.landmark_client.extract_batch(arrays)
+        
+        hands = get_hands_detector()
+        if hands is None:
+            return [np.zeros(126, dtype=np.float32) for _ in arrays]
+        return [extract_hand_landmarks(hands, img_np) for img_np in arrays]
 
 
 class UniversalVideoDataset(Dataset):
-    """Dataset universal para videos/secuencias."""
+    """
+    Dataset universal para videos/secuencias.
+    
+    Modos de muestreo temporal:
+        - Fijo (por defecto): exactamente `num_frames` frames uniformes por clip.
+        - Variable (`target_fps`): frames muestreados a un FPS objetivo, por lo
+          que cada clip conserva su duración real (hasta `max_frames`). Usar con
+          `LengthBucketBatchSampler` y `collate_variable_length`.
+    """
     
     def __init__(
         self,
@@ -251,69 +276,44 @@ class UniversalVideoDataset(Dataset):
         split: str = 'train',
         num_frames: int = 30,
         transform: Optional[transforms.Compose] = None,
-        split_ratios: Dict = None
+        split_ratios: Dict = None,
+        target_fps: Optional[float] = None,
+        max_frames: int = 90,
+        sample_index: Optional[SampleIndex] = None,
+        config_path: Optional[str] = None
     ):
+        """
+        Args:
+            data_config: Configuración del dataset
+            split: 'train', 'val' o 'test'
+            num_frames: Frames por clip en modo fijo
+            transform: Transformaciones por frame
+            split_ratios: Proporciones de split (train/val/test)
+            target_fps: FPS objetivo; si se define activa el modo variable
+            max_frames: Longitud máxima de un clip en modo variable
+            sample_index: Índice de muestras ya cargado (compartido entre
+                splits); si es None se obtiene de `data_config`
+            config_path: Ruta del YAML de `data_config`; sus archivos
+                `sample_index`/`sample_splits` son relativos a él
+        """
         self.data_config = data_config
         self.split = split
         self.num_frames = num_frames
         self.transform = transform
+        self.target_fps = target_fps
+        self.max_frames = max_frames
+        self.variable_length = target_fps is not None
         
-        if split_ratios is None:
-            split_ratios = {'train': 0.7, 'val': 0.15, 'test': 0.15}
-        
-        self.samples = self._build_samples_with_split(split_ratios)
+        if sample_index is None:
+            sample_index = load_sample_index(data_config, config_path, split_ratios)
+        elif split_ratios is not None:
+            sample_index = sample_index.with_split_ratios(split_ratios)
+        self.samples = sample_index.subset(split, media=MEDIA_VIDEO)
         self.class_to_idx = data_config['class_to_idx']
+        self._clip_lengths = None
         
         print(f"{split.capitalize()}: {len(self.samples)} videos")
     
-    def _build_samples_with_split(self, split_ratios: Dict) -> List[Tuple[str, int]]:
-        """Construye lista de samples con split estratificado."""
-        all_samples_by_class = {}
-        
-        for class_data in self.data_config['data_paths']:
-            class_path = Path(class_data['path'])
-            class_idx = class_data['class_idx']
-            
-            samples = []
-            for file_name in class_data['files']:
-                file_path = class_path / file_name
-                ext = file_path.suffix.lower()
-                if file_path.exists() and ext in ['.mp4', '.avi', '.mov', '.mkv']:
-                    samples.append((str(file_path), class_idx))
-            
-            if samples:
-                all_samples_by_class[class_idx] = samples
-        
-        # Split estratificado
-        split_samples = []
-        for class_idx, class_samples in all_samples_by_class.items():
-            random.seed(42)
-            random.shuffle(class_samples)
-            
-            n_samples = len(class_samples)
-            n_train = int(n_samples * split_ratios['train'])
-            n_val = int(n_samples * split_ratios['val'])
-            
-            if n_samples >= 3:
-                n_train = max(1, n_train)
-                n_val = max(1, n_val)
-            elif n_samples == 2:
-                n_train = 1
-                n_val = 0
-            else:
-                n_train = 1
-                n_val = 0
-            
-            if self.split == 'train':
-                split_samples.extend(class_samples[:n_train])
-            elif self.split == 'val':
-                split_samples.extend(class_samples[n_train:n_train + n_val])
-            else:
-                split_samples.extend(class_samples[n_train + n_val:])
-        
-        random.shuffle(split_samples)
-        return split_samples
-    
     def __len__(self) -> int:
         return len(self.samples)
     
@@ -322,7 +322,10 @@ class UniversalVideoDataset(Dataset):
         
         try:
             # Cargar video
-            frames = self._load_video(video_path)
+            if self.variable_length:
+                frames = self._load_video_at_fps(video_path)
+            else:
+                frames = self._load_video(video_path)
             
             # Aplicar transformaciones
             if self.transform:
@@ -339,6 +342,7 @@ class UniversalVideoDataset(Dataset):
             
             return {
                 'frames': frames,
+                'length': frames.shape[0],
                 'label': label,
                 'class_name': class_name,
                 'path': video_path
@@ -346,15 +350,99 @@ class UniversalVideoDataset(Dataset):
         
         except Exception as e:
             print(f"Error cargando video {video_path}: {e}")
-            # Retornar frames dummy
-            dummy_frames = torch.zeros(self.num_frames, 3, 224, 224)
+            # Retornar frames dummy (un solo frame en modo variable)
+            dummy_len = 1 if self.variable_length else self.num_frames
+            dummy_frames = torch.zeros(dummy_len, 3, 224, 224)
             return {
                 'frames': dummy_frames,
+                'length': dummy_len,
                 'label': label,
                 'class_name': self.data_config['class_names'][label],
                 'path': video_path
             }
     
+    def get_clip_lengths(self) -> List[int]:
+        """
+        Longitud (en frames) que tendrá cada clip tras el muestreo.
+        
+        Usa los metadatos del índice (inspección de cabeceras en el setup) o,
+        si no están, lee los del contenedor (sin decodificar frames). Se
+        calcula una vez. Lo usa `LengthBucketBatchSampler` para agrupar clips.
+        """
+        if self._clip_lengths is None:
+            frames_column = self.samples.metadata('frames')
+            fps_column = self.samples.metadata('fps')
+            
+            lengths = []
+            for i, (video_path, _) in enumerate(self.samples):
+                if not self.variable_length:
+                    lengths.append(self.num_frames)
+                    continue
+                if frames_column is not None and frames_column[i] > 0:
+                    total_frames, fps = int(frames_column[i]), float(fps_column[i])
+                else:
+                    cap = cv2.VideoCapture(video_path)
+                    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                    fps = cap.get(cv2.CAP_PROP_FPS)
+                    cap.release()
+                lengths.append(len(self._fps_indices(total_frames, fps)))
+            self._clip_lengths = lengths
+        return self._clip_lengths
+    
+    def _fps_indices(self, total_frames: int, fps: float) -> np.ndarray:
+        """Índices de frames a leer para muestrear a `target_fps`."""
+        if total_frames <= 0:
+            return np.zeros(1, dtype=int)
+        if not fps or fps <= 0:
+            fps = self.target_fps
+        
+        step = max(fps / self.target_fps, 1.0)
+        indices = np.arange(0, total_frames, step).astype(int)
+        
+        # Clips muy largos: submuestrear uniformemente hasta max_frames
+        if len(indices) > self.max_frames:
+            keep = np.linspace(0, len(indices) - 1, self.max_frames, dtype=int)
+            indices = indices[keep]
+        
+        return indices
+    
+    def _load_video_at_fps(self, video_path: str) -> List[np.ndarray]:
+        """
+        Carga video muestreando a `target_fps` (longitud variable).
+        
+        Lee el video secuencialmente con grab()/retrieve(): los frames
+        descartados no se decodifican y se evitan los seeks por frame.
+        """
+        cap = cv2.VideoCapture(video_path)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        
+        if total_frames == 0:
+            cap.release()
+            return [np.zeros((224, 224, 3), dtype=np.uint8)]
+        
+        wanted = set(self._fps_indices(total_frames, fps).tolist())
+        last_wanted = max(wanted)
+        frames = []
+        
+        for frame_idx in range(last_wanted + 1):
+            if not cap.grab():
+                break
+            if frame_idx not in wanted:
+                continue
+            ret, frame = cap.retrieve()
+            if ret:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                frame = cv2.resize(frame, (224, 224))
+                frames.append(frame)
+        
+        cap.release()
+        
+        if not frames:
+            frames.append(np.zeros((224, 224, 3), dtype=np.uint8))
+        
+        return frames
+    
     def _load_video(self, video_path: str) -> List[np.ndarray]:
         """Carga video y samplea frames uniformemente."""
         cap = cv2.VideoCapture(video_path)
@@ -391,7 +479,16 @@ def create_data_loaders(
     config_path: str,
     batch_size: int = 32,
     num_workers: int = 4,
-    extract_landmarks: bool = True
+    extract_landmarks: bool = True,
+    video_target_fps: Optional[float] = None,
+    video_max_frames: int = 90,
+    landmark_server: bool = False,
+    landmark_client: Optional[LandmarkClient] = None,
+    prefetch_factor: int = 2,
+    persistent_workers: bool = False,
+    pin_memory: Optional[bool] = None,
+    batch_augmentation: bool = False,
+    landmark_cache_dir: Optional[str] = None
 ) -> Dict[str, DataLoader]:
     """
     Crea data loaders automáticamente desde la configuración.
@@ -401,6 +498,22 @@ def create_data_loaders(
         batch_size: Tamaño del batch
         num_workers: Número de workers
         extract_landmarks: Si extraer landmarks
+        video_target_fps: Si se define, los videos se muestrean a este FPS con
+            longitud variable y se agrupan por longitud en cada batch
+        video_max_frames: Longitud máxima de clip en modo variable
+        landmark_server: Si extraer landmarks en un proceso servidor único
+            (un solo detector para todos los workers y splits, por lotes);
+            se detiene con `close_data_loaders`
+        landmark_client: Cliente de un `LandmarkServer` ya iniciado; se usa en
+            lugar de lanzar uno nuevo (quien lo inició debe detenerlo)
+        prefetch_factor: Batches precargados por worker
+        persistent_workers: Si mantener los workers vivos entre épocas
+        pin_memory: Memoria fijada para copias a GPU (None = si hay CUDA)
+        batch_augmentation: Si los workers solo cargan y redimensionan las
+            imágenes (tensores uint8); la augmentación y normalización se
+            hacen por batch con `BatchAugmenter` en el trainer. Los videos
+            no cambian: sus frames siempre salen normalizados
+        landmark_cache_dir: Directorio de caché de landmarks (None = sin caché)
     
     Returns:
         Dict con data loaders: {'train': ..., 'val': ..., 'test': ...}
@@ -409,7 +522,7 @@ def create_data_loaders(
     with open(config_path, 'r', encoding='utf-8') as f:
         config = yaml.safe_load(f)
     
-    # Transformaciones
+    # Transformaciones (los videos siempre salen normalizados por frame)
     train_transform = transforms.Compose([
         transforms.Resize((224, 224)),
         transforms.RandomHorizontalFlip(p=0.5),
@@ -425,57 +538,153 @@ def create_data_loaders(
         transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
     ])
     
+    image_geometric_transform = None
+    if batch_augmentation:
+        # Imágenes: solo cargar y redimensionar; el resto se hace por batch
+        image_train_transform = transforms.Compose([
+            transforms.Resize((224, 224)),
+            transforms.PILToTensor()
+        ])
+        image_val_transform = image_train_transform
+    else:
+        # Imágenes: resize/flip/rotación se aplican junto con los landmarks
+        # (que se extraen de la imagen original y pueden venir de la caché)
+        image_geometric_transform = LandmarkConsistentAugment(
+            resize=(224, 224), horizontal_flip=0.5, rotation=15
+        )
+        image_train_transform = transforms.Compose([
+            transforms.ColorJitter(brightness=0.2, contrast=0.2),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+        ])
+        image_val_transform = val_transform
+    
+    # Índice de muestras: se carga una vez y lo comparten los tres splits
+    sample_index = load_sample_index(config, config_path)
+    
     # Crear datasets según el tipo
     dataset_type = config['dataset_type']
     
     print(f"\nCreando data loaders ({dataset_type})...")
     
+    server = None
     if dataset_type == 'image':
+        # Un solo servidor de landmarks para los tres splits
+        if not extract_landmarks:
+            landmark_client = None
+        elif landmark_client is None and landmark_server:
+            server = LandmarkServer().start()
+            landmark_client = server.client()
+        
+        landmark_cache = None
+        if extract_landmarks and landmark_cache_dir:
+            landmark_cache = LandmarkCache(landmark_cache_dir)
+        
         datasets = {
             'train': UniversalImageDataset(
                 config, split='train', 
-                transform=train_transform, 
-                extract_landmarks=extract_landmarks
+                transform=image_train_transform, 
+                extract_landmarks=extract_landmarks,
+                landmark_client=landmark_client,
+                geometric_transform=image_geometric_transform,
+                landmark_cache=landmark_cache,
+                sample_index=sample_index
             ),
             'val': UniversalImageDataset(
                 config, split='val', 
-                transform=val_transform, 
-                extract_landmarks=extract_landmarks
+                transform=image_val_transform, 
+                extract_landmarks=extract_landmarks,
+                landmark_client=landmark_client,
+                landmark_cache=landmark_cache,
+                sample_index=sample_index
             ),
             'test': UniversalImageDataset(
                 config, split='test', 
-                transform=val_transform, 
-                extract_landmarks=extract_landmarks
+                transform=image_val_transform, 
+                extract_landmarks=extract_landmarks,
+                landmark_client=landmark_client,
+                landmark_cache=landmark_cache,
+                sample_index=sample_index
             )
         }
     elif dataset_type == 'video':
+        video_kwargs = {
+            'target_fps': video_target_fps,
+            'max_frames': video_max_frames,
+            'sample_index': sample_index
+        }
         datasets = {
             'train': UniversalVideoDataset(
                 config, split='train', 
-                transform=train_transform
+                transform=train_transform,
+                **video_kwargs
             ),
             'val': UniversalVideoDataset(
                 config, split='val', 
-                transform=val_transform
+                transform=val_transform,
+                **video_kwargs
             ),
             'test': UniversalVideoDataset(
                 config, split='test', 
-                transform=val_transform
+                transform=val_transform,
+                **video_kwargs
             )
         }
     else:
         raise ValueError(f"Dataset type '{dataset_type}' no soportado")
     
+    # Opciones comunes de los DataLoader
+    if pin_memory is None:
+        pin_memory = torch.cuda.is_available()
+    
+    loader_kwargs = {
+        'num_workers': num_workers,
+        'pin_memory': pin_memory
+    }
+    if num_workers > 0:
+        # Solo válidas con workers (torch lanza ValueError con num_workers=0)
+        loader_kwargs['prefetch_factor'] = prefetch_factor
+        loader_kwargs['persistent_workers'] = persistent_workers
+    
     # Crear data loaders
     loaders = {}
     for split, dataset in datasets.items():
+        if getattr(dataset, 'variable_length', False):
+            # Clips de longitud variable: batches agrupados por longitud
+            loaders[split] = DataLoader(
+                dataset,
+                batch_sampler=LengthBucketBatchSampler(
+                    dataset.get_clip_lengths(),
+                    batch_size=batch_size,
+                    shuffle=(split == 'train'),
+                    drop_last=(split == 'train')
+                ),
+                collate_fn=collate_variable_length,
+                **loader_kwargs
+            )
+            continue
+        
         loaders[split] = DataLoader(
             dataset,
             batch_size=batch_size,
             shuffle=(split == 'train'),
-            num_workers=num_workers,
-            pin_memory=torch.cuda.is_available(),
-            drop_last=(split == 'train')  # Drop last batch in training
+            drop_last=(split == 'train'),  # Drop last batch in training
+            # Detector MediaPipe propio de cada worker (nunca heredado del padre)
+            worker_init_fn=landmark_worker_init_fn if num_workers > 0 else None,
+            **loader_kwargs
         )
     
-    return loaders
\ No newline at end of file
+    # El servidor propio vive lo que los loaders: `close_data_loaders` lo detiene
+    for loader in loaders.values():
+        loader.landmark_server = server
+    
+    return loaders
+
+
+def close_data_loaders(loaders: Dict[str, DataLoader]):
+    """Detiene el servidor de landmarks que `create_data_loaders` haya iniciado."""
+    for loader in loaders.values():
+        server = getattr(loader, 'landmark_server', None)
+        if server is not None:
+            # stop() es idempotente: los tres splits comparten el servidor
+            server.stop()
\ No newline at end of file
@@ -0,0 +1,176 @@
+# ======================================================                     *
+#  Project      : loaders                                                    *
+#  File         : video_batching.py                                          *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:06                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Batching de clips de longitud variable.
+
+Agrupa clips de longitud similar en el mismo batch (menos padding) y
+los colapsa en tensores con padding + máscara, o en PackedSequence para
+modelos temporales (LSTM/GRU).
+"""
+
+import torch
+from torch.nn.utils.rnn import pack_padded_sequence, PackedSequence
+from torch.utils.data import Sampler
+import numpy as np
+from typing import Dict, Iterator, List
+
+
+class LengthBucketBatchSampler(Sampler):
+    """
+    Batch sampler que agrupa clips por longitud.
+    
+    Cada época los índices se barajan, se dividen en "pools" de
+    `batch_size * pool_factor` muestras, cada pool se ordena por longitud
+    y se parte en batches. El orden de los batches también se baraja, así
+    se conserva la aleatoriedad sin mezclar clips cortos con largos.
+    """
+    
+    def __init__(
+        self,
+        lengths: List[int],
+        batch_size: int,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        pool_factor: int = 50,
+        seed: int = 42
+    ):
+        """
+        Args:
+            lengths: Longitud (frames) de cada muestra del dataset
+            batch_size: Tamaño del batch
+            shuffle: Si barajar pools y batches en cada época
+            drop_last: Si descartar el último batch incompleto de cada pool
+            pool_factor: Batches por pool de ordenamiento
+            seed: Semilla base (se combina con la época)
+        """
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.pool_size = batch_size * pool_factor
+        self.seed = seed
+        self.epoch = 0
+    
+    def set_epoch(self, epoch: int):
+        """Fija la época (cambia el orden aleatorio de forma reproducible)."""
+        self.epoch = epoch
+    
+    def _batches(self) -> List[List[int]]:
+        rng = np.random.default_rng(self.seed + self.epoch)
+        
+        if self.shuffle:
+            indices = rng.permutation(len(self.lengths))
+        else:
+            indices = np.arange(len(self.lengths))
+        
+        batches = []
+        for start in range(0, len(indices), self.pool_size):
+            pool = indices[start:start + self.pool_size]
+            # Orden estable: empates conservan el orden (aleatorio) del pool
+            pool = pool[np.argsort(self.lengths[pool], kind='stable')]
+            
+            for b in range(0, len(pool), self.batch_size):
+                batch = pool[b:b + self.batch_size]
+                if len(batch) < self.batch_size and self.drop_last:
+                    continue
+                batches.append(batch.tolist())
+        
+        if self.shuffle:
+            order = rng.permutation(len(batches))
+            batches = [batches[i] for i in order]
+        
+        return batches
+    
+    def __iter__(self) -> Iterator[List[int]]:
+        batches = self._batches()
+        self.epoch += 1
+        return iter(batches)
+    
+    def __len__(self) -> int:
+        num_batches = 0
+        for start in range(0, len(self.lengths), self.pool_size):
+            pool_len = min(self.pool_size, len(self.lengths) - start)
+            if self.drop_last:
+                num_batches += pool_len // self.batch_size
+            else:
+                num_batches += -(-pool_len // self.batch_size)
+        return num_batches
+    
+    def padding_ratio(self) -> float:
+        """Fracción de frames de padding que generaría una época (diagnóstico)."""
+        total = padded = 0
+        for batch in self._batches():
+            batch_lengths = self.lengths[batch]
+            total += batch_lengths.sum()
+            padded += batch_lengths.max() * len(batch)
+        return float(1 - total / padded) if padded else 0.0
+
+
+def collate_variable_length(batch: List[Dict]) -> Dict:
+    """
+    Collate para clips de longitud variable.
+    
+    Returns:
+        Dict con:
+            - 'frames': Tensor [B, T_max, C, H, W] con padding de ceros
+            - 'mask': Tensor bool [B, T_max] (True = frame real)
+            - 'lengths': Tensor long [B]
+            - 'label', 'class_name', 'path'
+    """
+    lengths = torch.tensor([sample['frames'].shape[0] for sample in batch], dtype=torch.long)
+    max_len = int(lengths.max())
+    
+    first = batch[0]['frames']
+    frames = first.new_zeros((len(batch), max_len) + tuple(first.shape[1:]))
+    for i, sample in enumerate(batch):
+        frames[i, :sample['frames'].shape[0]] = sample['frames']
+    
+    mask = torch.arange(max_len).unsqueeze(0) < lengths.unsqueeze(1)
+    
+    return {
+        'frames': frames,
+        'mask': mask,
+        'lengths': lengths,
+        'label': torch.tensor([sample['label'] for sample in batch], dtype=torch.long),
+        'class_name': [sample['class_name'] for sample in batch],
+        'path': [sample['path'] for sample in batch]
+    }
+
+
+def pack_frame_features(features: torch.Tensor, lengths: torch.Tensor) -> PackedSequence:
+    """
+    Empaqueta features por frame para un modelo temporal.
+    
+    Args:
+        features: Tensor [B, T_max, D] (p. ej. salida del backbone por frame)
+        lengths: Tensor [B] con la longitud real de cada clip
+    
+    Returns:
+        PackedSequence listo para nn.LSTM/nn.GRU (el padding no se procesa)
+    """
+    return pack_padded_sequence(
+        features, lengths.cpu(), batch_first=True, enforce_sorted=False
+    )
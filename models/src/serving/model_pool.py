@@ -0,0 +1,446 @@
+# ======================================================                     *
+#  Project      : serving                                                    *
+#  File         : model_pool.py                                              *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 03:07                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Pool de modelos en memoria para servir varias versiones registradas.
+
+Las versiones nuevas se cargan y calientan en segundo plano; el tráfico pasa
+a ellas con un solo cambio de referencia (sin reiniciar el proceso) y la
+versión anterior termina sus solicitudes en curso antes de descargarse.
+También permite repartir tráfico A/B entre dos versiones y enviar una copia
+de cada solicitud a una versión en sombra para compararla sin afectar la
+respuesta.
+
+Uso:
+    pool = ModelPool(base_dir='models')
+    pool.load('v3', wait=True)
+    pool.promote('v3')
+    pool.load('v4')                      # en segundo plano
+    pool.set_shadow('v4')                # comparar v4 con tráfico real
+    pool.set_split('v4', 0.1)            # 10% de las solicitudes a v4
+    pool.promote('v4')                   # v3 se drena y se descarga
+    result = pool.predict(images, landmarks, key=user_id)
+"""
+
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import torch
+
+from tools.monitoring import InferenceMetrics
+from training.deep.distillation_trainer import load_registered_model
+
+
+class PooledModel:
+    """Versión cargada en el pool y sus solicitudes en curso."""
+    
+    def __init__(self, version: str):
+        self.version = version
+        self.state = 'loading'
+        self.model = None
+        self.config = None
+        self.error = None
+        self.warmup_ms = {}
+        self.loaded_at = None
+        self.in_flight = 0
+        self.retired = False
+        self._cond = threading.Condition()
+    
+    def acquire(self) -> bool:
+        """Registra una solicitud; False si la versión ya se está retirando."""
+        with self._cond:
+            if self.retired or self.state != 'ready':
+                return False
+            self.in_flight += 1
+            return True
+    
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._cond.notify_all()
+    
+    def retire(self, timeout: float) -> bool:
+        """No acepta solicitudes nuevas y espera a que terminen las que tiene."""
+        with self._cond:
+            self.retired = True
+            self.state = 'draining'
+            return self._cond.wait_for(lambda: self.in_flight == 0, timeout=timeout)
+    
+    def info(self) -> Dict:
+        return {
+            'state': self.state,
+            'in_flight': self.in_flight,
+            'warmup_ms': self.warmup_ms,
+            'loaded_at': self.loaded_at,
+            'error': self.error
+        }
+
+
+class ModelPool:
+    """
+    Versiones cargadas y enrutamiento del tráfico entre ellas.
+    
+    El enrutamiento (principal, canario A/B y sombra) es un dict que nunca se
+    modifica: cada cambio crea uno nuevo y reemplaza la referencia, así que
+    una solicitud siempre ve un enrutamiento completo y consistente.
+    """
+    
+    def __init__(
+        self,
+        base_dir: str = 'models',
+        device: Optional[str] = None,
+        warmup_batch_sizes: Iterable[int] = (1, 8),
+        warmup_iterations: int = 3,
+        drain_timeout: float = 30.0,
+        loader=None,
+        metrics: Optional[InferenceMetrics] = None
+    ):
+        """
+        Args:
+            base_dir: Directorio de modelos de `VersionManager`
+            device: Device de inferencia (default: cuda si está disponible)
+            warmup_batch_sizes: Tamaños de batch sintéticos del calentamiento
+                (los que se esperan en producción)
+            warmup_iterations: Forwards por tamaño de batch al calentar
+            drain_timeout: Segundos máximos de espera de solicitudes en curso
+                antes de descargar una versión retirada
+            loader: Función (versión, base_dir) -> (modelo, config); por
+                defecto `load_registered_model`
+            metrics: Métricas de inferencia (default: registro del proceso)
+        """
+        self.base_dir = base_dir
+        self.device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        self.warmup_batch_sizes = tuple(warmup_batch_sizes)
+        self.warmup_iterations = warmup_iterations
+        self.drain_timeout = drain_timeout
+        self.loader = loader or load_registered_model
+        self.metrics = metrics or InferenceMetrics()
+        
+        registry = self.metrics.registry
+        self._loaded_gauge = registry.gauge(
+            'jnaa_serving_model_loaded', 'Versión cargada y lista en el pool', ('model',)
+        )
+        self._shadow_counter = registry.counter(
+            'jnaa_serving_shadow_requests_total',
+            'Solicitudes en sombra por coincidencia con la versión principal', ('model', 'agree')
+        )
+        
+        self._models: Dict[str, PooledModel] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._routing = {'primary': None, 'canary': None, 'canary_fraction': 0.0, 'shadow': None}
+        
+        # Un solo hilo de carga: dos versiones a la vez duplicarían la memoria pico
+        self._load_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pool-load')
+        self._background = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pool-bg')
+        # Solicitudes en sombra pendientes: si la sombra no da abasto se
+        # descartan en vez de acumularse en memoria
+        self._shadow_slots = threading.BoundedSemaphore(8)
+        self._shadow_dropped = registry.counter(
+            'jnaa_serving_shadow_dropped_total', 'Solicitudes en sombra descartadas por saturación'
+        )
+    
+    def load(self, version: str, wait: bool = False) -> Future:
+        """
+        Carga y calienta una versión en segundo plano.
+        
+        Returns:
+            Future que termina cuando la versión está lista (o falló)
+        """
+        with self._lock:
+            entry = self._models.get(version)
+            if entry is not None and not entry.retired and entry.state != 'failed':
+                future = self._futures[version]
+            else:
+                entry = PooledModel(version)
+                self._models[version] = entry
+                future = self._load_executor.submit(self._load, entry)
+                self._futures[version] = future
+        
+        if wait:
+            future.result()
+        return future
+    
+    def _load(self, entry: PooledModel) -> PooledModel:
+        try:
+            model, config = self.loader(entry.version, self.base_dir)
+            model = model.to(self.device).eval()
+            entry.model = model
+            entry.config = config
+            entry.state = 'warming'
+            entry.warmup_ms = self._warmup(model)
+            entry.loaded_at = time.strftime('%Y-%m-%d %H:%M:%S')
+            with entry._cond:
+                # Se descargó mientras cargaba
+                if entry.retired:
+                    entry.model = None
+                    return entry
+                entry.state = 'ready'
+            self._loaded_gauge.labels(entry.version).set(1)
+            print(f"Versión {entry.version} lista en {self.device} (calentamiento: {entry.warmup_ms})")
+        except Exception as e:
+            entry.state = 'failed'
+            entry.error = str(e)
+            entry.model = None
+            print(f"Error cargando la versión {entry.version}: {e}")
+            raise
+        return entry
+    
+    def _warmup(self, model: torch.nn.Module) -> Dict[int, float]:
+        """
+        Forwards con batches sintéticos de cada tamaño esperado.
+        
+        Inicializa kernels, selección de algoritmos de cuDNN y el allocator
+        antes de recibir tráfico real; retorna la latencia del último forward
+        de cada tamaño (ms).
+        """
+        latencies = {}
+        with torch.inference_mode():
+            for batch_size in self.warmup_batch_sizes:
+                images = torch.randn(batch_size, 3, 224, 224, device=self.device)
+                landmarks = torch.rand(batch_size, 126, device=self.device)
+                for _ in range(max(1, self.warmup_iterations)):
+                    start = time.perf_counter()
+                    model(images, landmarks)
+                    if str(self.device).startswith('cuda'):
+                        torch.cuda.synchronize()
+                    latencies[batch_size] = round((time.perf_counter() - start) * 1000, 3)
+        return latencies
+    
+    def unload(self, version: str, wait: bool = True) -> bool:
+        """
+        Descarga una versión que no recibe tráfico.
+        
+        Raises:
+            ValueError: Si la versión es la principal, canario o sombra
+        """
+        routing = self._routing
+        if version in (routing['primary'], routing['canary'], routing['shadow']):
+            raise ValueError(f"La versión {version} está recibiendo tráfico")
+        
+        with self._lock:
+            entry = self._models.get(version)
+        if entry is None:
+            return False
+        
+        future = self._background.submit(self._drain, entry)
+        if wait:
+            return future.result()
+        return True
+    
+    def _drain(self, entry: PooledModel) -> bool:
+        drained = entry.retire(self.drain_timeout)
+        if not drained:
+            print(f"La versión {entry.version} no terminó {entry.in_flight} solicitudes "
+                  f"en {self.drain_timeout}s; se descarga de todos modos")
+        
+        with self._lock:
+            current = self._models.get(entry.version)
+            if current is entry:
+                del self._models[entry.version]
+                self._futures.pop(entry.version, None)
+            # Una recarga de la misma versión ya registró otra entrada: su
+            # gauge es suyo
+            if current is entry or current is None:
+                self._loaded_gauge.labels(entry.version).set(0)
+        
+        entry.model = None
+        entry.state = 'unloaded'
+        if str(self.device).startswith('cuda'):
+            torch.cuda.empty_cache()
+        print(f"Versión {entry.version} descargada")
+        return drained
+    
+    def _require_ready(self, version: str):
+        with self._lock:
+            entry = self._models.get(version)
+        if entry is None:
+            raise KeyError(f"La versión {version} no está en el pool (usa load)")
+        # Esperar la carga en curso (promote justo después de load)
+        future = self._futures.get(version)
+        if future is not None:
+            future.result()
+        if entry.state != 'ready':
+            raise RuntimeError(f"La versión {version} no está lista ({entry.state})")
+    
+    def _set_routing(self, **changes) -> Dict:
+        """Nuevo enrutamiento (copia) y las versiones que dejan de recibir tráfico."""
+        with self._lock:
+            old = self._routing
+            new = {**old, **changes}
+            if new['canary'] is None:
+                new['canary_fraction'] = 0.0
+            self._routing = new
+        
+        active = {new['primary'], new['canary'], new['shadow']}
+        return {v for v in (old['primary'], old['canary'], old['shadow']) if v and v not in active}
+    
+    def promote(self, version: str, unload_previous: bool = True):
+        """
+        Pasa todo el tráfico a `version` (carga, si hace falta, y espera a que
+        esté caliente). La versión anterior termina sus solicitudes y se
+        descarga en segundo plano.
+        """
+        if version not in self._models:
+            self.load(version)
+        self._require_ready(version)
+        
+        routing = self._routing
+        changes = {'primary': version}
+        if routing['canary'] == version:
+            changes['canary'] = None
+        if routing['shadow'] == version:
+            changes['shadow'] = None
+        released = self._set_routing(**changes)
+        print(f"Tráfico principal: {version}")
+        
+        if unload_previous:
+            for old_version in released:
+                self.unload(old_version, wait=False)
+    
+    def set_split(self, version: Optional[str], fraction: float = 0.0):
+        """
+        A/B: envía `fraction` de las solicitudes a `version` (None lo quita).
+        
+        Con `key` en `predict` la asignación es estable por clave (el mismo
+        usuario siempre ve la misma versión).
+        """
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError("fraction debe estar en [0, 1]")
+        if version is not None:
+            self._require_ready(version)
+        self._set_routing(canary=version, canary_fraction=fraction if version else 0.0)
+    
+    def set_shadow(self, version: Optional[str]):
+        """Copia cada solicitud a `version` en segundo plano (None lo quita)."""
+        if version is not None:
+            self._require_ready(version)
+        self._set_routing(shadow=version)
+    
+    def _route(self, routing: Dict, key: Optional[str]) -> str:
+        if routing['canary'] and routing['canary_fraction'] > 0:
+            if key is not None:
+                bucket = (zlib.crc32(str(key).encode('utf-8')) % 10000) / 10000
+            else:
+                bucket = random.random()
+            if bucket < routing['canary_fraction']:
+                return routing['canary']
+        return routing['primary']
+    
+    def _forward(self, entry: PooledModel, images: torch.Tensor, landmarks: torch.Tensor) -> torch.Tensor:
+        with self.metrics.track(entry.version, batch_size=images.size(0)):
+            with torch.inference_mode():
+                logits = entry.model(images.to(self.device), landmarks.to(self.device))
+                return torch.softmax(logits, dim=1).cpu()
+    
+    def predict(
+        self,
+        images: torch.Tensor,
+        landmarks: Optional[torch.Tensor] = None,
+        key: Optional[str] = None
+    ) -> Dict:
+        """
+        Probabilidades de un batch con la versión que corresponda.
+        
+        Args:
+            images: Tensor [batch, 3, 224, 224] normalizado como en entrenamiento
+            landmarks: Tensor [batch, 126] (ceros si no hay)
+            key: Clave estable para la asignación A/B (p. ej. id de usuario)
+        
+        Returns:
+            Dict con 'version', 'probabilities' [batch, clases] y 'predictions'
+        """
+        if landmarks is None:
+            landmarks = torch.zeros(images.size(0), 126)
+        
+        # Reintentar si la versión elegida se retiró entre leer el
+        # enrutamiento y registrar la solicitud
+        for _ in range(3):
+            routing = self._routing
+            version = self._route(routing, key)
+            if version is None:
+                raise RuntimeError("No hay versión principal (usa promote)")
+            entry = self._models.get(version)
+            if entry is not None and entry.acquire():
+                break
+        else:
+            raise RuntimeError(f"La versión {version} no está disponible")
+        
+        try:
+            probabilities = self._forward(entry, images, landmarks)
+        finally:
+            entry.release()
+        
+        predictions = probabilities.argmax(dim=1)
+        shadow = routing['shadow']
+        if shadow and shadow != version:
+            if self._shadow_slots.acquire(blocking=False):
+                self._background.submit(self._shadow_predict, shadow, images, landmarks, predictions)
+            else:
+                self._shadow_dropped.inc()
+        
+        return {'version': version, 'probabilities': probabilities, 'predictions': predictions}
+    
+    def _shadow_predict(self, version: str, images, landmarks, primary_predictions):
+        try:
+            entry = self._models.get(version)
+            if entry is None or not entry.acquire():
+                return
+            try:
+                predictions = self._forward(entry, images, landmarks).argmax(dim=1)
+            except Exception as e:
+                print(f"Error en la versión en sombra {version}: {e}")
+                return
+            finally:
+                entry.release()
+        finally:
+            self._shadow_slots.release()
+        
+        agree = int((predictions == primary_predictions).sum())
+        disagree = len(predictions) - agree
+        if agree:
+            self._shadow_counter.labels(version, 'true').inc(agree)
+        if disagree:
+            self._shadow_counter.labels(version, 'false').inc(disagree)
+    
+    def status(self) -> Dict:
+        with self._lock:
+            models = {version: entry.info() for version, entry in self._models.items()}
+        return {'device': self.device, 'routing': dict(self._routing), 'models': models}
+    
+    def close(self):
+        """Descarga todas las versiones y detiene los hilos del pool."""
+        self._set_routing(primary=None, canary=None, shadow=None)
+        self._load_executor.shutdown(wait=True)
+        self._background.shutdown(wait=True)
+        with self._lock:
+            entries = list(self._models.values())
+        for entry in entries:
+            self._drain(entry)
@@ -26,5 +26,6 @@
 """Tools and utilities for the training system."""
 
 from .visualization.dashboard import SimpleDashboard
+from .monitoring import InferenceMetrics, MetricsServer, TrainingMetrics
 
-__all__ = ['SimpleDashboard']
+__all__ = ['SimpleDashboard', 'InferenceMetrics', 'MetricsServer', 'TrainingMetrics']
@@ -0,0 +1,43 @@
+# ======================================================                     *
+#  Project      : monitoring                                                 *
+#  File         : __init__.py                                                *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:57                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""Process metrics in Prometheus text format and a local HTTP endpoint."""
+
+from .metrics import REGISTRY, Counter, Gauge, Histogram, MetricsRegistry
+from .exporter import MetricsServer, parse_exposition, scrape
+from .instruments import InferenceMetrics, TrainingMetrics
+
+__all__ = [
+    'REGISTRY',
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsRegistry',
+    'MetricsServer',
+    'parse_exposition',
+    'scrape',
+    'InferenceMetrics',
+    'TrainingMetrics'
+]
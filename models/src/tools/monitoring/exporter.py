@@ -0,0 +1,144 @@
+# ======================================================                     *
+#  Project      : monitoring                                                 *
+#  File         : exporter.py                                                *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:57                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Endpoint HTTP local con las métricas en formato de exposición de texto y un
+scraper mínimo para leerlas sin Prometheus (pruebas, scripts, benchmarks).
+
+Uso:
+    server = MetricsServer(port=9100).start()
+    ...
+    print(scrape('http://127.0.0.1:9100/metrics'))
+    server.stop()
+"""
+
+import re
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from .metrics import REGISTRY, MetricsRegistry
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})?\s+(\S+)$')
+_LABEL_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+class MetricsServer:
+    """Sirve `/metrics` desde un hilo daemon (no bloquea el entrenamiento)."""
+    
+    def __init__(self, port: int = 9100, host: str = '127.0.0.1', registry: Optional[MetricsRegistry] = None):
+        """
+        Args:
+            port: Puerto (0 = uno libre, consultar `self.port` tras `start`)
+            host: Interfaz; por defecto solo local
+            registry: Registro a exponer (por defecto el del proceso)
+        """
+        self.host = host
+        self.port = port
+        self.registry = registry or REGISTRY
+        self._server = None
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}/metrics'
+    
+    def start(self) -> 'MetricsServer':
+        registry = self.registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.expose().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                # Sin una línea en stdout por cada scrape
+                pass
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='metrics-server', daemon=True
+        )
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def parse_exposition(text: str) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]:
+    """
+    Convierte texto de exposición en {(nombre, etiquetas): valor}.
+    
+    Las etiquetas son una tupla ordenada de pares, p. ej.
+    ('jnaa_inference_requests_total', (('model', 'v3'),)).
+    """
+    samples = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        match = _SAMPLE_RE.match(line)
+        if match is None:
+            continue
+        name, labels, value = match.groups()
+        label_pairs = tuple(sorted(
+            (key, raw.replace('\\n', '\n').replace('\\"', '"').replace('\\\\', '\\'))
+            for key, raw in _LABEL_RE.findall(labels or '')
+        ))
+        samples[(name, label_pairs)] = float(value)
+    return samples
+
+
+def scrape(url: str, timeout: float = 5.0) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]:
+    """Lee un endpoint `/metrics` y lo convierte con `parse_exposition`."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return parse_exposition(response.read().decode('utf-8'))
@@ -0,0 +1,176 @@
+# ======================================================                     *
+#  Project      : monitoring                                                 *
+#  File         : instruments.py                                             *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:57                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Métricas del entrenamiento, de los loaders y de la inferencia sobre el
+registro del proceso.
+
+Los valores que ya se acumulan en otro lado (muestras cargadas por los
+workers en `LoadStats`, batches listos en la cola del DataLoader) se leen al
+exportar con `set_function`: el camino caliente no paga nada por ellos.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from .metrics import REGISTRY, MetricsRegistry
+
+
+# Buckets de latencia de inferencia (segundos): de 0.5 ms a 5 s
+INFERENCE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _queue_depth(loader_iter) -> float:
+    """Batches listos en la cola de un iterador de DataLoader (0 sin workers)."""
+    queue = getattr(loader_iter, '_data_queue', None)
+    if queue is None:
+        return 0.0
+    try:
+        return float(queue.qsize())
+    except NotImplementedError:
+        # macOS no implementa qsize en multiprocessing.Queue
+        return float('nan')
+
+
+class TrainingMetrics:
+    """Métricas de `HybridTrainer` y de su loader de entrenamiento."""
+    
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry = registry or REGISTRY
+        self.steps = registry.counter('jnaa_train_steps_total', 'Pasos de entrenamiento')
+        self.samples = registry.counter('jnaa_train_samples_total', 'Muestras de entrenamiento procesadas')
+        self.step_seconds = registry.histogram(
+            'jnaa_train_step_seconds', 'Duración del paso de entrenamiento (incluye espera de datos)'
+        )
+        self.samples_per_second = registry.gauge(
+            'jnaa_train_samples_per_second', 'Muestras por segundo de la última época'
+        )
+        self.loss = registry.gauge('jnaa_train_loss', 'Pérdida del último paso')
+        self.epoch = registry.gauge('jnaa_train_epoch', 'Época actual (desde 1)')
+        self.val_acc = registry.gauge('jnaa_val_accuracy', 'Accuracy de validación de la última época')
+        self.val_loss = registry.gauge('jnaa_val_loss', 'Pérdida de validación de la última época')
+        self.best_val_acc = registry.gauge('jnaa_val_accuracy_best', 'Mejor accuracy de validación')
+        
+        self.queue_depth = registry.gauge(
+            'jnaa_loader_queue_depth', 'Batches listos esperando al trainer en la cola del DataLoader'
+        )
+        self.loader_samples = registry.counter(
+            'jnaa_loader_samples_total', 'Muestras cargadas por el dataset (suma de workers)'
+        )
+        self.landmark_rate = registry.gauge(
+            'jnaa_loader_landmark_detection_rate', 'Fracción de imágenes con alguna mano detectada'
+        )
+        
+        self._loader_iter = None
+        self._load_stats = None
+        self.queue_depth.set_function(lambda: _queue_depth(self._loader_iter))
+        self.loader_samples.set_function(lambda: self._load_stat('samples'))
+        self.landmark_rate.set_function(self._landmark_rate)
+    
+    def _load_stat(self, field: str) -> float:
+        return self._load_stats.get(field) if self._load_stats is not None else 0.0
+    
+    def _landmark_rate(self) -> float:
+        images = self._load_stat('landmark_images')
+        return self._load_stat('landmark_hits') / images if images else float('nan')
+    
+    def watch_loader(self, loader_iter, load_stats=None):
+        """Iterador del DataLoader y `LoadStats` de su dataset a exponer."""
+        self._loader_iter = loader_iter
+        if load_stats is not None:
+            self._load_stats = load_stats
+    
+    def observe_step(self, seconds: float, batch_size: int, loss: float):
+        self.steps.inc()
+        self.samples.inc(batch_size)
+        self.step_seconds.observe(seconds)
+        self.loss.set(loss)
+
+
+class InferenceMetrics:
+    """Solicitudes, errores, muestras y latencia de inferencia por modelo."""
+    
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry = registry or REGISTRY
+        self.requests = registry.counter(
+            'jnaa_inference_requests_total', 'Solicitudes de inferencia', ('model',)
+        )
+        self.errors = registry.counter(
+            'jnaa_inference_errors_total', 'Solicitudes de inferencia con error', ('model',)
+        )
+        self.samples = registry.counter(
+            'jnaa_inference_samples_total', 'Muestras inferidas', ('model',)
+        )
+        self.latency = registry.histogram(
+            'jnaa_inference_latency_seconds', 'Latencia de inferencia por solicitud',
+            ('model',), buckets=INFERENCE_BUCKETS
+        )
+        self.in_flight = registry.gauge(
+            'jnaa_inference_in_flight', 'Solicitudes en curso', ('model',)
+        )
+    
+    @contextmanager
+    def track(self, model: str, batch_size: int = 1):
+        """Mide una solicitud: `with metrics.track('v3', batch_size=8): ...`"""
+        in_flight = self.in_flight.labels(model)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors.labels(model).inc()
+            raise
+        finally:
+            self.latency.labels(model).observe(time.perf_counter() - start)
+            self.requests.labels(model).inc()
+            self.samples.labels(model).inc(batch_size)
+            in_flight.dec()
+    
+    def instrument(self, module, model: str) -> list:
+        """
+        Mide cada forward de `module` con hooks (sin tocar el código que lo
+        llama). Los errores no se cuentan: un forward que lanza no llega al
+        hook posterior.
+        
+        Returns:
+            Handles de los hooks (`handle.remove()` para quitarlos)
+        """
+        requests = self.requests.labels(model)
+        samples = self.samples.labels(model)
+        latency = self.latency.labels(model)
+        # Inicio por hilo: el mismo módulo puede atender varios hilos
+        local = threading.local()
+        
+        def pre_hook(_module, args):
+            local.start = time.perf_counter()
+        
+        def post_hook(_module, args, output):
+            latency.observe(time.perf_counter() - local.start)
+            requests.inc()
+            samples.inc(args[0].shape[0] if args and hasattr(args[0], 'shape') else 1)
+        
+        return [module.register_forward_pre_hook(pre_hook), module.register_forward_hook(post_hook)]
@@ -0,0 +1,365 @@
+# ======================================================                     *
+#  Project      : monitoring                                                 *
+#  File         : metrics.py                                                 *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:57                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Registro de métricas (contadores, gauges e histogramas) con formato de
+exposición de texto de Prometheus.
+
+Las actualizaciones en el camino caliente no toman locks: cada hilo escribe
+en su propio fragmento (shard) y la lectura suma los fragmentos al exportar.
+Solo el primer uso de una métrica en un hilo registra su fragmento (con lock);
+cuando el hilo termina, su fragmento se suma a un valor base y se descarta,
+así que un servidor con un hilo por request no acumula fragmentos.
+Los gauges guardan un solo valor (asignación atómica en CPython).
+"""
+
+import math
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Buckets por defecto (segundos): de 1 ms a 10 s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return 'NaN'
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _ShardOwner:
+    """Referencia del hilo a su fragmento; se libera al terminar el hilo."""
+    
+    __slots__ = ('values', '__weakref__')
+    
+    def __init__(self, values: List[float]):
+        self.values = values
+
+
+class _ShardedValues:
+    """Vector de valores por hilo; la suma se calcula al leer."""
+    
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._base = [0.0] * size
+        self._shards: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def shard(self) -> List[float]:
+        """Fragmento del hilo actual (se crea en su primer uso)."""
+        owner = getattr(self._local, 'owner', None)
+        if owner is None:
+            owner = _ShardOwner([0.0] * self._size)
+            self._local.owner = owner
+            with self._lock:
+                self._shards[id(owner.values)] = owner.values
+            # El thread-local del hilo se libera cuando termina: su
+            # fragmento pasa al valor base
+            weakref.finalize(owner, self._retire, owner.values)
+        return owner.values
+    
+    def _retire(self, values: List[float]):
+        with self._lock:
+            if self._shards.pop(id(values), None) is not None:
+                for i, value in enumerate(values):
+                    self._base[i] += value
+    
+    def total(self) -> List[float]:
+        with self._lock:
+            result = list(self._base)
+            shards = list(self._shards.values())
+        for values in shards:
+            for i, value in enumerate(values):
+                result[i] += value
+        return result
+
+
+class _Metric:
+    """Base: métrica con o sin etiquetas."""
+    
+    TYPE = ''
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], '_Metric'] = {}
+        self._children_lock = threading.Lock()
+    
+    def labels(self, *values, **kwargs) -> '_Metric':
+        """Métrica hija para una combinación de valores de etiquetas."""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labelnames}")
+        
+        child = self._children.get(values)
+        if child is None:
+            with self._children_lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+    
+    def _new_child(self) -> '_Metric':
+        return type(self)(self.name, self.documentation)
+    
+    def _check_unlabeled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} tiene etiquetas: usa .labels(...)")
+    
+    def _series(self) -> List[Tuple[Tuple[str, ...], '_Metric']]:
+        if self.labelnames:
+            with self._children_lock:
+                return sorted(self._children.items())
+        return [((), self)]
+    
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        for labelvalues, metric in self._series():
+            lines.extend(metric._samples_for(self.labelnames, labelvalues))
+        return '\n'.join(lines)
+    
+    def _samples_for(self, labelnames, labelvalues) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Valor que solo aumenta (p. ej. muestras procesadas)."""
+    
+    TYPE = 'counter'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values = _ShardedValues(1)
+        self._function = None
+    
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Un contador solo puede aumentar")
+        self._values.shard()[0] += amount
+    
+    def set_function(self, function: Callable[[], float]):
+        """Leer el valor de `function` al exportar (p. ej. de memoria compartida)."""
+        self._check_unlabeled()
+        self._function = function
+    
+    def get(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._values.total()[0]
+    
+    def _samples_for(self, labelnames, labelvalues) -> List[str]:
+        return [f"{self.name}{_format_labels(labelnames, labelvalues)} {_format_value(self.get())}"]
+
+
+class Gauge(_Metric):
+    """Valor que sube y baja (p. ej. val_acc actual, profundidad de cola)."""
+    
+    TYPE = 'gauge'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+        self._deltas = _ShardedValues(1)
+        self._function = None
+    
+    def set(self, value: float):
+        # Los incrementos previos quedan absorbidos en el valor fijado
+        self._value = float(value) - self._deltas.total()[0]
+    
+    def inc(self, amount: float = 1.0):
+        self._deltas.shard()[0] += amount
+    
+    def dec(self, amount: float = 1.0):
+        self._deltas.shard()[0] -= amount
+    
+    def set_function(self, function: Callable[[], float]):
+        """Leer el valor de `function` al exportar."""
+        self._check_unlabeled()
+        self._function = function
+    
+    def get(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._value + self._deltas.total()[0]
+    
+    def _samples_for(self, labelnames, labelvalues) -> List[str]:
+        return [f"{self.name}{_format_labels(labelnames, labelvalues)} {_format_value(self.get())}"]
+
+
+class Histogram(_Metric):
+    """Distribución por buckets acumulados (p. ej. latencias)."""
+    
+    TYPE = 'histogram'
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # Un contador por bucket + +Inf, suma y cantidad
+        self._values = _ShardedValues(len(self.buckets) + 3)
+    
+    def _new_child(self) -> 'Histogram':
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+    
+    def observe(self, value: float):
+        values = self._values.shard()
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        values[index] += 1
+        values[-2] += value
+        values[-1] += 1
+    
+    def time(self) -> '_Timer':
+        """Context manager que observa la duración del bloque en segundos."""
+        return _Timer(self)
+    
+    def snapshot(self) -> Dict:
+        """Buckets acumulados, suma y cantidad."""
+        totals = self._values.total()
+        cumulative = []
+        running = 0.0
+        for count in totals[:len(self.buckets) + 1]:
+            running += count
+            cumulative.append(running)
+        return {
+            'buckets': dict(zip(self.buckets + (math.inf,), cumulative)),
+            'sum': totals[-2],
+            'count': totals[-1]
+        }
+    
+    def _samples_for(self, labelnames, labelvalues) -> List[str]:
+        snapshot = self.snapshot()
+        lines = [
+            f"{self.name}_bucket{_format_labels(labelnames, labelvalues, ('le', _format_value(bound)))} "
+            f"{_format_value(count)}"
+            for bound, count in snapshot['buckets'].items()
+        ]
+        labels = _format_labels(labelnames, labelvalues)
+        lines.append(f"{self.name}_sum{labels} {_format_value(snapshot['sum'])}")
+        lines.append(f"{self.name}_count{labels} {_format_value(snapshot['count'])}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._start = None
+    
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas con nombre único.
+    
+    `counter`/`gauge`/`histogram` retornan la métrica existente si ya se
+    registró con el mismo nombre y tipo, así que varios componentes (o varias
+    instancias del mismo trainer) pueden pedirla sin coordinarse.
+    """
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"La métrica '{name}' ya existe con otro tipo o etiquetas")
+            return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+    
+    def unregister(self, name: str):
+        with self._lock:
+            self._metrics.pop(name, None)
+    
+    def expose(self) -> str:
+        """Todas las métricas en formato de exposición de texto."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return '\n'.join(metric.expose() for metric in metrics) + '\n'
+
+
+# Registro del proceso (lo usan el trainer, los loaders y la inferencia)
+REGISTRY = MetricsRegistry()
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:40                                           *
+#  Last Updated : 2026-10-19 02:41                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -26,5 +26,8 @@
 """Training modules for deep learning and classical models."""
 
 from .deep.hybrid_trainer import HybridTrainer
+from .deep.hyperparameter_search import HyperparameterSearch
+from .deep.distillation_trainer import DistillationTrainer
+from .deep.early_exit_trainer import EarlyExitTrainer
 
-__all__ = ['HybridTrainer']
\ No newline at end of file
+__all__ = ['HybridTrainer', 'HyperparameterSearch', 'DistillationTrainer', 'EarlyExitTrainer']
\ No newline at end of file
@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 16:40                                           *
+#  Last Updated : 2026-10-19 02:41                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -26,5 +26,8 @@
 """Deep learning training modules."""
 
 from .hybrid_trainer import HybridTrainer
+from .hyperparameter_search import HyperparameterSearch
+from .distillation_trainer import DistillationTrainer
+from .early_exit_trainer import EarlyExitTrainer
 
-__all__ = ['HybridTrainer']
+__all__ = ['HybridTrainer', 'HyperparameterSearch', 'DistillationTrainer', 'EarlyExitTrainer']
@@ -0,0 +1,323 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : distillation_trainer.py                                    *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:41                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Destilación de conocimiento: teacher registrado -> alumno pequeño.
+
+Los logits del teacher se calculan una sola vez sobre el split de train (sin
+augmentación) y se guardan en disco; durante el entrenamiento el alumno los
+busca por ruta de archivo, así que el teacher no vuelve a ejecutarse.
+"""
+
+import copy
+import time
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.utils.data import DataLoader
+from tqdm import tqdm
+
+from .hybrid_trainer import HybridTrainer
+from .tensor_bundle import BUNDLE_NAME, load_bundle
+
+
+def create_model(config: Dict, pretrained: Optional[bool] = None) -> nn.Module:
+    """Construye el modelo descrito por una configuración (teacher o alumno)."""
+    from algorithms.deep import SimpleHybridModel, LandmarkMLP, EarlyExitHybridModel
+    
+    model_config = config['model']
+    num_classes = config['dataset']['num_classes']
+    
+    if model_config['backbone'] == 'landmark_mlp':
+        return LandmarkMLP(num_classes=num_classes, dropout=model_config.get('dropout', 0.3))
+    
+    model_class = SimpleHybridModel
+    if model_config.get('early_exit', {}).get('enabled', False):
+        model_class = EarlyExitHybridModel
+    
+    return model_class(
+        num_classes=num_classes,
+        backbone=model_config['backbone'],
+        use_landmarks=model_config['use_landmarks'],
+        pretrained=model_config['pretrained'] if pretrained is None else pretrained,
+        dropout=model_config.get('dropout', 0.5)
+    )
+
+
+def load_registered_model(version: str, base_dir: str = 'models') -> tuple:
+    """
+    Carga el modelo final de una versión registrada.
+    
+    Si la versión tiene `model.bundle`, los pesos se mapean desde ese archivo
+    sin copiarlos (ver `tensor_bundle`); si no, se lee el checkpoint `.pth`.
+    
+    Returns:
+        (modelo en modo eval, configuración de la versión)
+    """
+    final_dir = Path(base_dir) / version / 'final'
+    if (final_dir / BUNDLE_NAME).exists():
+        return load_bundle_model(final_dir / BUNDLE_NAME)
+    
+    model_path = final_dir / 'model.pth'
+    if not model_path.exists():
+        raise FileNotFoundError(f"No existe el modelo de la versión {version}: {model_path}")
+    
+    checkpoint = torch.load(model_path, map_location='cpu', weights_only=False)
+    config = checkpoint['config']
+    
+    # Los pesos vienen del checkpoint: no descargar los de ImageNet
+    model = create_model(config, pretrained=False)
+    if 'channel_plan' in checkpoint:
+        from algorithms.deep.channel_pruning import ChannelPruner
+        ChannelPruner.apply_plan(model, checkpoint['channel_plan'])
+    model.load_state_dict(checkpoint['model_state_dict'])
+    return model.eval(), config
+
+
+def load_bundle_model(path: str) -> tuple:
+    """
+    Construye el modelo de un bundle con sus parámetros apuntando al mapeo.
+    
+    La arquitectura se crea en el device 'meta' (sin reservar ni inicializar
+    pesos) y `load_state_dict(assign=True)` coloca los tensores mapeados. Si
+    algún buffer no está en el bundle, se construye en CPU y se asigna igual.
+    
+    Returns:
+        (modelo en modo eval, configuración)
+    """
+    state_dict, metadata = load_bundle(path)
+    config = metadata['config']
+    
+    def build():
+        model = create_model(config, pretrained=False)
+        if 'channel_plan' in metadata:
+            from algorithms.deep.channel_pruning import ChannelPruner
+            ChannelPruner.apply_plan(model, metadata['channel_plan'])
+        return model
+    
+    try:
+        with torch.device('meta'):
+            model = build()
+        model.load_state_dict(state_dict, assign=True)
+        tensors = list(model.parameters()) + list(model.buffers())
+        if any(t.is_meta for t in tensors):
+            raise RuntimeError("tensores sin valor en el bundle")
+    except Exception:
+        model = build()
+        model.load_state_dict(state_dict, assign=True)
+    return model.eval(), config
+
+
+def measure_latency(
+    model: nn.Module,
+    device: str = 'cpu',
+    batch_size: int = 1,
+    iterations: int = 50,
+    warmup: int = 10
+) -> Dict:
+    """
+    Latencia de inferencia con entradas sintéticas.
+    
+    Returns:
+        Dict con latencia (mediana y p90 en ms), parámetros y tamaño en MB
+    """
+    model = model.to(device).eval()
+    images = torch.randn(batch_size, 3, 224, 224, device=device)
+    landmarks = torch.rand(batch_size, 126, device=device)
+    
+    timings = []
+    with torch.no_grad():
+        for i in range(warmup + iterations):
+            if device == 'cuda':
+                torch.cuda.synchronize()
+            start = time.perf_counter()
+            model(images, landmarks)
+            if device == 'cuda':
+                torch.cuda.synchronize()
+            if i >= warmup:
+                timings.append((time.perf_counter() - start) * 1000)
+    
+    num_params = sum(p.numel() for p in model.parameters())
+    size_bytes = sum(t.numel() * t.element_size() for t in model.state_dict().values())
+    return {
+        'device': device,
+        'batch_size': batch_size,
+        'latency_ms_median': round(float(np.median(timings)), 3),
+        'latency_ms_p90': round(float(np.percentile(timings, 90)), 3),
+        'total_params': int(num_params),
+        'size_mb': round(size_bytes / 1024 ** 2, 2)
+    }
+
+
+class TeacherLogitCache:
+    """
+    Logits del teacher por muestra, guardados en disco.
+    
+    El archivo se identifica por la versión del teacher y la lista de rutas
+    del split, así que se reutiliza entre corridas mientras no cambien.
+    """
+    
+    def __init__(self, cache_dir: str = 'cache/teacher_logits'):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def path(self, teacher_version: str, sample_paths) -> Path:
+        digest = hashlib.sha1('\n'.join(sample_paths).encode('utf-8')).hexdigest()[:12]
+        return self.cache_dir / f"{teacher_version}_{digest}.npz"
+    
+    def load_or_build(
+        self,
+        teacher_version: str,
+        sample_paths,
+        compute: Callable[[], tuple]
+    ) -> tuple:
+        """
+        Retorna (rutas, logits) desde la caché o calculándolos con `compute`.
+        
+        Args:
+            teacher_version: Versión registrada del teacher
+            sample_paths: Rutas de las muestras del split
+            compute: Función que retorna (rutas, logits) ejecutando el teacher
+        """
+        cache_path = self.path(teacher_version, sample_paths)
+        if cache_path.exists():
+            with np.load(cache_path) as data:
+                print(f"Logits del teacher desde caché: {cache_path}")
+                return data['paths'].tolist(), data['logits']
+        
+        paths, logits = compute()
+        np.savez(cache_path, paths=np.asarray(paths), logits=logits)
+        print(f"Logits del teacher guardados en: {cache_path}")
+        return paths, logits
+
+
+class DistillationTrainer(HybridTrainer):
+    """
+    `HybridTrainer` con pérdida de destilación.
+    
+    pérdida = alpha · T² · KL(softmax(teacher/T) || softmax(alumno/T))
+              + (1 - alpha) · CE(alumno, etiquetas)
+    """
+    
+    def __init__(
+        self,
+        model: nn.Module,
+        train_loader: DataLoader,
+        val_loader: DataLoader,
+        test_loader: DataLoader,
+        config: Dict,
+        teacher: nn.Module,
+        teacher_version: str,
+        temperature: float = 4.0,
+        alpha: float = 0.7,
+        cache_dir: str = 'cache/teacher_logits',
+        device: str = 'cuda' if torch.cuda.is_available() else 'cpu',
+        epoch_callback: Optional[Callable[[int, Dict], None]] = None
+    ):
+        """
+        Args:
+            model: Alumno a entrenar
+            teacher: Modelo teacher (solo se usa para llenar la caché)
+            teacher_version: Versión registrada del teacher (clave de la caché)
+            temperature: Temperatura de los logits suaves
+            alpha: Peso de la pérdida de destilación frente a la CE
+            cache_dir: Directorio de la caché de logits
+        
+        El resto de argumentos son los de `HybridTrainer`.
+        """
+        super().__init__(
+            model=model,
+            train_loader=train_loader,
+            val_loader=val_loader,
+            test_loader=test_loader,
+            config=config,
+            device=device,
+            epoch_callback=epoch_callback
+        )
+        self.temperature = temperature
+        self.alpha = alpha
+        
+        dataset = train_loader.dataset
+        sample_paths = [dataset.samples[i][0] for i in range(len(dataset))]
+        paths, logits = TeacherLogitCache(cache_dir).load_or_build(
+            teacher_version, sample_paths, lambda: self._compute_teacher_logits(teacher)
+        )
+        self.teacher_rows = {path: row for row, path in enumerate(paths)}
+        self.teacher_logits = torch.from_numpy(logits).to(self.device)
+    
+    def _eval_train_loader(self) -> DataLoader:
+        """Split de train con las transformaciones de validación."""
+        dataset = copy.copy(self.train_loader.dataset)
+        dataset.transform = self.val_loader.dataset.transform
+        if hasattr(dataset, 'geometric_transform'):
+            dataset.geometric_transform = None
+        
+        return DataLoader(
+            dataset,
+            batch_size=self.train_loader.batch_size or 32,
+            shuffle=False,
+            num_workers=self.train_loader.num_workers,
+            collate_fn=self.train_loader.collate_fn
+        )
+    
+    def _compute_teacher_logits(self, teacher: nn.Module) -> tuple:
+        """Un único forward del teacher sobre todo el split de train."""
+        teacher = teacher.to(self.device).eval()
+        paths = []
+        logits = []
+        
+        with torch.no_grad():
+            for batch in tqdm(self._eval_train_loader(), desc="Teacher"):
+                images, _, landmarks = self._prepare_batch(batch, train=False)
+                logits.append(teacher(images, landmarks).float().cpu().numpy())
+                paths.extend(batch['path'])
+        
+        teacher.cpu()
+        return paths, np.concatenate(logits)
+    
+    def _compute_loss(self, outputs: torch.Tensor, labels: torch.Tensor, batch: Dict) -> torch.Tensor:
+        hard_loss = self.criterion(outputs, labels)
+        
+        rows = torch.tensor(
+            [self.teacher_rows.get(path, -1) for path in batch['path']],
+            device=self.device
+        )
+        known = rows >= 0
+        if not known.any():
+            return hard_loss
+        
+        T = self.temperature
+        soft_loss = F.kl_div(
+            F.log_softmax(outputs[known] / T, dim=1),
+            F.softmax(self.teacher_logits[rows[known]] / T, dim=1),
+            reduction='batchmean'
+        ) * (T * T)
+        
+        return self.alpha * soft_loss + (1 - self.alpha) * hard_loss
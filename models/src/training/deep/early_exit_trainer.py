@@ -0,0 +1,232 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : early_exit_trainer.py                                      *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:41                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Trainer para `EarlyExitHybridModel`.
+
+Entrena todas las salidas a la vez (pérdida conjunta) y, al terminar,
+calibra el umbral de confianza de cada salida intermedia en validación:
+se elige el umbral más bajo con el que las muestras que salen ahí no
+pierden más de `tolerance` de accuracy frente a la cabeza principal.
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader
+from tqdm import tqdm
+
+from .hybrid_trainer import HybridTrainer
+
+
+class EarlyExitTrainer(HybridTrainer):
+    """`HybridTrainer` con pérdida conjunta y calibración de salidas tempranas."""
+    
+    def __init__(
+        self,
+        model: nn.Module,
+        train_loader: DataLoader,
+        val_loader: DataLoader,
+        test_loader: DataLoader,
+        config: Dict,
+        device: str = 'cuda' if torch.cuda.is_available() else 'cpu',
+        epoch_callback: Optional[Callable[[int, Dict], None]] = None
+    ):
+        """
+        Mismos argumentos que `HybridTrainer`. Los pesos de la pérdida de
+        cada salida ('loss_weights') y la tolerancia de calibración
+        ('tolerance') se leen de config['model']['early_exit'].
+        """
+        super().__init__(
+            model=model,
+            train_loader=train_loader,
+            val_loader=val_loader,
+            test_loader=test_loader,
+            config=config,
+            device=device,
+            epoch_callback=epoch_callback
+        )
+        early_exit = config['model'].get('early_exit', {})
+        num_exits = len(model.exit_heads)
+        self.exit_loss_weights = early_exit.get('loss_weights') or [0.3] * num_exits
+        self.tolerance = early_exit.get('tolerance', 0.01)
+        
+        if len(self.exit_loss_weights) != num_exits:
+            raise ValueError(
+                f"early_exit.loss_weights necesita {num_exits} valores "
+                f"(uno por salida intermedia)"
+            )
+    
+    def _compute_loss(self, outputs: torch.Tensor, labels: torch.Tensor, batch: Dict) -> torch.Tensor:
+        # Cabeza principal + salidas intermedias del mismo forward
+        loss = self.criterion(outputs, labels)
+        for weight, exit_logits in zip(self.exit_loss_weights, self.model.exit_logits):
+            loss = loss + weight * self.criterion(exit_logits, labels)
+        return loss
+    
+    def train(self) -> Dict:
+        """Entrena, calibra los umbrales y repite la evaluación de test con ellos."""
+        results = super().train()
+        
+        print("\nCalibrando salidas tempranas...")
+        results['early_exit'] = self.calibrate_exits(self.tolerance)
+        
+        print("\nEvaluación en test con salidas tempranas")
+        results['test_metrics'] = self._evaluate_test()
+        return results
+    
+    def _exit_latencies(self, iterations: int = 30) -> List[float]:
+        """Latencia (ms, batch 1) hasta cada salida, incluida la principal."""
+        model = self.model
+        image = torch.randn(1, 3, 224, 224, device=self.device)
+        landmarks = torch.rand(1, 126, device=self.device)
+        heads = list(model.exit_heads) + [model.classifier]
+        
+        latencies = []
+        with torch.no_grad():
+            for exit_idx, head in enumerate(heads):
+                timings = []
+                for i in range(iterations + 5):
+                    if self.device == 'cuda':
+                        torch.cuda.synchronize()
+                    start = time.perf_counter()
+                    
+                    landmark_features = model._landmark_features(landmarks, 1, self.device)
+                    x = image
+                    for stage in model._stages[:exit_idx + 1]:
+                        x = model._run_stage(stage, x)
+                    head(model._head_input(model._pool(x), landmark_features))
+                    
+                    if self.device == 'cuda':
+                        torch.cuda.synchronize()
+                    if i >= 5:
+                        timings.append((time.perf_counter() - start) * 1000)
+                latencies.append(float(np.median(timings)))
+        return latencies
+    
+    def calibrate_exits(
+        self,
+        tolerance: float = 0.01,
+        candidates: Optional[List[float]] = None
+    ) -> Dict:
+        """
+        Elige el umbral de cada salida intermedia con el split de validación.
+        
+        Args:
+            tolerance: Pérdida máxima de accuracy permitida en las muestras
+                que salen en cada cabeza, frente a la cabeza principal
+            candidates: Umbrales a probar (None = 0.50 ... 0.99)
+        
+        Returns:
+            Reporte por salida (umbral, fracción de muestras, accuracy,
+            latencia) y costo/accuracy promedio frente a la red completa
+        """
+        candidates = sorted(candidates or np.round(np.arange(0.5, 1.0, 0.01), 2).tolist())
+        self.model.eval()
+        
+        all_probs = None
+        all_labels = []
+        with torch.no_grad():
+            for batch in tqdm(self.val_loader, desc="Calibración"):
+                images, labels, landmarks = self._prepare_batch(batch, train=False)
+                outputs = self.model.forward_all(images, landmarks)
+                probs = [torch.softmax(logits, dim=1).cpu().numpy() for logits in outputs]
+                all_probs = probs if all_probs is None else [
+                    np.concatenate([a, b]) for a, b in zip(all_probs, probs)
+                ]
+                all_labels.extend(labels.cpu().numpy())
+        
+        labels = np.asarray(all_labels)
+        confidence = [p.max(axis=1) for p in all_probs]
+        correct = [p.argmax(axis=1) == labels for p in all_probs]
+        final_correct = correct[-1]
+        num_exits = len(self.model.exit_heads)
+        latencies = self._exit_latencies()
+        
+        # Greedy en orden: cada salida solo ve las muestras que no salieron antes
+        remaining = np.ones(len(labels), dtype=bool)
+        thresholds = []
+        exits = []
+        predicted_correct = np.zeros(len(labels), dtype=bool)
+        
+        for i in range(num_exits):
+            threshold = 1.0
+            for candidate in candidates:
+                leaving = remaining & (confidence[i] >= candidate)
+                if not leaving.any():
+                    break
+                if correct[i][leaving].mean() >= final_correct[leaving].mean() - tolerance:
+                    threshold = candidate
+                    break
+            
+            leaving = remaining & (confidence[i] >= threshold) if threshold < 1.0 else np.zeros_like(remaining)
+            predicted_correct[leaving] = correct[i][leaving]
+            remaining &= ~leaving
+            thresholds.append(threshold)
+            exits.append({
+                'exit': i,
+                'threshold': threshold,
+                'fraction': float(leaving.mean()),
+                'accuracy': float(correct[i][leaving].mean()) if leaving.any() else None,
+                'latency_ms': round(latencies[i], 3)
+            })
+        
+        predicted_correct[remaining] = final_correct[remaining]
+        exits.append({
+            'exit': num_exits,
+            'threshold': None,
+            'fraction': float(remaining.mean()),
+            'accuracy': float(final_correct[remaining].mean()) if remaining.any() else None,
+            'latency_ms': round(latencies[-1], 3)
+        })
+        
+        self.model.exit_thresholds.copy_(torch.tensor(thresholds, dtype=torch.float32))
+        
+        expected_latency = sum(e['fraction'] * e['latency_ms'] for e in exits)
+        report = {
+            'calibrated_at': datetime.now().isoformat(),
+            'split': 'val',
+            'device': self.device,
+            'tolerance': tolerance,
+            'thresholds': thresholds,
+            'exits': exits,
+            'accuracy_full': float(final_correct.mean()) if len(labels) else None,
+            'accuracy_early_exit': float(predicted_correct.mean()) if len(labels) else None,
+            'latency_ms_full': round(latencies[-1], 3),
+            'latency_ms_expected': round(expected_latency, 3)
+        }
+        
+        for e in exits:
+            accuracy = f"{e['accuracy']:.4f}" if e['accuracy'] is not None else '-'
+            threshold = f"{e['threshold']:.2f}" if e['threshold'] is not None else 'final'
+            print(f"  Salida {e['exit']} (umbral {threshold}): {e['fraction']:.1%} de muestras, "
+                  f"acc {accuracy}, {e['latency_ms']:.2f} ms")
+        print(f"  Latencia esperada: {expected_latency:.2f} ms (completa: {latencies[-1]:.2f} ms)")
+        
+        return report
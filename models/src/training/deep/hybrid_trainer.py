@@ -4,7 +4,7 @@
 #  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
 #  Developer    : Axel Eduardo Urbina Secundino                              *
 #  Created      : 2025-10-30                                                 *
-#  Last Updated : 2026-01-17 17:49                                           *
+#  Last Updated : 2026-10-19 02:52                                           *
 # ======================================================                     *
 #                                                                            *
 #  License:                                                                  *
@@ -35,11 +35,18 @@ from tqdm import tqdm
 import numpy as np
 from pathlib import Path
 import json
-from typing import Dict, List
+import time
+from typing import Callable, Dict, List, Optional
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from data.augmentation import BatchAugmenter
+from data.loaders.load_stats import LoadStats
+from tools.monitoring import InferenceMetrics, TrainingMetrics
+from .stage_timer import StageTimer
+from .tensor_bundle import BUNDLE_NAME, export_inference_bundle
+
 
 class HybridTrainer:
     """Trainer automático para modelos híbridos."""
@@ -51,14 +58,28 @@ class HybridTrainer:
         val_loader: DataLoader,
         test_loader: DataLoader,
         config: Dict,
-        device: str = 'cuda' if torch.cuda.is_available() else 'cpu'
+        device: str = 'cuda' if torch.cuda.is_available() else 'cpu',
+        epoch_callback: Optional[Callable[[int, Dict], None]] = None
     ):
+        """
+        Args:
+            model: Modelo a entrenar
+            train_loader: DataLoader de entrenamiento
+            val_loader: DataLoader de validación
+            test_loader: DataLoader de test
+            config: Configuración de entrenamiento
+            device: 'cuda' o 'cpu'
+            epoch_callback: Función (epoch, métricas) llamada al final de cada
+                época, p. ej. para reportar val_acc a una búsqueda de
+                hiperparámetros (puede lanzar una excepción para detenerla)
+        """
         self.model = model.to(device)
         self.train_loader = train_loader
         self.val_loader = val_loader
         self.test_loader = test_loader
         self.config = config
         self.device = device
+        self.epoch_callback = epoch_callback
         
         # Configurar optimizador
         self.optimizer = self._setup_optimizer()
@@ -69,13 +90,34 @@ class HybridTrainer:
         # Configurar scheduler
         self.scheduler = self._setup_scheduler()
         
+        # Augmentación por batch (si los loaders entregan imágenes uint8)
+        self.batch_augmenter = self._setup_batch_augmenter()
+        
+        # Acumulación de gradiente (batch efectivo = batch_size × pasos)
+        self.gradient_accumulation_steps = max(
+            1, int(config['training'].get('gradient_accumulation_steps', 1))
+        )
+        
+        # Tiempo por etapa del paso de entrenamiento
+        instrumentation = config['training'].get('instrumentation', {})
+        self.stage_timer = StageTimer(device, cuda_sync=instrumentation.get('cuda_sync', False))
+        self.last_stage_times = {}
+        
+        # `StepProfiler` opcional (ventana de pasos con torch.profiler)
+        self.step_profiler = None
+        
+        # Métricas en vivo (las sirve `MetricsServer` si se inició uno)
+        self.metrics = TrainingMetrics()
+        self.inference_metrics = InferenceMetrics(self.metrics.registry)
+        
         # Métricas
         self.history = {
             'train_loss': [],
             'train_acc': [],
             'val_loss': [],
             'val_acc': [],
-            'learning_rates': []
+            'learning_rates': [],
+            'stage_times': []
         }
         
         self.best_val_acc = 0.0
@@ -113,6 +155,36 @@ class HybridTrainer:
                 self.optimizer, mode='max', factor=0.5, patience=5
             )
     
+    def _setup_batch_augmenter(self):
+        """Crea el BatchAugmenter si la config usa augmentación por batch."""
+        image_aug = self.config.get('augmentation', {}).get('image', {})
+        if image_aug.get('batch_level', False):
+            return BatchAugmenter.from_config(image_aug)
+        return None
+    
+    def _prepare_batch(self, batch: Dict, train: bool) -> tuple:
+        """Mueve el batch al device y aplica augmentación por batch si aplica."""
+        images = batch['image'].to(self.device, non_blocking=True)
+        labels = batch['label'].to(self.device, non_blocking=True)
+        landmarks = batch.get('landmarks')
+        
+        if landmarks is not None:
+            landmarks = landmarks.to(self.device, non_blocking=True)
+        
+        if self.batch_augmenter is not None:
+            images, landmarks = self.batch_augmenter(images, landmarks, train=train)
+        
+        return images, labels, landmarks
+    
+    def _compute_loss(self, outputs: torch.Tensor, labels: torch.Tensor, batch: Dict) -> torch.Tensor:
+        """
+        Pérdida de entrenamiento del batch.
+        
+        Las subclases la sobrescriben para pérdidas que necesitan más que
+        las etiquetas (p. ej. logits de un teacher indexados por 'path').
+        """
+        return self.criterion(outputs, labels)
+    
     def train(self) -> Dict:
         """Entrena el modelo."""
         epochs = self.config['training']['epochs']
@@ -125,6 +197,7 @@ class HybridTrainer:
         
         for epoch in range(epochs):
             print(f"\nEpoch {epoch + 1}/{epochs}")
+            self.metrics.epoch.set(epoch + 1)
             
             # Entrenar
             train_loss, train_acc = self._train_epoch()
@@ -145,16 +218,32 @@ class HybridTrainer:
             self.history['val_loss'].append(val_loss)
             self.history['val_acc'].append(val_acc)
             self.history['learning_rates'].append(current_lr)
+            self.history['stage_times'].append(self.last_stage_times)
+            self.metrics.val_acc.set(val_acc)
+            self.metrics.val_loss.set(val_loss)
             
             # Imprimir progreso
             print(f"Train Loss: {train_loss:.4f} | Train Acc: {train_acc:.4f}")
             print(f"Val Loss: {val_loss:.4f} | Val Acc: {val_acc:.4f}")
             print(f"LR: {current_lr:.6f}")
+            if self.last_stage_times.get('steps'):
+                print(f"Etapas: {StageTimer.format(self.last_stage_times)}")
+            
+            if self.epoch_callback is not None:
+                self.epoch_callback(epoch, {
+                    'train_loss': train_loss,
+                    'train_acc': train_acc,
+                    'val_loss': val_loss,
+                    'val_acc': val_acc,
+                    'learning_rate': current_lr,
+                    'stage_times': self.last_stage_times
+                })
             
             # Early stopping
             if val_acc > self.best_val_acc:
                 self.best_val_acc = val_acc
                 self.epochs_without_improvement = 0
+                self.metrics.best_val_acc.set(val_acc)
                 print("Nueva mejor validación!")
             else:
                 self.epochs_without_improvement += 1
@@ -162,6 +251,9 @@ class HybridTrainer:
                     print(f"\nEarly stopping (sin mejora en {patience} epochs)")
                     break
         
+        if self.step_profiler is not None:
+            self.step_profiler.stop()
+        
         # Evaluación final en test
         print("\n" + "="*60)
         print("Evaluación Final en Test Set")
@@ -175,38 +267,82 @@ class HybridTrainer:
         }
     
     def _train_epoch(self) -> tuple:
-        """Entrena una época."""
+        """
+        Entrena una época.
+        
+        Deja en `self.last_stage_times` el tiempo por etapa del paso (la
+        copia al device incluye la augmentación por batch) y, si el dataset
+        tiene `load_stats`, el de decodificación/landmarks/transformaciones
+        sumado entre workers.
+        """
         self.model.train()
         total_loss = 0
         all_preds = []
         all_labels = []
         
-        pbar = tqdm(self.train_loader, desc="Training")
-        for batch in pbar:
-            images = batch['image'].to(self.device)
-            labels = batch['label'].to(self.device)
-            landmarks = batch.get('landmarks')
-            
-            if landmarks is not None:
-                landmarks = landmarks.to(self.device)
+        accumulation_steps = self.gradient_accumulation_steps
+        num_batches = len(self.train_loader)
+        # La última ventana puede quedar incompleta: se escala por sus batches reales
+        last_window_start = num_batches - num_batches % accumulation_steps
+        self.optimizer.zero_grad()
+        
+        timer = self.stage_timer
+        timer.reset()
+        timer.annotate = self.step_profiler is not None
+        load_stats = getattr(self.train_loader.dataset, 'load_stats', None)
+        loader_before = load_stats.snapshot() if load_stats is not None else None
+        
+        # Iterador propio para exponer la profundidad de su cola
+        loader_iter = iter(self.train_loader)
+        self.metrics.watch_loader(loader_iter, load_stats)
+        epoch_start = step_start = time.perf_counter()
+        num_samples = 0
+        
+        pbar = tqdm(loader_iter, total=num_batches, desc="Training")
+        for step, batch in enumerate(timer.iterate(pbar), 1):
+            with timer.stage('h2d'):
+                images, labels, landmarks = self._prepare_batch(batch, train=True)
             
             # Forward
-            self.optimizer.zero_grad()
-            outputs = self.model(images, landmarks)
-            loss = self.criterion(outputs, labels)
+            with timer.stage('forward'):
+                outputs = self.model(images, landmarks)
+                loss = self._compute_loss(outputs, labels, batch)
             
-            # Backward
-            loss.backward()
-            self.optimizer.step()
+            # Backward (pérdida escalada: gradiente del batch efectivo)
+            with timer.stage('backward'):
+                window = accumulation_steps if step <= last_window_start else num_batches - last_window_start
+                (loss / window).backward()
+            if step % accumulation_steps == 0 or step == num_batches:
+                with timer.stage('optimizer'):
+                    self.optimizer.step()
+                    self.optimizer.zero_grad()
             
             # Métricas
-            total_loss += loss.item()
-            preds = outputs.argmax(dim=1)
-            all_preds.extend(preds.cpu().numpy())
-            all_labels.extend(labels.cpu().numpy())
+            with timer.stage('metrics'):
+                loss_value = loss.item()
+                total_loss += loss_value
+                preds = outputs.argmax(dim=1)
+                all_preds.extend(preds.cpu().numpy())
+                all_labels.extend(labels.cpu().numpy())
             
             # Actualizar progress bar
-            pbar.set_postfix({'loss': loss.item()})
+            pbar.set_postfix({'loss': loss_value})
+            
+            now = time.perf_counter()
+            num_samples += labels.size(0)
+            self.metrics.observe_step(now - step_start, labels.size(0), loss_value)
+            step_start = now
+            
+            if self.step_profiler is not None:
+                self.step_profiler.step()
+        
+        self.metrics.watch_loader(None)
+        elapsed = time.perf_counter() - epoch_start
+        self.metrics.samples_per_second.set(num_samples / elapsed if elapsed else 0.0)
+        
+        self.last_stage_times = timer.summary()
+        if load_stats is not None:
+            self.last_stage_times['loader'] = LoadStats.delta(load_stats.snapshot(), loader_before)
         
         avg_loss = total_loss / len(self.train_loader)
         accuracy = accuracy_score(all_labels, all_preds)
@@ -222,12 +358,7 @@ class HybridTrainer:
         
         with torch.no_grad():
             for batch in tqdm(self.val_loader, desc="Validation"):
-                images = batch['image'].to(self.device)
-                labels = batch['label'].to(self.device)
-                landmarks = batch.get('landmarks')
-                
-                if landmarks is not None:
-                    landmarks = landmarks.to(self.device)
+                images, labels, landmarks = self._prepare_batch(batch, train=False)
                 
                 outputs = self.model(images, landmarks)
                 loss = self.criterion(outputs, labels)
@@ -248,17 +379,14 @@ class HybridTrainer:
         all_preds = []
         all_labels = []
         all_probs = []
+        model_name = self.config['model'].get('backbone', 'model')
         
         with torch.no_grad():
             for batch in tqdm(self.test_loader, desc="Testing"):
-                images = batch['image'].to(self.device)
-                labels = batch['label'].to(self.device)
-                landmarks = batch.get('landmarks')
+                images, labels, landmarks = self._prepare_batch(batch, train=False)
                 
-                if landmarks is not None:
-                    landmarks = landmarks.to(self.device)
-                
-                outputs = self.model(images, landmarks)
+                with self.inference_metrics.track(model_name, batch_size=len(labels)):
+                    outputs = self.model(images, landmarks)
                 probs = torch.softmax(outputs, dim=1)
                 preds = outputs.argmax(dim=1)
                 
@@ -293,8 +421,17 @@ class HybridTrainer:
         
         return metrics
     
-    def save_model(self, save_path: str):
-        """Guarda el modelo."""
+    def save_model(self, save_path: str, extra: Optional[Dict] = None, bundle: bool = False):
+        """
+        Guarda el modelo.
+        
+        Args:
+            save_path: Ruta del checkpoint
+            extra: Entradas adicionales del checkpoint (p. ej. 'channel_plan'
+                de un modelo podado, necesario para reconstruirlo)
+            bundle: Exportar también `model.bundle` junto al checkpoint
+                (pesos para inferencia cargados con mmap, sin optimizador)
+        """
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
         
         torch.save({
@@ -302,10 +439,17 @@ class HybridTrainer:
             'optimizer_state_dict': self.optimizer.state_dict(),
             'config': self.config,
             'history': self.history,
-            'best_val_acc': self.best_val_acc
+            'best_val_acc': self.best_val_acc,
+            **(extra or {})
         }, save_path)
         
         print(f"Modelo guardado en: {save_path}")
+        
+        if bundle:
+            bundle_path = export_inference_bundle(
+                self.model, Path(save_path).parent / BUNDLE_NAME, self.config, extra
+            )
+            print(f"Bundle de inferencia: {bundle_path}")
     
     def plot_training_history(self, save_dir: str):
         """Genera gráficas del entrenamiento."""
@@ -0,0 +1,590 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : hyperparameter_search.py                                   *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:33                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Búsqueda de hiperparámetros con Optuna (trials en paralelo y poda temprana).
+
+El estado del estudio vive en un SQLite local, así que varios procesos
+worker pueden ejecutar trials a la vez y la búsqueda se puede reanudar.
+Cada trial entrena un `HybridTrainer` y reporta val_acc por época; los
+trials que van por debajo de la mediana se podan tras unas épocas de
+calentamiento.
+
+Lo que no cambia entre trials se calcula una sola vez:
+    - Landmarks: caché en disco compartida (`LandmarkCache`).
+    - Backbone congelado: las features del backbone pre-entrenado se
+      extraen una vez por backbone y los trials solo entrenan la rama de
+      landmarks y el clasificador.
+"""
+
+import os
+import copy
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import yaml
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader, Dataset
+
+# Espacio de búsqueda por defecto (se puede sobrescribir en config['search']['space'])
+DEFAULT_SEARCH_SPACE = {
+    'learning_rate': {'type': 'float', 'low': 1e-5, 'high': 1e-2, 'log': True},
+    'optimizer': {'type': 'categorical', 'choices': ['adam', 'adamw', 'sgd']},
+    'batch_size': {'type': 'categorical', 'choices': [16, 32, 64]},
+    'dropout': {'type': 'float', 'low': 0.2, 'high': 0.6}
+}
+
+# Dónde se escribe cada hiperparámetro dentro de la configuración
+PARAM_PATHS = {
+    'learning_rate': ('training', 'learning_rate'),
+    'optimizer': ('training', 'optimizer'),
+    'scheduler': ('training', 'scheduler'),
+    'batch_size': ('dataset', 'batch_size'),
+    'gradient_accumulation_steps': ('training', 'gradient_accumulation_steps'),
+    'dropout': ('model', 'dropout'),
+    'backbone': ('model', 'backbone')
+}
+
+_IMAGENET_MEAN = [0.485, 0.456, 0.406]
+_IMAGENET_STD = [0.229, 0.224, 0.225]
+
+
+def _require_optuna():
+    try:
+        import optuna
+    except ImportError:
+        raise ImportError(
+            "La búsqueda de hiperparámetros requiere optuna: pip install -e .[auto]"
+        )
+    return optuna
+
+
+def suggest_config(trial, base_config: Dict, space: Dict) -> Dict:
+    """Copia de la configuración con los hiperparámetros sugeridos por el trial."""
+    config = copy.deepcopy(base_config)
+    
+    for name, spec in space.items():
+        if spec['type'] == 'float':
+            value = trial.suggest_float(name, spec['low'], spec['high'], log=spec.get('log', False))
+        elif spec['type'] == 'int':
+            value = trial.suggest_int(name, spec['low'], spec['high'], log=spec.get('log', False))
+        elif spec['type'] == 'categorical':
+            value = trial.suggest_categorical(name, spec['choices'])
+        else:
+            raise ValueError(f"Tipo de hiperparámetro no soportado: {spec['type']}")
+        
+        section, key = PARAM_PATHS.get(name, ('training', name))
+        config.setdefault(section, {})[key] = value
+    
+    return config
+
+
+def build_model(config: Dict, frozen_features: bool = False, pretrained: Optional[bool] = None):
+    """
+    Construye el `SimpleHybridModel` de la configuración.
+    
+    Con `frozen_features` el backbone se reemplaza por la identidad: el modelo
+    recibe las features ya extraídas en lugar de la imagen.
+    """
+    from algorithms.deep.simple_hybrid_model import SimpleHybridModel
+    
+    model = SimpleHybridModel(
+        num_classes=config['dataset']['num_classes'],
+        backbone=config['model']['backbone'],
+        use_landmarks=config['model']['use_landmarks'],
+        pretrained=config['model']['pretrained'] if pretrained is None else pretrained,
+        dropout=config['model'].get('dropout', 0.5)
+    )
+    if frozen_features:
+        model.visual_backbone = nn.Identity()
+    return model
+
+
+class _FeatureDataset(Dataset):
+    """Features del backbone + landmarks con el formato de batch del trainer."""
+    
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.features = torch.from_numpy(arrays['features'])
+        self.landmarks = torch.from_numpy(arrays['landmarks'])
+        self.labels = torch.from_numpy(arrays['labels'])
+    
+    def __len__(self) -> int:
+        return len(self.labels)
+    
+    def __getitem__(self, idx: int) -> Dict:
+        return {
+            'image': self.features[idx],
+            'landmarks': self.landmarks[idx],
+            'label': self.labels[idx]
+        }
+
+
+class FrozenFeatureCache:
+    """
+    Features de un backbone congelado, extraídas una vez por backbone.
+    
+    Se guardan en `<cache_dir>/<backbone>_<huella>_<split>.npz`; la huella
+    cambia si cambia la configuración de datos o el índice de muestras.
+    """
+    
+    SPLITS = ('train', 'val', 'test')
+    
+    def __init__(self, cache_dir: str, data_config_path: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.data_config_path = str(data_config_path)
+        self.fingerprint = self._fingerprint()
+    
+    def _fingerprint(self) -> str:
+        """Huella de la configuración de datos y de los archivos del índice."""
+        digest = hashlib.sha1()
+        with open(self.data_config_path, 'rb') as f:
+            content = f.read()
+        digest.update(content)
+        
+        data_config = yaml.safe_load(content)
+        base_dir = Path(self.data_config_path).parent
+        for key in ('sample_index', 'sample_splits'):
+            if data_config.get(key):
+                stat = (base_dir / data_config[key]).stat()
+                digest.update(f"{key}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()[:12]
+    
+    def path(self, backbone: str, split: str) -> Path:
+        return self.cache_dir / f"{backbone}_{self.fingerprint}_{split}.npz"
+    
+    def has(self, backbone: str) -> bool:
+        return all(self.path(backbone, split).exists() for split in self.SPLITS)
+    
+    def build(
+        self,
+        config: Dict,
+        backbone: str,
+        landmark_cache_dir: Optional[str] = None,
+        batch_size: int = 64,
+        num_workers: int = 0,
+        device: Optional[str] = None
+    ):
+        """Extrae y guarda las features de los tres splits (sin augmentación)."""
+        from torchvision import transforms
+        from data.loaders import UniversalImageDataset, LandmarkCache, load_sample_index
+        
+        if self.has(backbone):
+            return
+        
+        device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        with open(self.data_config_path, 'r', encoding='utf-8') as f:
+            data_config = yaml.safe_load(f)
+        
+        transform = transforms.Compose([
+            transforms.Resize((224, 224)),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=_IMAGENET_MEAN, std=_IMAGENET_STD)
+        ])
+        extract_landmarks = config['features']['landmarks']['enabled']
+        landmark_cache = LandmarkCache(landmark_cache_dir) if extract_landmarks and landmark_cache_dir else None
+        sample_index = load_sample_index(data_config, self.data_config_path)
+        
+        model_config = copy.deepcopy(config)
+        model_config['model']['backbone'] = backbone
+        backbone_model = build_model(model_config, pretrained=True).visual_backbone.to(device).eval()
+        
+        print(f"Extrayendo features del backbone congelado ({backbone})...")
+        for split in self.SPLITS:
+            dataset = UniversalImageDataset(
+                data_config, split=split,
+                transform=transform,
+                extract_landmarks=extract_landmarks,
+                landmark_cache=landmark_cache,
+                sample_index=sample_index
+            )
+            loader = DataLoader(dataset, batch_size=batch_size, num_workers=num_workers)
+            
+            features, landmarks, labels = [], [], []
+            with torch.no_grad():
+                for batch in loader:
+                    features.append(backbone_model(batch['image'].to(device)).cpu().numpy())
+                    landmarks.append(batch['landmarks'].numpy())
+                    labels.append(batch['label'].numpy())
+            
+            # Escritura atómica: otro proceso puede estar leyendo la caché
+            path = self.path(backbone, split)
+            tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+            np.savez(
+                tmp_path,
+                features=np.concatenate(features).astype(np.float32),
+                landmarks=np.concatenate(landmarks).astype(np.float32),
+                labels=np.concatenate(labels).astype(np.int64)
+            )
+            os.replace(tmp_path, path)
+            print(f"  {split}: {len(dataset)} muestras")
+    
+    def loaders(self, backbone: str, batch_size: int) -> Dict[str, DataLoader]:
+        """DataLoaders sobre las features guardadas."""
+        loaders = {}
+        for split in self.SPLITS:
+            with np.load(self.path(backbone, split)) as arrays:
+                dataset = _FeatureDataset(dict(arrays))
+            loaders[split] = DataLoader(
+                dataset, batch_size=batch_size,
+                shuffle=(split == 'train'), drop_last=(split == 'train')
+            )
+        return loaders
+
+
+class _TrialObjective:
+    """Entrena un trial y retorna su mejor val_acc."""
+    
+    def __init__(self, search: 'HyperparameterSearch', num_workers: int):
+        self.search = search
+        self.num_workers = num_workers
+    
+    def _create_loaders(self, config: Dict) -> Dict[str, DataLoader]:
+        from data.loaders.universal_loader import create_data_loaders
+        
+        if self.search.feature_cache is not None:
+            return self.search.feature_cache.loaders(
+                config['model']['backbone'], config['dataset']['batch_size']
+            )
+        
+        video_aug = config.get('augmentation', {}).get('video', {})
+        variable_length = video_aug.get('temporal_sampling') == 'fps'
+        return create_data_loaders(
+            config_path=self.search.data_config_path,
+            batch_size=config['dataset']['batch_size'],
+            num_workers=self.num_workers,
+            extract_landmarks=config['features']['landmarks']['enabled'],
+            video_target_fps=video_aug.get('target_fps') if variable_length else None,
+            video_max_frames=video_aug.get('max_frames', 90),
+            prefetch_factor=config['dataset'].get('prefetch_factor', 2),
+            pin_memory=config['dataset'].get('pin_memory'),
+            batch_augmentation=config['augmentation']['image'].get('batch_level', False),
+            landmark_cache_dir=self.search.landmark_cache_dir
+        )
+    
+    def __call__(self, trial) -> float:
+        from .hybrid_trainer import HybridTrainer
+        
+        optuna = _require_optuna()
+        search = self.search
+        config = suggest_config(trial, search.base_config, search.space)
+        
+        loaders = self._create_loaders(config)
+        model = build_model(config, frozen_features=search.feature_cache is not None)
+        
+        def report(epoch: int, metrics: Dict):
+            trial.report(metrics['val_acc'], epoch + 1)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        
+        trainer_config = config
+        if search.feature_cache is not None:
+            # Los batches traen features [B, D], no imágenes: sin augmentación
+            # por batch (el config del trial no cambia)
+            trainer_config = copy.deepcopy(config)
+            trainer_config['augmentation']['image']['batch_level'] = False
+        
+        trainer = HybridTrainer(
+            model=model,
+            train_loader=loaders['train'],
+            val_loader=loaders['val'],
+            test_loader=loaders['test'],
+            config=trainer_config,
+            epoch_callback=report
+        )
+        results = trainer.train()
+        
+        # Artefactos del trial (para registrar el mejor al final)
+        trial_dir = search.trial_dir(trial.number)
+        trainer.save_model(trial_dir / 'model.pth')
+        test_metrics = results['test_metrics']
+        np.savez(
+            trial_dir / 'predictions.npz',
+            predictions=np.asarray(test_metrics['predictions']),
+            labels=np.asarray(test_metrics['labels'])
+        )
+        with open(trial_dir / 'metrics.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                k: v for k, v in test_metrics.items()
+                if k not in ['predictions', 'labels', 'probabilities']
+            }, f, indent=2)
+        
+        trial.set_user_attr('epochs', len(trainer.history['val_acc']))
+        trial.set_user_attr('test_accuracy', test_metrics['test_accuracy'])
+        return trainer.best_val_acc
+
+
+def _search_worker(search: 'HyperparameterSearch', worker_id: int, n_trials: int, num_threads: int):
+    """
+    Proceso worker: ejecuta `n_trials` trials del estudio compartido.
+    
+    Un trial que falla (p. ej. sin memoria) queda como FAIL en el estudio y
+    el worker continúa con el siguiente.
+    """
+    torch.set_num_threads(num_threads)
+    study = search.load_study(seed_offset=worker_id)
+    study.optimize(
+        _TrialObjective(search, search.loader_workers_per_trial),
+        n_trials=n_trials,
+        catch=(Exception,),
+        gc_after_trial=True
+    )
+
+
+class HyperparameterSearch:
+    """Búsqueda de hiperparámetros de `HybridTrainer` sobre un estudio Optuna."""
+    
+    def __init__(
+        self,
+        config: Dict,
+        data_config_path: str,
+        study_name: Optional[str] = None,
+        output_dir: str = 'history/search',
+        n_trials: int = 20,
+        n_workers: int = 1,
+        epochs: Optional[int] = None,
+        warmup_epochs: int = 2,
+        freeze_backbone: bool = False,
+        space: Optional[Dict] = None,
+        seed: int = 42
+    ):
+        """
+        Args:
+            config: Configuración base (training_config.yaml)
+            data_config_path: Ruta a data_loaders_config.yaml
+            study_name: Nombre del estudio (None = fecha y hora); si ya existe
+                en el almacenamiento, la búsqueda se reanuda
+            output_dir: Directorio de estudios (SQLite y artefactos por trial)
+            n_trials: Número total de trials
+            n_workers: Procesos que ejecutan trials en paralelo
+            epochs: Épocas por trial (None = las de la configuración)
+            warmup_epochs: Épocas antes de poder podar un trial
+            freeze_backbone: Entrenar solo landmarks + clasificador sobre
+                features pre-extraídas del backbone (solo datasets de imágenes)
+            space: Espacio de búsqueda (None = config['search']['space'] o el
+                espacio por defecto)
+            seed: Semilla del sampler
+        """
+        _require_optuna()
+        
+        self.base_config = copy.deepcopy(config)
+        if epochs is not None:
+            self.base_config['training']['epochs'] = epochs
+        
+        self.data_config_path = str(data_config_path)
+        self.study_name = study_name or datetime.now().strftime('search_%Y%m%d_%H%M%S')
+        self.study_dir = Path(output_dir) / self.study_name
+        self.study_dir.mkdir(parents=True, exist_ok=True)
+        self.storage_url = f"sqlite:///{(self.study_dir / 'study.db').resolve()}"
+        
+        self.n_trials = n_trials
+        self.n_workers = max(1, min(n_workers, n_trials))
+        self.warmup_epochs = warmup_epochs
+        self.seed = seed
+        self.space = space or config.get('search', {}).get('space') or DEFAULT_SEARCH_SPACE
+        
+        # Los workers del DataLoader se reparten entre los trials simultáneos
+        self.loader_workers_per_trial = config['dataset']['num_workers'] // self.n_workers
+        self.landmark_cache_dir = config['features']['landmarks'].get('cache_dir')
+        
+        self.feature_cache = None
+        if freeze_backbone:
+            with open(self.data_config_path, 'r', encoding='utf-8') as f:
+                dataset_type = yaml.safe_load(f)['dataset_type']
+            if dataset_type == 'image':
+                self.feature_cache = FrozenFeatureCache(
+                    Path(config.get('search', {}).get('feature_cache_dir', 'cache/features')),
+                    self.data_config_path
+                )
+            else:
+                print("Aviso: backbone congelado solo disponible para imágenes; se entrena completo")
+    
+    def _storage(self):
+        optuna = _require_optuna()
+        # Timeout alto: varios procesos escriben en el mismo SQLite
+        return optuna.storages.RDBStorage(
+            url=self.storage_url,
+            engine_kwargs={'connect_args': {'timeout': 60}}
+        )
+    
+    def _sampler_and_pruner(self, seed_offset: int):
+        optuna = _require_optuna()
+        # constant_liar: los trials en curso cuentan como malos para no repetirlos
+        sampler = optuna.samplers.TPESampler(seed=self.seed + seed_offset, constant_liar=True)
+        pruner = optuna.pruners.MedianPruner(
+            n_startup_trials=self.n_workers,
+            n_warmup_steps=self.warmup_epochs
+        )
+        return sampler, pruner
+    
+    def load_study(self, seed_offset: int = 0):
+        """Crea o abre el estudio en el almacenamiento SQLite."""
+        optuna = _require_optuna()
+        sampler, pruner = self._sampler_and_pruner(seed_offset)
+        return optuna.create_study(
+            study_name=self.study_name,
+            storage=self._storage(),
+            direction='maximize',
+            sampler=sampler,
+            pruner=pruner,
+            load_if_exists=True
+        )
+    
+    def trial_dir(self, number: int) -> Path:
+        trial_dir = self.study_dir / f"trial_{number:04d}"
+        trial_dir.mkdir(parents=True, exist_ok=True)
+        return trial_dir
+    
+    def _prepare_shared_features(self):
+        """Extrae una vez las features de cada backbone del espacio de búsqueda."""
+        if self.feature_cache is None:
+            return
+        backbone_spec = self.space.get('backbone')
+        backbones = backbone_spec['choices'] if backbone_spec else [self.base_config['model']['backbone']]
+        for backbone in backbones:
+            self.feature_cache.build(
+                self.base_config, backbone,
+                landmark_cache_dir=self.landmark_cache_dir,
+                num_workers=self.base_config['dataset']['num_workers']
+            )
+    
+    def run(self) -> Dict:
+        """
+        Ejecuta la búsqueda.
+        
+        Returns:
+            Resumen del estudio (mejor trial y estado de cada trial)
+        """
+        import multiprocessing as mp
+        
+        study = self.load_study()
+        self._prepare_shared_features()
+        
+        print(f"\nEstudio: {self.study_name} ({self.storage_url})")
+        print(f"Trials: {self.n_trials} | Workers: {self.n_workers}")
+        
+        if self.n_workers == 1:
+            study.optimize(
+                _TrialObjective(self, self.loader_workers_per_trial),
+                n_trials=self.n_trials,
+                catch=(Exception,),
+                gc_after_trial=True
+            )
+        else:
+            # Reparto de trials y de hilos de CPU entre procesos
+            per_worker = [
+                self.n_trials // self.n_workers + (i < self.n_trials % self.n_workers)
+                for i in range(self.n_workers)
+            ]
+            num_threads = max(1, (os.cpu_count() or 1) // self.n_workers)
+            
+            context = mp.get_context('spawn')
+            processes = [
+                context.Process(
+                    target=_search_worker,
+                    args=(self, worker_id + 1, n_trials, num_threads)
+                )
+                for worker_id, n_trials in enumerate(per_worker)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+        
+        summary = self.summary(study)
+        with open(self.study_dir / 'study_summary.json', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        return summary
+    
+    def summary(self, study=None) -> Dict:
+        """Resumen del estudio desde el almacenamiento."""
+        optuna = _require_optuna()
+        study = study or self.load_study()
+        
+        trials = [
+            {
+                'number': t.number,
+                'state': t.state.name,
+                'value': t.value,
+                'params': t.params,
+                'epochs': t.user_attrs.get('epochs', len(t.intermediate_values))
+            }
+            for t in study.trials
+        ]
+        completed = study.get_trials(deepcopy=False, states=[optuna.trial.TrialState.COMPLETE])
+        
+        summary = {
+            'study_name': self.study_name,
+            'storage': self.storage_url,
+            'created_at': datetime.now().isoformat(),
+            'frozen_backbone': self.feature_cache is not None,
+            'space': self.space,
+            'n_complete': len(completed),
+            'n_pruned': sum(t['state'] == 'PRUNED' for t in trials),
+            'trials': trials,
+            'best_trial': None
+        }
+        if completed:
+            best = study.best_trial
+            summary['best_trial'] = {
+                'number': best.number,
+                'val_acc': best.value,
+                'params': best.params,
+                'dir': str(self.trial_dir(best.number))
+            }
+        return summary
+    
+    def best_trial_config(self, summary: Dict) -> Dict:
+        """Configuración completa del mejor trial."""
+        config = copy.deepcopy(self.base_config)
+        for name, value in summary['best_trial']['params'].items():
+            section, key = PARAM_PATHS.get(name, ('training', name))
+            config.setdefault(section, {})[key] = value
+        return config
+    
+    def load_best_model(self, summary: Dict):
+        """
+        Modelo completo del mejor trial.
+        
+        Con backbone congelado se combinan el backbone pre-entrenado y las
+        capas entrenadas en el trial.
+        """
+        config = self.best_trial_config(summary)
+        checkpoint = torch.load(
+            Path(summary['best_trial']['dir']) / 'model.pth',
+            map_location='cpu', weights_only=False
+        )
+        model = build_model(config, pretrained=self.feature_cache is not None)
+        missing, unexpected = model.load_state_dict(
+            checkpoint['model_state_dict'], strict=self.feature_cache is None
+        )
+        if unexpected or any(not key.startswith('visual_backbone.') for key in missing):
+            raise RuntimeError("El checkpoint del trial no coincide con el modelo")
+        return model, config, checkpoint
@@ -0,0 +1,268 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : profiling.py                                               *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:52                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Captura con `torch.profiler` de una ventana de pasos de entrenamiento o de
+la inferencia de una versión registrada.
+
+Cada captura exporta un trace de Chrome (abrir en chrome://tracing o
+https://ui.perfetto.dev) y una tabla con los operadores más costosos,
+agrupados por nombre y por forma de entrada.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import torch
+from torch.profiler import ProfilerActivity, profile, schedule
+
+
+def parse_step_range(value: str) -> Tuple[int, int]:
+    """
+    Convierte 'inicio-fin' (pasos desde 1, ambos incluidos) en una tupla.
+    
+    Un solo número ('30') captura solo ese paso.
+    """
+    parts = value.split('-')
+    try:
+        if len(parts) == 1:
+            start = end = int(parts[0])
+        elif len(parts) == 2:
+            start, end = int(parts[0]), int(parts[1])
+        else:
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"Rango de pasos inválido: '{value}' (usa inicio-fin, p. ej. 20-40)")
+    
+    if start < 1 or end < start:
+        raise ValueError(f"Rango de pasos inválido: '{value}' (inicio >= 1 y fin >= inicio)")
+    return start, end
+
+
+def _activities(device: str) -> List[ProfilerActivity]:
+    activities = [ProfilerActivity.CPU]
+    if str(device).startswith('cuda') and torch.cuda.is_available():
+        activities.append(ProfilerActivity.CUDA)
+    return activities
+
+
+def _top_ops(prof, device: str, row_limit: int) -> List[Dict]:
+    """Operadores ordenados por tiempo propio (GPU si hay, si no CPU)."""
+    use_cuda = str(device).startswith('cuda') and torch.cuda.is_available()
+    
+    rows = []
+    for event in prof.key_averages():
+        row = {
+            'name': event.key,
+            'calls': event.count,
+            'self_cpu_ms': round(event.self_cpu_time_total / 1000, 3),
+            'cpu_total_ms': round(event.cpu_time_total / 1000, 3),
+            'self_cpu_memory_mb': round(event.self_cpu_memory_usage / 1024 ** 2, 3)
+        }
+        if use_cuda:
+            row['self_cuda_ms'] = round(getattr(event, 'self_device_time_total', 0) / 1000, 3)
+            row['self_cuda_memory_mb'] = round(
+                getattr(event, 'self_device_memory_usage', 0) / 1024 ** 2, 3
+            )
+        rows.append(row)
+    
+    sort_key = 'self_cuda_ms' if use_cuda else 'self_cpu_ms'
+    rows.sort(key=lambda r: r[sort_key], reverse=True)
+    return rows[:row_limit]
+
+
+def export_profile(
+    prof,
+    output_dir: str,
+    prefix: str,
+    device: str = 'cpu',
+    row_limit: int = 30,
+    metadata: Optional[Dict] = None
+) -> Dict:
+    """
+    Exporta una captura terminada.
+    
+    Archivos (en `output_dir`):
+        <prefix>_trace.json: Trace de Chrome
+        <prefix>_top_ops.txt: Tabla por operador y por forma de entrada
+        <prefix>_top_ops.json: Top de operadores + metadatos de la captura
+    
+    Returns:
+        Rutas de los archivos generados
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    use_cuda = str(device).startswith('cuda') and torch.cuda.is_available()
+    sort_by = 'self_cuda_time_total' if use_cuda else 'self_cpu_time_total'
+    
+    trace_path = output_dir / f'{prefix}_trace.json'
+    prof.export_chrome_trace(str(trace_path))
+    
+    table_path = output_dir / f'{prefix}_top_ops.txt'
+    with open(table_path, 'w', encoding='utf-8') as f:
+        f.write("Operadores (ordenados por tiempo propio)\n\n")
+        f.write(prof.key_averages().table(sort_by=sort_by, row_limit=row_limit))
+        f.write("\n\nOperadores por forma de entrada\n\n")
+        f.write(prof.key_averages(group_by_input_shape=True).table(sort_by=sort_by, row_limit=row_limit))
+    
+    json_path = output_dir / f'{prefix}_top_ops.json'
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            **(metadata or {}),
+            'device': str(device),
+            'sorted_by': sort_by,
+            'top_ops': _top_ops(prof, device, row_limit)
+        }, f, indent=2, ensure_ascii=False)
+    
+    return {'trace': str(trace_path), 'table': str(table_path), 'summary': str(json_path)}
+
+
+class StepProfiler:
+    """
+    Perfila una ventana de pasos de entrenamiento.
+    
+    El trainer llama `step()` al terminar cada paso (la cuenta sigue entre
+    épocas) y `stop()` al terminar el entrenamiento. Con la ventana 20-40 el
+    paso 19 se usa de calentamiento y se capturan del 20 al 40.
+    """
+    
+    def __init__(
+        self,
+        step_range: Tuple[int, int],
+        output_dir: str,
+        device: str = 'cpu',
+        prefix: str = 'train',
+        row_limit: int = 30
+    ):
+        """
+        Args:
+            step_range: (inicio, fin), pasos desde 1, ambos incluidos
+            output_dir: Directorio de salida de la captura
+            device: Device del entrenamiento
+            prefix: Prefijo de los archivos exportados
+            row_limit: Filas de la tabla de operadores
+        """
+        self.start, self.end = step_range
+        self.output_dir = Path(output_dir)
+        self.device = device
+        self.prefix = prefix
+        self.row_limit = row_limit
+        self.exported = None
+        self.global_step = 0
+        
+        warmup = 1 if self.start > 1 else 0
+        self._profiler = profile(
+            activities=_activities(device),
+            schedule=schedule(
+                wait=self.start - 1 - warmup,
+                warmup=warmup,
+                active=self.end - self.start + 1,
+                repeat=1
+            ),
+            on_trace_ready=self._export,
+            record_shapes=True,
+            profile_memory=True
+        )
+        self._profiler.start()
+    
+    def _export(self, prof):
+        self.exported = export_profile(
+            prof,
+            self.output_dir,
+            self.prefix,
+            device=self.device,
+            row_limit=self.row_limit,
+            metadata={'steps': [self.start, self.end]}
+        )
+        print(f"\nPerfil de pasos {self.start}-{self.end} guardado en: {self.output_dir}")
+    
+    def step(self):
+        self.global_step += 1
+        self._profiler.step()
+    
+    def stop(self):
+        """
+        Cierra el profiler. Si el entrenamiento terminó dentro de la ventana
+        se exporta lo capturado hasta ahí.
+        """
+        if self._profiler is None:
+            return
+        self._profiler.stop()
+        self._profiler = None
+        if self.exported is None:
+            print(f"\nEl entrenamiento terminó en el paso {self.global_step}: "
+                  f"no se alcanzó la ventana de perfilado {self.start}-{self.end}")
+
+
+def profile_inference(
+    model: torch.nn.Module,
+    output_dir: str,
+    device: str = 'cpu',
+    batch_size: int = 1,
+    iterations: int = 20,
+    warmup: int = 5,
+    row_limit: int = 30,
+    metadata: Optional[Dict] = None
+) -> Dict:
+    """
+    Perfila el forward de un modelo con entradas sintéticas (imagen 224×224
+    y 126 landmarks), como `measure_latency`.
+    
+    Returns:
+        Rutas de los archivos generados (prefijo 'inference')
+    """
+    model = model.to(device).eval()
+    images = torch.randn(batch_size, 3, 224, 224, device=device)
+    landmarks = torch.rand(batch_size, 126, device=device)
+    
+    with torch.no_grad():
+        for _ in range(warmup):
+            model(images, landmarks)
+        
+        with profile(
+            activities=_activities(device),
+            record_shapes=True,
+            profile_memory=True
+        ) as prof:
+            for _ in range(iterations):
+                with torch.profiler.record_function('inference/forward'):
+                    model(images, landmarks)
+            if str(device).startswith('cuda'):
+                torch.cuda.synchronize()
+    
+    return export_profile(
+        prof,
+        output_dir,
+        'inference',
+        device=device,
+        row_limit=row_limit,
+        metadata={
+            **(metadata or {}),
+            'batch_size': batch_size,
+            'iterations': iterations
+        }
+    )
@@ -0,0 +1,111 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : stage_timer.py                                             *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 02:52                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Cronómetro por etapa del paso de entrenamiento.
+
+Separa el tiempo de una época en espera de datos, copia al device, forward,
+backward, paso del optimizador y actualización de métricas, para saber si
+una época lenta está limitada por los datos o por el cómputo.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator
+
+import torch
+
+
+class StageTimer:
+    """Acumula segundos por etapa con `perf_counter` (costo despreciable)."""
+    
+    STAGES = ('data_wait', 'h2d', 'forward', 'backward', 'optimizer', 'metrics')
+    
+    def __init__(self, device: str = 'cpu', cuda_sync: bool = False):
+        """
+        Args:
+            device: Device del entrenamiento
+            cuda_sync: Sincronizar CUDA al cerrar cada etapa. Sin
+                sincronizar, el trabajo de GPU se atribuye a la etapa que
+                espera su resultado (normalmente 'metrics', por `loss.item()`)
+        """
+        self.cuda_sync = cuda_sync and str(device).startswith('cuda')
+        # Marcar cada etapa en el trace de torch.profiler (solo al perfilar)
+        self.annotate = False
+        self.totals = {}
+        self.steps = 0
+        self.reset()
+    
+    def reset(self):
+        self.totals = {stage: 0.0 for stage in self.STAGES}
+        self.steps = 0
+    
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            if self.annotate:
+                with torch.profiler.record_function(f'train/{name}'):
+                    yield
+            else:
+                yield
+        finally:
+            if self.cuda_sync:
+                torch.cuda.synchronize()
+            self.totals[name] += time.perf_counter() - start
+    
+    def iterate(self, iterable: Iterable) -> Iterator:
+        """Itera el loader acumulando la espera de cada batch en 'data_wait'."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.totals['data_wait'] += time.perf_counter() - start
+            self.steps += 1
+            yield item
+    
+    def summary(self) -> Dict:
+        """Segundos, ms por paso y fracción del total de cada etapa."""
+        total = sum(self.totals.values())
+        result = {'steps': self.steps, 'total_s': round(total, 4)}
+        for stage, seconds in self.totals.items():
+            result[stage] = {
+                'seconds': round(seconds, 4),
+                'ms_per_step': round(seconds * 1000 / self.steps, 3) if self.steps else 0.0,
+                'fraction': round(seconds / total, 4) if total else 0.0
+            }
+        return result
+    
+    @staticmethod
+    def format(summary: Dict) -> str:
+        """Resumen de una línea: etapa ms/paso (porcentaje)."""
+        parts = [
+            f"{stage} {summary[stage]['ms_per_step']:.1f}ms ({summary[stage]['fraction']:.0%})"
+            for stage in StageTimer.STAGES
+        ]
+        return ' | '.join(parts)
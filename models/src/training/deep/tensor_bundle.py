@@ -0,0 +1,157 @@
+# ======================================================                     *
+#  Project      : deep                                                       *
+#  File         : tensor_bundle.py                                           *
+#  Team         : Equipo Jña'a Ri Y'ë'ë                                      *
+#  Developer    : Axel Eduardo Urbina Secundino                              *
+#  Created      : 2026-10-19                                                 *
+#  Last Updated : 2026-10-19 03:09                                           *
+# ======================================================                     *
+#                                                                            *
+#  License:                                                                  *
+# © 2026 Equipo Jña'a Ri Y'ë'ë                                               *
+#                                                                            *
+# Este software y su código fuente son propiedad exclusiva                   *
+# del equipo Jña'a Ri Y'ë'ë.                                                 *
+#                                                                            *
+# Uso permitido únicamente para:                                             *
+# - Evaluación académica                                                     *
+# - Revisión técnica                                                         *
+# - Convocatorias, hackatones o concursos                                    *
+#                                                                            *
+# Queda prohibida la copia, modificación, redistribución                     *
+# o uso sin autorización expresa del equipo.                                 *
+#                                                                            *
+# El software se proporciona "tal cual", sin garantías.                      *
+
+"""
+Formato de pesos para inferencia que se carga con mmap, sin copias.
+
+Estructura del archivo (`model.bundle`):
+    8 bytes   magic b'JNAATB01'
+    8 bytes   largo del header (uint64 little-endian)
+    header    JSON: metadatos (config, plan de canales, ...) y, por tensor,
+              dtype, forma, offset y bytes dentro de la región de datos
+    datos     Bytes crudos de cada tensor, alineados a 64 bytes
+
+Al cargar, el archivo se mapea completo y cada tensor es una vista de ese
+mapeo: el arranque no lee pesos hasta que se usan y varios procesos de
+servicio en el mismo host comparten las páginas a través del page cache.
+No incluye el estado del optimizador.
+"""
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import torch
+
+from core.version_manager import NumpyEncoder
+
+
+MAGIC = b'JNAATB01'
+ALIGNMENT = 64
+BUNDLE_NAME = 'model.bundle'
+
+_DTYPES = {
+    str(dtype).replace('torch.', ''): dtype
+    for dtype in (
+        torch.float32, torch.float16, torch.bfloat16, torch.float64,
+        torch.int64, torch.int32, torch.int16, torch.int8, torch.uint8, torch.bool
+    )
+}
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_bundle(path: str, state_dict: Dict[str, torch.Tensor], metadata: Optional[Dict] = None) -> Path:
+    """
+    Escribe un bundle (de forma atómica: archivo temporal + rename).
+    
+    Args:
+        path: Ruta del bundle
+        state_dict: Tensores a guardar (se copian a CPU contiguos)
+        metadata: Datos serializables a JSON (p. ej. config del modelo)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    tensors = {}
+    entries = {}
+    offset = 0
+    for name, tensor in state_dict.items():
+        tensor = tensor.detach().to('cpu').contiguous()
+        dtype = str(tensor.dtype).replace('torch.', '')
+        if dtype not in _DTYPES:
+            raise ValueError(f"dtype no soportado en bundle: {tensor.dtype} ({name})")
+        nbytes = tensor.numel() * tensor.element_size()
+        offset = _aligned(offset)
+        entries[name] = {'dtype': dtype, 'shape': list(tensor.shape), 'offset': offset, 'nbytes': nbytes}
+        tensors[name] = tensor
+        offset += nbytes
+    
+    header = json.dumps(
+        {'format': 1, 'metadata': metadata or {}, 'tensors': entries},
+        cls=NumpyEncoder, ensure_ascii=False
+    ).encode('utf-8')
+    # La región de datos también empieza alineada
+    header += b' ' * (_aligned(len(MAGIC) + 8 + len(header)) - len(MAGIC) - 8 - len(header))
+    data_start = len(MAGIC) + 8 + len(header)
+    
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for name, tensor in tensors.items():
+            f.seek(data_start + entries[name]['offset'])
+            if entries[name]['nbytes']:
+                f.write(tensor.view(-1).view(torch.uint8).numpy().tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_header(path: str) -> Tuple[Dict, int]:
+    """Header del bundle y offset de la región de datos (sin leer tensores)."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es un bundle de tensores")
+        (header_len,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    if header.get('format') != 1:
+        raise ValueError(f"Versión de bundle no soportada: {header.get('format')}")
+    return header, len(MAGIC) + 8 + header_len
+
+
+def load_bundle(path: str) -> Tuple[Dict[str, torch.Tensor], Dict]:
+    """
+    Mapea el bundle y retorna (tensores, metadatos).
+    
+    Los tensores son vistas del mapeo (copy-on-write: escribir en uno no
+    modifica el archivo, solo duplica esa página en el proceso).
+    """
+    header, data_start = read_header(path)
+    
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    buffer = torch.frombuffer(mapped, dtype=torch.uint8)
+    
+    tensors = {}
+    for name, entry in header['tensors'].items():
+        dtype = _DTYPES[entry['dtype']]
+        start = data_start + entry['offset']
+        if entry['nbytes'] == 0:
+            tensors[name] = torch.empty(entry['shape'], dtype=dtype)
+            continue
+        tensors[name] = buffer[start:start + entry['nbytes']].view(dtype).view(entry['shape'])
+    return tensors, header['metadata']
+
+
+def export_inference_bundle(model: torch.nn.Module, path: str, config: Dict, extra: Optional[Dict] = None) -> Path:
+    """Bundle de inferencia de un modelo: pesos + config (+ plan de canales, etc.)."""
+    return save_bundle(path, model.state_dict(), {'config': config, **(extra or {})})